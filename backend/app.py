@@ -1,8 +1,17 @@
+import os
+
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import Config
-from database.connection import mongo # Make sure your connection.py exports 'mongo'
+from database.connection import mongo, init_db # Make sure your connection.py exports 'mongo'
+from database.indexes import ensure_indexes
+from services.job_queue import job_queue
+from services.chat_log_buffer import chat_log_buffer
+from utils.hash_helper import HashQueueFull
+from utils.json_provider import MongoJSONProvider
+from utils.compression import init_compression
+from utils.profiling import init_profiling
 
 # Import Blueprints (Routes)
 from routes.auth_routes import auth_bp
@@ -14,25 +23,42 @@ from routes.teacher_routes import teacher_bp
 from routes.performance_routes import performance_bp
 from routes.admin_routes import admin_bp
 
-def create_app():
+def create_app(start_background=True):
     app = Flask(__name__)
+    # ObjectId/datetime aware JSON (orjson agar installed ho)
+    app.json = MongoJSONProvider(app)
     
     # 1. Load Configuration (Secret Keys, DB URI)
     app.config.from_object(Config)
 
+    # 1b. Per-request timings (Server-Timing, /metrics); MongoDB se pehle taake command listener lag jaye
+    init_profiling(app)
+
     # 2. Initialize Plugins & Security
     try:
-        mongo.init_app(app)
+        # Pool size, timeouts, compression Config se (database/connection.py)
+        init_db(app)
         
         # --- SECURITY FIX (Req #7): Restrict Access to Frontend Only ---
         # Pehle '*' tha, ab humne specific 'http://localhost:3000' kar diya hai
-        CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
+        CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}}, expose_headers=["X-Next-Cursor"])
         
         JWTManager(app)
         print("✅ Plugins Initialized Successfully")
     except Exception as e:
         print(f"❌ Plugin Initialization Error: {e}")
 
+    # 2b. Indexes: registry apply karo (idempotent, har startup par safe)
+    if app.config.get('AUTO_CREATE_INDEXES'):
+        try:
+            ensure_indexes(mongo.db)
+            print("✅ Indexes Verified")
+        except Exception as e:
+            print(f"⚠️ Index Bootstrap Skipped: {e}")
+
+    # 2c. gzip/brotli compression for large JSON responses
+    init_compression(app)
+
     # 3. Register Blueprints (API Endpoints)
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(student_bp, url_prefix='/api/student')
@@ -43,11 +69,26 @@ def create_app():
     app.register_blueprint(performance_bp, url_prefix='/api/performance')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
+    # 3b. Background Job Workers (teacher quiz publishing etc.)
+    # start_background=False: reloader ka parent process / `python -m services.job_queue` (woh khud start karta hai)
+    if start_background:
+        job_queue.start(app, app.config.get('JOB_WORKERS', 0))
+
+    # 3c. Chat logs write-behind buffer (batched insert_many)
+    if start_background and app.config.get('CHAT_LOG_BUFFERED'):
+        chat_log_buffer.start(app)
+
     # 4. Global Error Handlers (JSON Format for Frontend)
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({"error": "Endpoint not found", "status": 404}), 404
 
+    @app.errorhandler(HashQueueFull)
+    def hash_queue_full(error):
+        response = jsonify({"error": "Server busy, please try again shortly.", "status": 503})
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response, 503
+
     @app.errorhandler(500)
     def internal_error(error):
         return jsonify({"error": "Internal Server Error. Please contact admin.", "status": 500}), 500
@@ -64,6 +105,12 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    app = create_app()
-    # Debug=True development ke liye theek hai
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    if Config.SERVER_MODE == 'async':
+        # AI/progress routes Quart + Motor par, baqi sab yehi Flask app (asgi.py dekho)
+        import uvicorn
+        uvicorn.run("asgi:application", port=Config.SERVER_PORT)
+    else:
+        # Debug reloader yeh file do dafa chalata hai; threads sirf asal server (child) mein
+        app = create_app(start_background=os.environ.get("WERKZEUG_RUN_MAIN") == "true")
+        # Debug=True development ke liye theek hai
+        app.run(debug=True, port=Config.SERVER_PORT)
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+ASGI entry point for the async serving mode (SERVER_MODE=async).
+
+    uvicorn asgi:application --port 5000
+
+The I/O-heavy blueprints (/api/ai, /api/progress) are served by a Quart app
+whose handlers await MongoDB (Motor) and Gemini instead of holding a thread
+each; every other path falls through to the regular Flask app from create_app(),
+wrapped as ASGI, so auth, teacher, admin etc. behave exactly as before.
+Both apps load the same Config, and the Quart app gets the same Server-Timing,
+/metrics timings and gzip/brotli hooks (utils/profiling.py, utils/compression.py).
+"""
+from asgiref.wsgi import WsgiToAsgi
+from quart import Quart, jsonify, request
+
+from app import create_app
+from config import Config
+from database.async_connection import init_async_db, close_async_db
+from utils.compression import init_async_compression
+from utils.json_provider import MongoJSONProvider
+from utils.profiling import init_async_profiling
+from routes.async_ai_routes import async_ai_bp
+from routes.async_progress_routes import async_progress_bp
+
+ASYNC_PREFIXES = ("/api/ai", "/api/progress")
+ALLOWED_ORIGIN = "http://localhost:3000"  # app.py ki CORS policy jaisi
+
+
+def create_async_app():
+    app = Quart(__name__)
+    app.json = MongoJSONProvider(app)
+    app.config.from_object(Config)
+    # Flask app (app.py) jaisi timings aur compression
+    init_async_profiling(app)
+
+    @app.before_serving
+    async def connect():
+        init_async_db(app.config)
+        print("✅ Async MongoDB (Motor) Connected")
+
+    @app.after_serving
+    async def disconnect():
+        close_async_db()
+
+    # CORS: sirf frontend origin (flask_cors Quart par nahi chalta)
+    @app.before_request
+    async def preflight():
+        if request.method == "OPTIONS":
+            return "", 204
+
+    @app.after_request
+    async def add_cors_headers(response):
+        if request.headers.get("Origin") == ALLOWED_ORIGIN:
+            response.headers["Access-Control-Allow-Origin"] = ALLOWED_ORIGIN
+            response.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type"
+            response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+            response.headers["Access-Control-Expose-Headers"] = "X-Next-Cursor"
+            response.headers["Vary"] = "Origin"
+        return response
+
+    init_async_compression(app)
+
+    app.register_blueprint(async_ai_bp, url_prefix='/api/ai')
+    app.register_blueprint(async_progress_bp, url_prefix='/api/progress')
+
+    @app.errorhandler(404)
+    async def not_found(error):
+        return jsonify({"error": "Endpoint not found", "status": 404}), 404
+
+    @app.errorhandler(500)
+    async def internal_error(error):
+        return jsonify({"error": "Internal Server Error. Please contact admin.", "status": 500}), 500
+
+    return app
+
+
+def _is_async_path(path):
+    return any(path == p or path.startswith(p + "/") for p in ASYNC_PREFIXES)
+
+
+def create_asgi_app():
+    async_app = create_async_app()
+    sync_app = WsgiToAsgi(create_app())
+
+    async def dispatch(scope, receive, send):
+        # lifespan (startup/shutdown) Quart ko, taake Motor client bane
+        if scope["type"] == "lifespan" or _is_async_path(scope.get("path", "")):
+            await async_app(scope, receive, send)
+        else:
+            await sync_app(scope, receive, send)
+
+    return dispatch
+
+
+application = create_asgi_app()
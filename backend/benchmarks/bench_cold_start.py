@@ -0,0 +1,66 @@
+"""
+Benchmark: worker cold-start time and memory (import + create_app()).
+
+Each run starts a fresh Python process, builds the app and reports wall time
+and peak RSS. Two modes are compared:
+    lazy   the current behaviour: the Gemini SDK is not imported until the first AI call
+    eager  the SDK is loaded right after create_app(), like the old import-time
+           `genai.GenerativeModel(...)` in ai_service.py did
+
+Run from the backend folder (no MongoDB needed; nothing connects during startup):
+    python -m benchmarks.bench_cold_start --runs 5
+    AI_PROVIDER=fake python -m benchmarks.bench_cold_start   # no Gemini SDK installed / no API key
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+if sys.argv[1] == "eager":
+    from services.ai_provider import get_provider
+    provider = get_provider()
+    if hasattr(provider, "load"):  # fake provider has nothing to load
+        provider.load()
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# Linux reports KiB, macOS bytes
+rss_mb = rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+print(json.dumps({"seconds": elapsed, "rss_mb": rss_mb, "sdk_loaded": "google.generativeai" in sys.modules}))
+"""
+
+
+def run_once(mode, env):
+    out = subprocess.run([sys.executable, "-c", CHILD, mode], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # config.py refuses to load without these; startup never talks to MongoDB with these settings
+    env.setdefault("MONGO_URI", "mongodb://localhost:27017/ai_learning_bench")
+    env.setdefault("JWT_SECRET_KEY", "bench")
+    env.setdefault("AI_PROVIDER", "gemini")
+    env.update({"AUTO_CREATE_INDEXES": "False", "JOB_WORKERS": "0", "CHAT_LOG_BUFFERED": "False"})
+
+    print(f"AI_PROVIDER={env['AI_PROVIDER']}, {args.runs} run(s) per mode\n")
+    print(f"{'mode':<6} {'startup s (median)':>19} {'peak RSS MB (median)':>21} {'SDK loaded':>11}")
+    for mode in ("lazy", "eager"):
+        results = [run_once(mode, env) for _ in range(args.runs)]
+        print(f"{mode:<6} {statistics.median(r['seconds'] for r in results):>19.3f} "
+              f"{statistics.median(r['rss_mb'] for r in results):>21.1f} "
+              f"{str(results[0]['sdk_loaded']):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: concurrent-connection capacity, threaded vs async serving mode.
+
+Starts the backend once per mode as a real server process (threaded = Flask's
+threaded server, async = uvicorn + asgi.py), then climbs a ladder of concurrent
+clients against one endpoint. The fake AI provider stands in for Gemini with a
+fixed latency, so an AI request is pure waiting, which is what the async mode
+is meant to absorb. Reports throughput, latency percentiles and errors per step.
+
+Needs a running mongod (the scratch database is dropped afterwards) and httpx:
+    python -m benchmarks.bench_concurrency --levels 10 50 200 500
+    python -m benchmarks.bench_concurrency --endpoint progress --modes async
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+from bson import ObjectId
+
+SERVERS = {
+    "threaded": [sys.executable, "-c",
+                 "import os; from app import create_app; "
+                 "create_app().run(port=int(os.environ['SERVER_PORT']), threaded=True)"],
+    "async": [sys.executable, "-m", "uvicorn", "asgi:application", "--port", "{port}", "--log-level", "warning"],
+}
+
+ENDPOINTS = {
+    "chat": ("/api/ai/chat", lambda i: {"message": f"Explain topic {i % 50}"}),
+    "progress": ("/api/progress/update", lambda i: {"module_id": f"m{i % 20}", "topic": f"Topic {i % 20}",
+                                                    "score": (i * 37) % 100}),
+}
+
+
+def make_tokens(secret, count):
+    # Same helper the login route uses; a bare Flask app is enough for create_access_token
+    from flask import Flask
+    from flask_jwt_extended import JWTManager
+    from utils.jwt_helper import generate_token
+
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = secret
+    JWTManager(app)
+    with app.app_context():
+        return [generate_token(ObjectId(), "Student") for _ in range(count)]
+
+
+def start_server(mode, port, env):
+    cmd = [part.format(port=port) for part in SERVERS[mode]]
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    proc.kill()
+    raise RuntimeError(f"{mode} server did not come up on port {port}")
+
+
+async def run_level(base_url, path, body, tokens, clients, duration):
+    latencies, errors = [], 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+        async def client_loop(n):
+            nonlocal errors
+            i = n
+            headers = {"Authorization": f"Bearer {tokens[n % len(tokens)]}"}
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                try:
+                    resp = await http.post(path, json=body(i), headers=headers)
+                    if resp.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                i += clients
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(client_loop(n) for n in range(clients)))
+        wall = time.perf_counter() - wall
+    return latencies, errors, wall
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="mongodb://localhost:27017/ai_learning_bench_concurrency")
+    parser.add_argument("--modes", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--endpoint", choices=list(ENDPOINTS), default="chat")
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 50, 200, 500], help="concurrent clients per step")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per step")
+    parser.add_argument("--ai-latency", type=float, default=0.5, help="fake AI provider latency (seconds)")
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    secret = os.environ.get("JWT_SECRET_KEY", "bench")
+    env = dict(os.environ, MONGO_URI=args.uri, JWT_SECRET_KEY=secret, AI_PROVIDER="fake",
+               FAKE_AI_LATENCY_SECONDS=str(args.ai_latency), SERVER_PORT=str(args.port),
+               # limiter ko bench ke raste se hatao: hum server ki capacity naap rahe hain, Gemini quota nahi
+               AI_MAX_CONCURRENCY=str(max(args.levels)), AI_QUEUE_TIMEOUT_SECONDS="60",
+               PROFILING_ENABLED="False", JOB_WORKERS="0")
+    tokens = make_tokens(secret, 200)
+    path, body = ENDPOINTS[args.endpoint]
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"endpoint {path}, fake AI latency {args.ai_latency}s, {args.duration}s per step\n")
+    print(f"{'mode':<9} {'clients':>7} {'ok':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    try:
+        for mode in args.modes:
+            proc = start_server(mode, args.port, env)
+            try:
+                for clients in args.levels:
+                    latencies, errors, wall = asyncio.run(
+                        run_level(base_url, path, body, tokens, clients, args.duration))
+                    print(f"{mode:<9} {clients:>7} {len(latencies):>7} {len(latencies) / wall:>8.1f} "
+                          f"{percentile(latencies, 50) * 1000:>8.0f} {percentile(latencies, 95) * 1000:>8.0f} "
+                          f"{percentile(latencies, 99) * 1000:>8.0f} {errors:>7}")
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+    finally:
+        from pymongo import MongoClient
+        client = MongoClient(args.uri)
+        client.drop_database(client.get_default_database().name)
+
+
+if __name__ == "__main__":
+    main()
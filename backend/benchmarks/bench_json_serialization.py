@@ -0,0 +1,77 @@
+"""
+Microbenchmark: serializing a 10k-document list response.
+
+  legacy   - old serialize_doc loop (str(_id) per doc) + stdlib json with default=str
+  provider - MongoJSONProvider (utils/json_provider.py), orjson if installed
+  stream   - stream_json_array, one document at a time from the "cursor"
+
+Run from the backend folder (no MongoDB needed):
+    python -m benchmarks.bench_json_serialization --docs 10000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from flask import Flask
+
+from utils.json_provider import MongoJSONProvider, orjson, stream_json_array
+
+
+def make_docs(n):
+    now = datetime.now(timezone.utc)
+    return [{
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "module_id": str(ObjectId()),
+        "topic": f"Topic {i % 50}",
+        "status": "Completed",
+        "score": (i * 7) % 100,
+        "last_updated": now
+    } for i in range(n)]
+
+
+def legacy(docs):
+    out = []
+    for d in docs:
+        d = dict(d)
+        d["_id"] = str(d["_id"])
+        d["user_id"] = str(d["user_id"])
+        out.append(d)
+    return json.dumps(out, default=str).encode("utf-8")
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.json = MongoJSONProvider(app)
+    docs = make_docs(args.docs)
+
+    with app.app_context():
+        results = {
+            "legacy": best_of(lambda: legacy(docs), args.repeat),
+            "provider": best_of(lambda: app.json.response(docs).get_data(), args.repeat),
+            "stream": best_of(lambda: b"".join(stream_json_array(iter(docs)).response), args.repeat),
+        }
+
+    print(f"{args.docs} docs, encoder={'orjson' if orjson else 'stdlib json'}")
+    for name, ms in results.items():
+        print(f"  {name:<9} {ms:8.1f} ms  ({results['legacy'] / ms:4.1f}x vs legacy)")
+
+
+if __name__ == "__main__":
+    main()
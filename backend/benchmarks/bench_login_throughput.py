@@ -0,0 +1,54 @@
+"""
+Benchmark: bcrypt password checks per second (the CPU cost of /api/auth/login).
+
+Simulates an exam-start login burst: many client threads call check_password()
+at once, which goes through the bounded hashing pool in utils/hash_helper.py.
+Reports logins/sec overall and per core, plus how many were shed with 503.
+
+Run from the backend folder (no MongoDB needed):
+    HASH_POOL_KIND=thread  python -m benchmarks.bench_login_throughput
+    HASH_POOL_KIND=process python -m benchmarks.bench_login_throughput --clients 200
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# config.py refuses to load without these; the benchmark never touches the database
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017/ai_learning_bench")
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+
+from config import Config  # noqa: E402
+from utils.hash_helper import HashQueueFull, check_password, hash_password  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="concurrent login threads")
+    parser.add_argument("--logins", type=int, default=200, help="total login attempts")
+    args = parser.parse_args()
+
+    hashed = hash_password("correct horse battery staple")
+    cores = os.cpu_count() or 1
+
+    def attempt(_):
+        try:
+            return bool(check_password("correct horse battery staple", hashed))
+        except HashQueueFull:
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as clients:
+        results = list(clients.map(attempt, range(args.logins)))
+    elapsed = time.perf_counter() - start
+
+    ok = sum(1 for r in results if r)
+    shed = sum(1 for r in results if r is None)
+    print(f"pool={Config.HASH_POOL_KIND} workers={Config.HASH_POOL_WORKERS} "
+          f"queue={Config.HASH_QUEUE_SIZE} rounds={Config.BCRYPT_ROUNDS} cores={cores}")
+    print(f"{ok} logins in {elapsed:.2f}s -> {ok / elapsed:.1f} logins/s, "
+          f"{ok / elapsed / cores:.1f} logins/s/core, {shed} shed with 503")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: progress ingestion throughput, /api/progress/update vs /api/progress/bulk.
+
+Simulates a classroom syncing after an offline exam: every student uploads
+`--records` scores, either one POST /update per score (the old path) or in
+POST /bulk batches of `--batch` records. Runs through create_app()'s test
+client against a real mongod, reports records/s for each path and checks that
+every student's materialized user_stats match a rebuild from 'progress'.
+
+Run from the backend folder:
+    python -m benchmarks.bench_progress_bulk --students 30 --records 100 --batch 100
+
+WARNING: the target database (default 'ai_learning_bench_bulk') is dropped on every run.
+"""
+import argparse
+import os
+import random
+import time
+
+from bson import ObjectId
+
+# config.py needs these; no AI calls or background jobs here
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("AI_PROVIDER", "fake")
+os.environ.setdefault("PROFILING_ENABLED", "False")
+
+
+def make_records(count, seed):
+    rng = random.Random(seed)
+    return [{"module_id": f"m{i}", "topic": f"Topic {i % 25}", "score": rng.randint(0, 100)} for i in range(count)]
+
+
+def run_single(client, students, records):
+    for token, _ in students:
+        headers = {"Authorization": f"Bearer {token}"}
+        for record in records:
+            resp = client.post("/api/progress/update", json=record, headers=headers)
+            assert resp.status_code == 200, resp.get_json()
+
+
+def run_bulk(client, students, records, batch):
+    for token, _ in students:
+        headers = {"Authorization": f"Bearer {token}"}
+        for start in range(0, len(records), batch):
+            resp = client.post("/api/progress/bulk", json={"records": records[start:start + batch]}, headers=headers)
+            assert resp.status_code == 200, resp.get_json()
+
+
+def stats_consistent(db, user_ids):
+    """Materialized user_stats vs. a fresh aggregation over 'progress'."""
+    from services.user_stats import _stats_pipeline
+
+    bad = 0
+    for uid in user_ids:
+        stored = db.user_stats.find_one({"_id": uid}) or {}
+        fresh = next(db.progress.aggregate(_stats_pipeline({"user_id": uid})), {})
+        if any(stored.get(f) != fresh.get(f) for f in ("count", "score_sum", "min_score", "max_score")):
+            bad += 1
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="ai_learning_bench_bulk")
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--records", type=int, default=100, help="scores per student")
+    parser.add_argument("--batch", type=int, default=100, help="records per /bulk request")
+    args = parser.parse_args()
+
+    os.environ["MONGO_URI"] = f"{args.uri.rstrip('/')}/{args.db}"
+    from app import create_app
+    from database.connection import mongo
+    from utils.jwt_helper import generate_token
+
+    app = create_app()
+    client = app.test_client()
+    total = args.students * args.records
+
+    print(f"{args.students} students x {args.records} records, /bulk batch {args.batch}\n")
+    print(f"{'path':<8} {'requests':>9} {'seconds':>9} {'records/s':>10} {'stats mismatches':>17}")
+    try:
+        for path in ("single", "bulk"):
+            # Har path ke liye naye students: dono ek hi kaam (pehli dafa upload + ek retake) karte hain
+            with app.app_context():
+                students = [(generate_token(uid, "Student"), uid)
+                            for uid in (ObjectId() for _ in range(args.students))]
+            first, retake = make_records(args.records, 1), make_records(args.records, 2)
+
+            start = time.perf_counter()
+            for records in (first, retake):
+                if path == "single":
+                    run_single(client, students, records)
+                else:
+                    run_bulk(client, students, records, args.batch)
+            elapsed = time.perf_counter() - start
+
+            per_student = args.records if path == "single" else -(-args.records // args.batch)
+            requests = 2 * args.students * per_student
+            bad = stats_consistent(mongo.db, [uid for _, uid in students])
+            print(f"{path:<8} {requests:>9} {elapsed:>9.2f} {2 * total / elapsed:>10.0f} {bad:>17}")
+    finally:
+        mongo.cx.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: /api/teacher/analytics latency vs. number of students.
+
+Compares the old per-student loop (1 + N queries) with the single
+aggregation in services/analytics_service.py.
+
+Run from the backend folder against a local/scratch MongoDB:
+    python -m benchmarks.bench_teacher_analytics --uri mongodb://localhost:27017 --sizes 100 1000 5000
+
+WARNING: the target database (default 'ai_learning_bench') is dropped on every run.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from pymongo import MongoClient
+
+from services.analytics_service import get_class_analytics
+from services.user_stats import rebuild_all
+
+
+def seed(db, students, attempts_per_student):
+    db.users.drop()
+    db.progress.drop()
+    db.user_stats.drop()
+    now = datetime.now(timezone.utc)
+
+    users = [{"name": f"Student {i}", "email": f"s{i}@bench.local", "role": "Student", "created_at": now}
+             for i in range(students)]
+    user_ids = db.users.insert_many(users).inserted_ids
+
+    progress = [{"user_id": uid, "module_id": f"m{j}", "topic": f"Topic {j}",
+                 "score": random.randint(0, 100), "last_updated": now}
+                for uid in user_ids for j in range(attempts_per_student)]
+    if progress:
+        db.progress.insert_many(progress, ordered=False)
+    db.progress.create_index([("user_id", 1), ("last_updated", -1)])
+    # Class totals 'user_stats' se aate hain
+    rebuild_all(db)
+
+
+def legacy_analytics(db):
+    """The pre-aggregation implementation (one progress query per student)."""
+    result = []
+    for student in db.users.find({"role": "Student"}):
+        progress = list(db.progress.find({"user_id": student["_id"]}))
+        result.append((len(progress), sum(p.get("score", 0) for p in progress)))
+    return result
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="ai_learning_bench")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--attempts", type=int, default=5, help="progress rows per student")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    db = client[args.db]
+    try:
+        print(f"{'students':>10} {'legacy (ms)':>14} {'pipeline (ms)':>15} {'speedup':>9}")
+        for size in args.sizes:
+            seed(db, size, args.attempts)
+            legacy_ms = timed(lambda: legacy_analytics(db), args.repeat)
+            pipeline_ms = timed(lambda: get_class_analytics(db, args.page_size), args.repeat)
+            print(f"{size:>10} {legacy_ms:>14.1f} {pipeline_ms:>15.1f} {legacy_ms / pipeline_ms:>8.1f}x")
+    finally:
+        client.drop_database(args.db)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Load-test harness for every API blueprint.
+
+Boots create_app() against a scratch MongoDB database (or mongomock) with the
+fake AI provider (services/ai_provider.py) at a configurable latency, seeds a
+dataset of the requested size, then drives a weighted student/teacher/admin traffic mix from many
+concurrent clients and reports p50/p95/p99 latency and throughput per endpoint.
+
+Run from the backend folder:
+    python -m benchmarks.loadtest --sizes 100 1000 --duration 20 --clients 16
+    python -m benchmarks.loadtest --mongomock --sizes 50        # no mongod needed*
+
+* mongomock doesn't implement every aggregation stage ($facet/$lookup
+  pipelines, $merge), so analytics numbers are only meaningful on a real mongod.
+
+WARNING: the target database (default 'ai_learning_loadtest') is dropped for each size.
+"""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+# config.py needs these; indexes are built explicitly after seeding
+os.environ.setdefault("JWT_SECRET_KEY", "loadtest")
+os.environ.setdefault("AUTO_CREATE_INDEXES", "False")
+os.environ.setdefault("JOB_WORKERS", "2")
+os.environ.setdefault("AI_PROVIDER", "fake")
+
+
+# --- App + data setup ---
+
+def build_app(args):
+    os.environ["MONGO_URI"] = f"{args.uri.rstrip('/')}/{args.db}"
+    from app import create_app
+    from database.connection import mongo
+    from services.ai_provider import FakeProvider, set_provider
+
+    app = create_app()
+    app.config["TESTING"] = True
+
+    if args.mongomock:
+        import mongomock
+        mongo.cx = mongomock.MongoClient()
+        mongo.db = mongo.cx[args.db]
+
+    set_provider(FakeProvider(latency=args.ai_latency))
+    return app, mongo
+
+
+def seed(db, size, modules=20, attempts=5):
+    """size = number of students; teachers, progress rows and enrollments scale with it."""
+    for name in db.list_collection_names():
+        db.drop_collection(name)
+
+    from utils.hash_helper import hash_password
+    now = datetime.now(timezone.utc)
+    password = hash_password("loadtest")
+
+    def user(i, role):
+        return {"name": f"{role} {i}", "email": f"{role.lower()}{i}@load.test", "password": password,
+                "role": role, "created_at": now - timedelta(seconds=i)}
+
+    students = db.users.insert_many([user(i, "Student") for i in range(size)]).inserted_ids
+    teachers = db.users.insert_many([user(i, "Teacher") for i in range(max(1, size // 50))]).inserted_ids
+    admins = db.users.insert_many([user(0, "Admin")]).inserted_ids
+
+    module_ids = db.modules.insert_many([
+        {"title": f"Course {i}", "content": "Lorem ipsum " * 200, "subject": "General",
+         "created_by": "Teacher", "created_at": now - timedelta(minutes=i)}
+        for i in range(modules)
+    ]).inserted_ids
+    db.quizzes.insert_many([
+        {"topic": f"Topic {i}", "difficulty": "Medium", "created_by": "Teacher", "created_at": now,
+         "questions": [{"question": "Q?", "options": ["A", "B"], "answer": "A"}]}
+        for i in range(10)
+    ])
+
+    progress, enrollments = [], []
+    for uid in students:
+        for j in random.sample(range(modules), min(attempts, modules)):
+            progress.append({"user_id": uid, "module_id": str(module_ids[j]), "topic": f"Course {j}",
+                             "status": "Completed", "score": random.randint(0, 100), "last_updated": now})
+            enrollments.append({"user_id": str(uid), "course_id": str(module_ids[j]), "enrolled_at": now})
+    for batch in range(0, len(progress), 10000):
+        db.progress.insert_many(progress[batch:batch + 10000], ordered=False)
+        db.enrollments.insert_many(enrollments[batch:batch + 10000], ordered=False)
+
+    return {"Student": students, "Teacher": teachers, "Admin": admins, "modules": module_ids}
+
+
+def make_tokens(app, users):
+    from utils.jwt_helper import generate_token
+    with app.app_context():
+        return {role: [generate_token(uid, role) for uid in users[role][:200]]
+                for role in ("Student", "Teacher", "Admin")}
+
+
+# --- Traffic mix: (weight, role, method, path, body) ---
+
+def traffic_mix(users):
+    course = str(random.choice(users["modules"]))
+    topic = f"Topic {random.randint(0, 30)}"
+    return [
+        (4, None, "POST", "/api/auth/login", {"email": f"student{random.randint(0, 9)}@load.test", "password": "loadtest"}),
+        (10, "Student", "GET", "/api/student/profile", None),
+        (12, "Student", "GET", "/api/student/courses", None),
+        (8, "Student", "GET", "/api/student/assigned-quizzes", None),
+        (3, "Student", "POST", "/api/student/enroll", {"course_id": course}),
+        (8, "Student", "GET", "/api/modules/", None),
+        (10, "Student", "GET", "/api/progress/", None),
+        (6, "Student", "POST", "/api/progress/update", {"topic": topic, "score": random.randint(0, 100)}),
+        (8, "Student", "GET", "/api/performance/summary", None),
+        (3, "Student", "POST", "/api/ai/chat", {"message": "Explain recursion"}),
+        (2, "Student", "POST", "/api/ai/generate-quiz", {"topic": topic}),
+        (2, "Student", "GET", "/api/ai/recommendation", None),
+        (3, "Teacher", "GET", "/api/teacher/analytics", None),
+        (2, "Teacher", "GET", "/api/teacher/students", None),
+        (1, "Teacher", "POST", "/api/teacher/create-quiz", {"topic": topic}),
+        (1, "Admin", "GET", "/api/admin/stats", None),
+        (1, "Admin", "GET", "/api/admin/users", None),
+    ]
+
+
+def pick(users):
+    mix = traffic_mix(users)
+    return random.choices(mix, weights=[m[0] for m in mix])[0]
+
+
+# --- Driver ---
+
+def run_load(app, users, tokens, duration, clients):
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client_loop():
+        client = app.test_client()
+        while time.monotonic() < stop_at:
+            _, role, method, path, body = pick(users)
+            headers = {"Authorization": f"Bearer {random.choice(tokens[role])}"} if role else {}
+            start = time.perf_counter()
+            resp = client.open(path, method=method, json=body, headers=headers)
+            resp.get_data()
+            elapsed = (time.perf_counter() - start) * 1000
+            key = f"{method} {path}"
+            with lock:
+                samples[key].append(elapsed)
+                if resp.status_code >= 500:
+                    errors[key] += 1
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, errors, time.monotonic() - started
+
+
+def percentile(values, pct):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def report(size, samples, errors, wall):
+    total = sum(len(v) for v in samples.values())
+    print(f"\n=== dataset: {size} students | {total} requests in {wall:.1f}s ({total / wall:.1f} req/s) ===")
+    print(f"{'endpoint':<36} {'n':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for key in sorted(samples):
+        values = samples[key]
+        print(f"{key:<36} {len(values):>6} {errors[key]:>5} {percentile(values, 50):>9.1f} "
+              f"{percentile(values, 95):>9.1f} {percentile(values, 99):>9.1f} {len(values) / wall:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="ai_learning_loadtest")
+    parser.add_argument("--mongomock", action="store_true", help="use mongomock instead of a real mongod")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="student counts to test")
+    parser.add_argument("--duration", type=float, default=15, help="seconds of load per size")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--ai-latency", type=float, default=0.5, help="fake AI provider latency (seconds)")
+    args = parser.parse_args()
+
+    app, mongo = build_app(args)
+    from database.indexes import ensure_indexes
+
+    try:
+        for size in args.sizes:
+            with app.app_context():
+                users = seed(mongo.db, size)
+                if not args.mongomock:
+                    ensure_indexes(mongo.db)
+            tokens = make_tokens(app, users)
+            samples, errors, wall = run_load(app, users, tokens, args.duration, args.clients)
+            report(size, samples, errors, wall)
+    finally:
+        if not args.mongomock:
+            mongo.cx.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    main()
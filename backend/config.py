@@ -16,6 +16,20 @@ class Config:
     if not MONGO_URI:
         raise ValueError("❌ ERROR: MONGO_URI is missing in .env file!")
 
+    # Connection pool / timeouts (per worker process; 0 = no limit for the *_MS timeouts)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    # Wire compression, preference order; zstd/snappy sirf tab jab unki library installed ho
+    MONGO_COMPRESSORS = [c.strip() for c in os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib").split(",") if c.strip()]
+    # Analytics/catalog reads: secondaries, max_staleness >= 90s (MongoDB ki minimum)
+    MONGO_ANALYTICS_READ_PREFERENCE = os.getenv("MONGO_ANALYTICS_READ_PREFERENCE", "secondaryPreferred")
+    MONGO_MAX_STALENESS_SECONDS = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90"))
+
     # 3. Security Config (JWT)
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     if not JWT_SECRET_KEY:
@@ -27,4 +41,78 @@ class Config:
     # 4. AI Config (Google Gemini)
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     if not GEMINI_API_KEY:
-        print("⚠️ WARNING: GEMINI_API_KEY is missing. AI features will not work.")
\ No newline at end of file
+        print("⚠️ WARNING: GEMINI_API_KEY is missing. AI features will not work.")
+    # 'gemini' ya 'fake' (local canned replies for tests/benchmarks); SDK pehli AI call par load hota hai
+    AI_PROVIDER = os.getenv("AI_PROVIDER", "gemini").lower()
+    AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "gemini-2.0-flash")
+    FAKE_AI_LATENCY_SECONDS = float(os.getenv("FAKE_AI_LATENCY_SECONDS", "0.5"))
+
+    # 5. Performance Config
+    # List endpoints ek page mein itne records bhejte hain (client ?limit= se kam/zyada kar sakta hai)
+    DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+    # /api/progress/bulk: ek request mein zyada se zyada itne records (offline classroom sync)
+    PROGRESS_BULK_MAX_RECORDS = int(os.getenv("PROGRESS_BULK_MAX_RECORDS", "500"))
+    # Startup par database/indexes.py ka registry apply hota hai
+    AUTO_CREATE_INDEXES = os.getenv("AUTO_CREATE_INDEXES", "True").lower() in ["true", "1", "t"]
+
+    # 6. AI Cache Config (Quiz generation cache)
+    QUIZ_CACHE_TTL_SECONDS = int(os.getenv("QUIZ_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    QUIZ_CACHE_VARIANTS = int(os.getenv("QUIZ_CACHE_VARIANTS", "3"))
+    QUIZ_CACHE_MEMORY_SIZE = int(os.getenv("QUIZ_CACHE_MEMORY_SIZE", "256"))
+    QUIZ_CACHE_MAX_ENTRIES = int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", "10000"))
+    # Single-flight: identical concurrent AI calls share one upstream request
+    SINGLE_FLIGHT_LEASE_SECONDS = int(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", "60"))
+    SINGLE_FLIGHT_RESULT_SECONDS = int(os.getenv("SINGLE_FLIGHT_RESULT_SECONDS", "10"))
+
+    # 7. AI Resilience Config (limiter + circuit breaker per worker)
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+    AI_QUEUE_TIMEOUT_SECONDS = float(os.getenv("AI_QUEUE_TIMEOUT_SECONDS", "5"))
+    AI_CALL_TIMEOUT_SECONDS = float(os.getenv("AI_CALL_TIMEOUT_SECONDS", "30"))
+    AI_BREAKER_ERROR_RATE = float(os.getenv("AI_BREAKER_ERROR_RATE", "0.5"))
+    AI_BREAKER_MIN_CALLS = int(os.getenv("AI_BREAKER_MIN_CALLS", "10"))
+    AI_BREAKER_WINDOW = int(os.getenv("AI_BREAKER_WINDOW", "20"))
+    AI_BREAKER_COOLDOWN_SECONDS = float(os.getenv("AI_BREAKER_COOLDOWN_SECONDS", "30"))
+
+    # 8. Background Jobs Config (threads per worker process draining the 'jobs' collection)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
+    # 9. Password Hashing Config (bcrypt pool; 'process' pool sidesteps the GIL entirely)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread").lower()
+    HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(os.cpu_count() or 2)))
+    HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "64"))
+    HASH_RETRY_AFTER_SECONDS = int(os.getenv("HASH_RETRY_AFTER_SECONDS", "2"))
+
+    # 10. HTTP Config (response compression)
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+
+    # 11. Catalog Cache Config (in-process modules/quizzes cache, invalidated via polled version docs)
+    CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "512"))
+    CATALOG_CACHE_TTL_SECONDS = int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+    CATALOG_VERSION_POLL_SECONDS = float(os.getenv("CATALOG_VERSION_POLL_SECONDS", "1"))
+
+    # 12. Chat Log Write-Behind Config (batched inserts; spill file agar MongoDB down ho)
+    CHAT_LOG_BUFFERED = os.getenv("CHAT_LOG_BUFFERED", "True").lower() in ["true", "1", "t"]
+    CHAT_LOG_BATCH_SIZE = int(os.getenv("CHAT_LOG_BATCH_SIZE", "100"))
+    CHAT_LOG_FLUSH_SECONDS = float(os.getenv("CHAT_LOG_FLUSH_SECONDS", "2"))
+    CHAT_LOG_MAX_BUFFER = int(os.getenv("CHAT_LOG_MAX_BUFFER", "10000"))
+    # Har process "<path>.<pid>" likhta hai; path isi machine ki local disk par rakho
+    CHAT_LOG_SPILL_PATH = os.getenv("CHAT_LOG_SPILL_PATH") or None
+
+    # 13. Profiling Config (Server-Timing header, /metrics, sampled cProfile dumps)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "True").lower() in ["true", "1", "t"]
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "True").lower() in ["true", "1", "t"]
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+    # 14. Weakness Index Config (decayed per-topic mastery behind recommendations / adaptive quizzes)
+    WEAKNESS_THRESHOLD = float(os.getenv("WEAKNESS_THRESHOLD", "60"))
+    WEAKNESS_ALPHA = float(os.getenv("WEAKNESS_ALPHA", "0.5"))
+    WEAKNESS_HALF_LIFE_DAYS = float(os.getenv("WEAKNESS_HALF_LIFE_DAYS", "14"))
+    WEAKNESS_MAX_TOPICS = int(os.getenv("WEAKNESS_MAX_TOPICS", "5"))
+
+    # 15. Server Mode Config ('threaded' = Flask dev server, 'async' = uvicorn + asgi.py for AI/progress routes)
+    SERVER_MODE = os.getenv("SERVER_MODE", "threaded").lower()
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "5000"))
\ No newline at end of file
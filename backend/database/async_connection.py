@@ -0,0 +1,33 @@
+"""
+MongoDB for the async serving mode (asgi.py), using Motor.
+
+Same MONGO_URI and client options as the Flask-PyMongo connection in connection.py. Motor is
+imported only when the async app starts, so the threaded server doesn't need it.
+"""
+_client = None
+_db = None
+
+
+def init_async_db(config):
+    """Creates the Motor client for the running event loop. Called from the async app's startup."""
+    global _client, _db
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from database.connection import client_options
+
+    # Same pool/timeout/compression settings as the PyMongo client; pool metrics labelled "async"
+    _client = AsyncIOMotorClient(config["MONGO_URI"], **client_options(config, "async"))
+    _db = _client.get_default_database(default="ai_learning_db")
+    return _db
+
+
+def close_async_db():
+    global _client, _db
+    if _client is not None:
+        _client.close()
+    _client = _db = None
+
+
+def get_async_db():
+    if _db is None:
+        raise ConnectionError("Async database not connected. Is the app running in async mode?")
+    return _db
@@ -1,17 +1,180 @@
+"""
+MongoDB connection layer.
+
+- One PyMongo client per worker (`mongo`), built from the pool, timeout and
+  compression settings in Config (section 2). The async serving mode builds its
+  Motor client from the same client_options().
+- get_db(): primary reads/writes. get_analytics_db(): same database with a
+  bounded-staleness secondary read preference, for read-heavy analytics and
+  catalog queries that can tolerate up to MONGO_MAX_STALENESS_SECONDS of
+  replication lag. The driver rejects values below 90s, and catalog_cache
+  waits that long plus one heartbeat before trusting a secondary read.
+- Pool utilization (open / in-use / waiting connections per client) is exported
+  on /metrics, so pool saturation shows up under load.
+"""
+import threading
+
 from flask_pymongo import PyMongo
+from pymongo import monitoring
+from pymongo.read_preferences import Nearest, Primary, Secondary, SecondaryPreferred
+
+from utils.metrics import registry
 
 # Initialize the instance globally
 # Hum isay yahan banate hain taake poori app mein kahin bhi import kar sakein
 mongo = PyMongo()
 
-def get_db():
+# Wire compression libraries optional hain; jo installed na ho woh list se nikal do
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+_READ_PREFERENCES = {
+    "primary": Primary,
+    "secondary": Secondary,
+    "secondarypreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def available_compressors(names):
+    """Keeps the requested compressors whose Python library is importable (zlib always is)."""
+    usable = []
+    for name in names:
+        module = _COMPRESSOR_MODULES.get(name)
+        if module is None:
+            continue
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        usable.append(name)
+    return usable
+
+
+def client_options(config, client_name="sync"):
     """
-    Returns the MongoDB Database instance for CRUD operations.
-    Includes a safety check to ensure the database is actually connected.
+    MongoClient / AsyncIOMotorClient keyword arguments from Config.
+    These override the same options in MONGO_URI; 0 for a timeout means "no limit".
     """
-    # Safety Check: Agar DB connect nahi hua ya config ghalat hai
+    options = {
+        "maxPoolSize": config["MONGO_MAX_POOL_SIZE"],
+        "minPoolSize": config["MONGO_MIN_POOL_SIZE"],
+        "maxIdleTimeMS": config["MONGO_MAX_IDLE_TIME_MS"] or None,
+        "waitQueueTimeoutMS": config["MONGO_WAIT_QUEUE_TIMEOUT_MS"] or None,
+        "connectTimeoutMS": config["MONGO_CONNECT_TIMEOUT_MS"] or None,
+        "socketTimeoutMS": config["MONGO_SOCKET_TIMEOUT_MS"] or None,
+        "serverSelectionTimeoutMS": config["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+        "event_listeners": [pool_listener(client_name, config["MONGO_MAX_POOL_SIZE"])],
+    }
+    compressors = available_compressors(config["MONGO_COMPRESSORS"])
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+
+def analytics_read_preference(config):
+    mode = _READ_PREFERENCES.get(config["MONGO_ANALYTICS_READ_PREFERENCE"].lower(), SecondaryPreferred)
+    if mode is Primary:
+        return Primary()
+    return mode(max_staleness=config["MONGO_MAX_STALENESS_SECONDS"])
+
+
+def init_db(app):
+    """Connects the shared PyMongo client; raises ConnectionError if MONGO_URI names no database."""
+    mongo.init_app(app, **client_options(app.config))
     if mongo.db is None:
-        print("❌ CRITICAL ERROR: MongoDB connection lost or not initialized.")
+        raise ConnectionError("Database not connected. MONGO_URI must include a database name (check .env)")
+    global _analytics_pref
+    _analytics_pref = analytics_read_preference(app.config)
+
+
+def get_db():
+    """Returns the MongoDB Database instance for CRUD operations (primary)."""
+    db = mongo.db
+    # init_db fail hua ho (create_app sirf log karta hai) to saaf error, NoneType wala nahi
+    if db is None:
         raise ConnectionError("Database not connected. Check MONGO_URI in .env")
-    
-    return mongo.db
\ No newline at end of file
+    return db
+
+
+_analytics_pref = None
+_analytics = (None, None)
+
+
+def get_analytics_db():
+    """get_db() with the analytics read preference: secondaries up to MONGO_MAX_STALENESS_SECONDS (>= 90s) behind."""
+    global _analytics
+    db = get_db()
+    if _analytics_pref is None:
+        return db
+    # mongo.db ke saath cache: benchmarks/loadtest client swap karta hai
+    if _analytics[0] is not db:
+        _analytics = (db, db.with_options(read_preference=_analytics_pref))
+    return _analytics[1]
+
+
+# --- Pool metrics ---
+
+class _PoolStats(monitoring.ConnectionPoolListener):
+    """Counts connections per client from PyMongo's CMAP events (called from driver threads)."""
+
+    def __init__(self, client_name, max_size):
+        self.client_name = client_name
+        self.max_size = max_size
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def _add(self, **deltas):
+        with self._lock:
+            for field, delta in deltas.items():
+                setattr(self, field, getattr(self, field) + delta)
+
+    def connection_created(self, event):
+        self._add(open=1)
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(waiting=1)
+
+    def connection_checked_out(self, event):
+        self._add(waiting=-1, in_use=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(waiting=-1)
+        _checkout_failures.inc(self.client_name, str(event.reason))
+
+    def connection_checked_in(self, event):
+        self._add(in_use=-1)
+
+    # Baqi CMAP events se counts nahi badalte
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+
+
+_pools = {}
+
+
+def pool_listener(client_name, max_size):
+    """One listener per client ('sync' = PyMongo, 'async' = Motor); a reconnect starts fresh counts."""
+    listener = _PoolStats(client_name, max_size)
+    _pools[client_name] = listener
+    return listener
+
+
+def _pool_gauge(field):
+    return lambda: {(name,): getattr(p, field) for name, p in list(_pools.items())}
+
+
+_checkout_failures = registry.counter(
+    "mongo_pool_checkout_failures_total", "Connection checkouts that failed (reason=timeout means a saturated pool).",
+    labels=("client", "reason"))
+registry.gauge("mongo_pool_connections_open", "Open MongoDB connections.", _pool_gauge("open"), labels=("client",))
+registry.gauge("mongo_pool_connections_in_use", "Checked-out MongoDB connections.", _pool_gauge("in_use"), labels=("client",))
+registry.gauge("mongo_pool_checkouts_waiting", "Threads/tasks waiting for a connection.", _pool_gauge("waiting"), labels=("client",))
+registry.gauge("mongo_pool_max_size", "maxPoolSize per server.", _pool_gauge("max_size"), labels=("client",))
@@ -0,0 +1,190 @@
+"""
+Index registry for every collection the API queries.
+
+`ensure_indexes(db)` is called from create_app() and is idempotent:
+MongoDB skips an index that already exists with the same keys/options.
+
+CLI (run from the backend folder):
+    python -m database.indexes            # report missing / unused / unregistered indexes
+    python -m database.indexes --apply    # create missing indexes
+    python -m database.indexes --explain  # explain() every hot query shape, flag COLLSCANs
+"""
+import argparse
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+# Collection -> list of index specs. Index names are left to MongoDB's default
+# (e.g. "email_1") so they match indexes created by older scripts.
+INDEXES = {
+    "users": [
+        {"keys": [("email", ASCENDING)], "unique": True},
+        {"keys": [("role", ASCENDING), ("_id", ASCENDING)]},
+        {"keys": [("role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]},
+        {"keys": [("created_at", DESCENDING), ("_id", DESCENDING)]},
+    ],
+    "progress": [
+        {"keys": [("user_id", ASCENDING), ("last_updated", DESCENDING), ("_id", DESCENDING)]},
+        {"keys": [("user_id", ASCENDING), ("module_id", ASCENDING)]},
+    ],
+    "enrollments": [
+        {"keys": [("user_id", ASCENDING), ("course_id", ASCENDING)]},
+    ],
+    "modules": [
+        {"keys": [("created_at", DESCENDING), ("_id", DESCENDING)]},
+    ],
+    "quizzes": [
+        {"keys": [("created_by", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]},
+    ],
+    "chat_logs": [
+        {"keys": [("user_id", ASCENDING), ("timestamp", DESCENDING)]},
+    ],
+    "ai_cache": [
+        {"keys": [("expires_at", ASCENDING)], "expireAfterSeconds": 0},
+        {"keys": [("last_used", ASCENDING)]},
+    ],
+    "jobs": [
+        {"keys": [("status", ASCENDING), ("run_after", ASCENDING), ("created_at", ASCENDING)]},
+        {"keys": [("batch_id", ASCENDING), ("created_at", ASCENDING)]},
+    ],
+    "study_plans": [
+        {"keys": [("topics_hash", ASCENDING)]},
+    ],
+    "ai_leases": [
+        {"keys": [("expires_at", ASCENDING)], "expireAfterSeconds": 60},
+    ],
+}
+
+# Query shapes used by the routes: (route, collection, filter, sort).
+# Used by --explain to prove each one is served by an index. User queries carry
+# the soft-delete predicate exactly like the routes do.
+LIVE = {"deleted": {"$ne": True}}
+QUERY_SHAPES = [
+    ("progress.get_my_progress", "progress", {"user_id": None}, [("last_updated", DESCENDING), ("_id", DESCENDING)]),
+    ("progress.update_progress", "progress", {"user_id": None, "module_id": ""}, None),
+    ("progress.bulk_update_progress", "progress", {"user_id": None, "bulk_prev.batch": ""}, None),
+    ("performance.summary", "progress", {"user_id": None}, None),
+    ("ai.recommendation", "progress", {"user_id": None, "score": {"$lt": 60}}, None),
+    ("student.get_courses", "enrollments", {"user_id": ""}, None),
+    ("student.enroll_course", "enrollments", {"user_id": "", "course_id": ""}, None),
+    ("student.assigned_quizzes", "quizzes", {"created_by": "Teacher"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("module.get_modules", "modules", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.get_all_users", "users", {**LIVE}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.get_stats", "users", {"role": "Student", **LIVE}, None),
+    ("teacher.get_students", "users", {"role": "Student", **LIVE}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("teacher.get_analytics", "users", {"role": "Student", **LIVE}, [("_id", ASCENDING)]),
+    ("auth.login", "users", {"email": "", **LIVE}, None),
+    ("admin.delete_user", "chat_logs", {"user_id": None}, None),
+]
+
+
+def _index_models(specs):
+    models = []
+    for spec in specs:
+        options = {k: v for k, v in spec.items() if k != "keys"}
+        models.append(IndexModel(spec["keys"], **options))
+    return models
+
+
+def _key_tuple(keys):
+    return tuple((field, int(direction)) for field, direction in keys)
+
+
+def ensure_indexes(db):
+    """Creates every registered index. Safe to call on each startup."""
+    for collection, specs in INDEXES.items():
+        try:
+            db[collection].create_indexes(_index_models(specs))
+        except OperationFailure as e:
+            # e.g. an index with the same keys but different options already exists
+            print(f"⚠️ Index Warning ({collection}): {e}")
+
+
+def report_indexes(db):
+    """
+    Compares the registry with what exists on the server.
+    Returns {collection: {"missing": [...], "unregistered": [...], "unused": [...]}}.
+    """
+    report = {}
+    for collection, specs in INDEXES.items():
+        existing = {
+            name: _key_tuple(info["key"])
+            for name, info in db[collection].index_information().items()
+            if name != "_id_"
+        }
+        wanted = [_key_tuple(spec["keys"]) for spec in specs]
+
+        try:
+            stats = db[collection].aggregate([{"$indexStats": {}}])
+            usage = {s["name"]: s["accesses"]["ops"] for s in stats}
+        except OperationFailure:
+            usage = {}
+
+        report[collection] = {
+            "missing": [list(keys) for keys in wanted if keys not in existing.values()],
+            "unregistered": [name for name, keys in existing.items() if keys not in wanted],
+            "unused": [name for name in existing if usage.get(name) == 0],
+        }
+    return report
+
+
+def _winning_stages(plan):
+    stages = [plan.get("stage")]
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            stages.extend(_winning_stages(child))
+    return stages
+
+
+def explain_query_shapes(db):
+    """Runs explain() for each registered query shape. Returns [(route, stages)]."""
+    results = []
+    for route, collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = cursor.explain()["queryPlanner"]["winningPlan"]
+        # Sharded / SBE plans nest the classic plan one level down
+        plan = plan.get("queryPlan", plan)
+        results.append((route, _winning_stages(plan)))
+    return results
+
+
+def main():
+    from pymongo import MongoClient
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Check or apply the MongoDB index registry.")
+    parser.add_argument("--apply", action="store_true", help="create missing indexes")
+    parser.add_argument("--explain", action="store_true", help="explain() every registered query shape")
+    args = parser.parse_args()
+
+    client = MongoClient(Config.MONGO_URI)
+    db = client.get_default_database(default="ai_learning_db")
+    try:
+        if args.apply:
+            ensure_indexes(db)
+            print("✅ Indexes applied.")
+
+        exit_code = 0
+        for collection, result in report_indexes(db).items():
+            print(f"[{collection}]")
+            for key in ("missing", "unregistered", "unused"):
+                print(f"  {key:<13}: {result[key] or '-'}")
+            if result["missing"]:
+                exit_code = 1
+
+        if args.explain:
+            print("\nQuery plans:")
+            for route, stages in explain_query_shapes(db):
+                flag = "❌ COLLSCAN" if "COLLSCAN" in stages else "✅"
+                print(f"  {flag:<11} {route:<28} {' <- '.join(s for s in stages if s)}")
+                if "COLLSCAN" in stages:
+                    exit_code = 1
+        return exit_code
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
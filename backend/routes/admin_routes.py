@@ -1,8 +1,16 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
-from database.connection import get_db
-from utils.serializers import serialize_list
+from database.connection import get_db, get_analytics_db
+from utils.pagination import paginate, paginated_response, InvalidCursor
 from bson import ObjectId
+from services.quiz_cache import quiz_cache
+from services.single_flight import single_flight
+from services.ai_guard import ai_guard
+from services.catalog_cache import catalog_cache
+from services.chat_log_buffer import chat_log_buffer
+from services.job_queue import job_queue, serialize_job
+import services.cleanup_service  # registers cleanup job handlers
+from datetime import datetime, timezone
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -19,10 +27,10 @@ def get_stats():
         if not is_admin(claims):
             return jsonify({"error": "Access Denied: Admins Only"}), 403
 
-        db = get_db()
+        db = get_analytics_db()  # sirf counts: secondary theek hai
         stats = {
-            "total_students": db.users.count_documents({"role": "Student"}),
-            "total_teachers": db.users.count_documents({"role": "Teacher"}),
+            "total_students": db.users.count_documents({"role": "Student", "deleted": {"$ne": True}}),
+            "total_teachers": db.users.count_documents({"role": "Teacher", "deleted": {"$ne": True}}),
             "total_modules": db.modules.count_documents({}),
             "total_quizzes": db.quizzes.count_documents({})
         }
@@ -30,6 +38,27 @@ def get_stats():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# 1b. AI Stats (cache hit/miss, limiter queue depth, breaker state for this worker)
+@admin_bp.route('/ai-stats', methods=['GET'])
+@jwt_required()
+def get_ai_stats():
+    if not is_admin(get_jwt()):
+        return jsonify({"error": "Unauthorized"}), 403
+    return jsonify({
+        "quiz_cache": quiz_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "ai_guard": ai_guard.stats(),
+        "chat_log_buffer": chat_log_buffer.stats()
+    }), 200
+
+# 1c. Catalog Cache Stats (modules/quizzes in-process cache for this worker)
+@admin_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    if not is_admin(get_jwt()):
+        return jsonify({"error": "Unauthorized"}), 403
+    return jsonify({"catalog_cache": catalog_cache.stats()}), 200
+
 # 2. Get All Users
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
@@ -41,8 +70,10 @@ def get_all_users():
 
         db = get_db()
         # Security: Password kabhi return nahi karna, Newest users first
-        users = db.users.find({}, {"password": 0}).sort("created_at", -1)
-        return jsonify(serialize_list(users)), 200
+        users, next_cursor = paginate(db.users, {"deleted": {"$ne": True}}, "created_at", {"password": 0})
+        return paginated_response(users, next_cursor), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -55,19 +86,61 @@ def delete_user(user_id):
         if not is_admin(claims):
             return jsonify({"error": "Unauthorized"}), 403
 
+        if not ObjectId.is_valid(user_id):
+            return jsonify({"error": "Invalid User ID"}), 400
+
         db = get_db()
-        
-        # 1. User Delete karo
-        result = db.users.delete_one({"_id": ObjectId(user_id)})
-        
-        if result.deleted_count == 0:
-            return jsonify({"error": "User not found"}), 404
-
-        # 2. Cleanup: User ka sara data (Progress, Chat Logs) bhi uda do
-        db.progress.delete_many({"user_id": user_id})
-        db.chat_logs.delete_many({"user_id": user_id})
-        
-        return jsonify({"message": "User and all associated data deleted successfully"}), 200
-        
+        user_obj_id = ObjectId(user_id)
+        deleted_at = datetime.now(timezone.utc)
+
+        # 1. User ko deleted mark karo (login/lists se foran ghayab)
+        result = db.users.update_one(
+            {"_id": user_obj_id, "deleted": {"$ne": True}},
+            {"$set": {"deleted": True, "deleted_at": deleted_at}}
+        )
+
+        if result.matched_count == 0:
+            # Pehle se deleted (shayad pichli dafa cleanup enqueue fail hua): cleanup dobara chalao
+            if not db.users.count_documents({"_id": user_obj_id, "deleted": True}, limit=1):
+                return jsonify({"error": "User not found"}), 404
+
+        # 2. Cleanup: User ka sara data (Progress, Chat Logs, Enrollments) background job batches mein udayegi
+        try:
+            job_id = job_queue.enqueue("cascade_delete_user", {"user_id": user_id})
+        except Exception:
+            # Cleanup queue nahi hua: user ko wapas live karo taake data adha-adhoora na rahe
+            if result.matched_count:
+                db.users.update_one(
+                    {"_id": user_obj_id, "deleted_at": deleted_at},
+                    {"$unset": {"deleted": "", "deleted_at": ""}}
+                )
+            raise
+
+        return jsonify({"message": "User deleted. Associated data cleanup started.", "job_id": job_id}), 202
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 4. Sweep Orphaned Data (purani deletions ka bacha hua data)
+@admin_bp.route('/cleanup/sweep', methods=['POST'])
+@jwt_required()
+def sweep_orphans():
+    if not is_admin(get_jwt()):
+        return jsonify({"error": "Unauthorized"}), 403
+    try:
+        job_id = job_queue.enqueue("sweep_orphans", {})
+        return jsonify({"message": "Orphan sweep started", "job_id": job_id}), 202
     except Exception as e:
-        return jsonify({"error": "Invalid User ID"}), 400
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# 5. Cleanup Job Status (progress report)
+@admin_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job_status(job_id):
+    if not is_admin(get_jwt()):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    job = job_queue.get(job_id)
+    if not job or job.get("type") not in ("cascade_delete_user", "sweep_orphans"):
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(serialize_job(job)), 200
\ No newline at end of file
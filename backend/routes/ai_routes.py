@@ -1,9 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from services.ai_service import get_chat_response, generate_quiz_json, generate_study_plan
+from services.ai_service import get_chat_response, stream_chat_response, generate_quiz_json, ChatStreamInterrupted
 from database.connection import get_db
+from services.chat_log_buffer import chat_log_buffer
+from services.weakness_index import get_weak_topics
+from services.study_plan_cache import get_plan
 from datetime import datetime, timezone
 from bson import ObjectId
+import json
 
 ai_bp = Blueprint('ai', __name__)
 
@@ -18,7 +22,8 @@ def chat():
         try: uid = ObjectId(user_id)
         except: uid = user_id
         
-        get_db().chat_logs.insert_one({
+        # Write-behind buffer: batch mein insert hoga, request wait nahi karti
+        chat_log_buffer.add({
             "user_id": uid,
             "message": data.get('message'),
             "reply": reply,
@@ -28,6 +33,54 @@ def chat():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# 1b. Chat Route (Streaming, Server-Sent Events)
+@ai_bp.route('/chat/stream', methods=['POST'])
+@jwt_required()
+def chat_stream():
+    data = request.json or {}
+    message = data.get('message')
+    if not message:
+        return jsonify({"error": "Message is required"}), 400
+
+    user_id = get_jwt_identity()
+    try: uid = ObjectId(user_id)
+    except: uid = user_id
+
+    def sse(payload, event=None):
+        prefix = f"event: {event}\n" if event else ""
+        return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+    def generate():
+        parts = []
+        try:
+            for text in stream_chat_response(message):
+                parts.append(text)
+                yield sse({"token": text})
+        except ChatStreamInterrupted as e:
+            # Adhoora reply log nahi hota; client ko error event milta hai
+            print(f"❌ Chat Stream Error: {e}")
+            yield sse({"error": "The AI response was interrupted. Please try again."}, event="error")
+            return
+
+        # Stream khatam: poora reply chat_logs mein save karo
+        reply = "".join(parts).strip() or "I am thinking..."
+        try:
+            chat_log_buffer.add({
+                "user_id": uid,
+                "message": message,
+                "reply": reply,
+                "timestamp": datetime.now(timezone.utc)
+            })
+        except Exception as e:
+            print(f"❌ Chat Log Error: {e}")
+        yield sse({"reply": reply}, event="done")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # 2. Quiz Route
 @ai_bp.route('/generate-quiz', methods=['POST'])
 @jwt_required()
@@ -50,12 +103,15 @@ def get_recommendation():
         try: uid = ObjectId(user_id)
         except: uid = user_id
 
-        weak_records = list(db.progress.find({"user_id": uid, "score": {"$lt": 60}}))
-        if not weak_records: return jsonify({"message": "Great job! No weak areas found."})
+        # Weakness index: sab se kamzor (recent + baar baar fail) topics, ek chhota document
+        weak_topics = get_weak_topics(db, uid)
+        if not weak_topics: return jsonify({"message": "Great job! No weak areas found."})
 
-        topics = list(set([r.get('topic', 'General') for r in weak_records]))
-        ai_plan = generate_study_plan(", ".join(topics))
-        return jsonify({"message": ai_plan}), 200
+        # Cached plan (same weak topics = same plan); naya plan background job banata hai
+        plan, fresh = get_plan(db, uid, [t['topic'] for t in weak_topics])
+        if plan is None:
+            return jsonify({"message": "Preparing your personalized study plan... 🤖", "pending": True}), 202
+        return jsonify({"message": plan, "stale": not fresh}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -69,11 +125,11 @@ def adaptive_quiz():
         try: uid = ObjectId(user_id)
         except: uid = user_id
 
-        # Find weakest topic
-        weakest_record = db.progress.find_one({"user_id": uid, "score": {"$lt": 60}}, sort=[("score", 1)])
-        
-        if weakest_record and weakest_record.get('topic'):
-            target_topic = weakest_record['topic']
+        # Find weakest topic (decayed mastery, recent + repeated failures first)
+        weak_topics = get_weak_topics(db, uid, limit=1)
+
+        if weak_topics:
+            target_topic = weak_topics[0]['topic']
         else:
             target_topic = "General Knowledge" # Fallback if no failure
 
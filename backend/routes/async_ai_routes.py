@@ -0,0 +1,152 @@
+"""
+Async (Quart) versions of routes/ai_routes.py for the async serving mode (asgi.py).
+
+Same URLs, request/response shapes and behaviour; MongoDB is awaited through
+Motor and Gemini through the provider's async API, so a request waiting on
+either holds no thread. Rare slow paths that still use the sync services
+(first-time backfills, queueing a plan refresh) run via asyncio.to_thread.
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from quart import Blueprint, Response, jsonify, request
+
+from database.async_connection import get_async_db
+from database.connection import get_db
+from services.ai_service import aget_chat_response, astream_chat_response, agenerate_quiz_json, ChatStreamInterrupted
+from services.chat_log_buffer import chat_log_buffer
+from services.study_plan_cache import match_plan, try_request_refresh
+from services.weakness_index import get_weak_topics, rank_topics
+from utils.async_auth import jwt_required_async, get_jwt_identity
+
+async_ai_bp = Blueprint('ai_async', __name__)
+
+
+def _uid(user_id):
+    try: return ObjectId(user_id)
+    except Exception: return user_id
+
+
+async def _log_chat(entry):
+    # Buffer chal raha ho to sirf memory append; warna seedha async insert
+    if chat_log_buffer.running:
+        chat_log_buffer.add(entry)
+    else:
+        await get_async_db().chat_logs.insert_one(entry)
+
+
+async def _weak_topics(uid, limit=None):
+    doc = await get_async_db().weakness_index.find_one({"_id": uid}, {"topics": 1})
+    if doc is None:
+        # Index abhi bana nahi: ek dafa progress se backfill
+        return await asyncio.to_thread(get_weak_topics, get_db(), uid, limit)
+    return rank_topics(doc, limit)
+
+
+# 1. Chat Route
+@async_ai_bp.route('/chat', methods=['POST'])
+@jwt_required_async
+async def chat():
+    try:
+        data = await request.get_json()
+        reply = await aget_chat_response(data.get('message'))
+        await _log_chat({
+            "user_id": _uid(get_jwt_identity()),
+            "message": data.get('message'),
+            "reply": reply,
+            "timestamp": datetime.now(timezone.utc)
+        })
+        return jsonify({"reply": reply}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# 1b. Chat Route (Streaming, Server-Sent Events)
+@async_ai_bp.route('/chat/stream', methods=['POST'])
+@jwt_required_async
+async def chat_stream():
+    data = await request.get_json() or {}
+    message = data.get('message')
+    if not message:
+        return jsonify({"error": "Message is required"}), 400
+    uid = _uid(get_jwt_identity())
+
+    def sse(payload, event=None):
+        prefix = f"event: {event}\n" if event else ""
+        return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+    async def generate():
+        parts = []
+        try:
+            async for text in astream_chat_response(message):
+                parts.append(text)
+                yield sse({"token": text}).encode("utf-8")
+        except ChatStreamInterrupted as e:
+            print(f"❌ Chat Stream Error: {e}")
+            yield sse({"error": "The AI response was interrupted. Please try again."}, event="error").encode("utf-8")
+            return
+
+        reply = "".join(parts).strip() or "I am thinking..."
+        try:
+            await _log_chat({"user_id": uid, "message": message, "reply": reply,
+                             "timestamp": datetime.now(timezone.utc)})
+        except Exception as e:
+            print(f"❌ Chat Log Error: {e}")
+        yield sse({"reply": reply}, event="done").encode("utf-8")
+
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.timeout = None  # stream Gemini jitni der chale
+    return response
+
+
+# 2. Quiz Route
+@async_ai_bp.route('/generate-quiz', methods=['POST'])
+@jwt_required_async
+async def quiz():
+    try:
+        data = await request.get_json()
+        quiz_data = await agenerate_quiz_json(data.get('topic'), 'Medium')
+        if not quiz_data: return jsonify({"error": "AI failed"}), 500
+        return jsonify(quiz_data), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# 3. Recommendation Route
+@async_ai_bp.route('/recommendation', methods=['GET'])
+@jwt_required_async
+async def get_recommendation():
+    try:
+        uid = _uid(get_jwt_identity())
+        weak_topics = await _weak_topics(uid)
+        if not weak_topics: return jsonify({"message": "Great job! No weak areas found."})
+
+        topics = [t['topic'] for t in weak_topics]
+        doc = await get_async_db().study_plans.find_one({"_id": uid}, {"plan": 1, "topics_hash": 1})
+        plan, fresh, digest = match_plan(doc, topics)
+        if not fresh:
+            await asyncio.to_thread(try_request_refresh, get_db(), uid, topics, digest)
+        if plan is None:
+            return jsonify({"message": "Preparing your personalized study plan... 🤖", "pending": True}), 202
+        return jsonify({"message": plan, "stale": not fresh}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# 4. ADAPTIVE QUIZ
+@async_ai_bp.route('/generate-adaptive-quiz', methods=['POST'])
+@jwt_required_async
+async def adaptive_quiz():
+    try:
+        weak_topics = await _weak_topics(_uid(get_jwt_identity()), limit=1)
+        target_topic = weak_topics[0]['topic'] if weak_topics else "General Knowledge"
+
+        quiz_data = await agenerate_quiz_json(target_topic, 'Hard')
+        if not quiz_data: return jsonify({"error": "AI failed"}), 500
+
+        return jsonify({"quiz": quiz_data, "topic": target_topic}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
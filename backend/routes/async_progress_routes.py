@@ -0,0 +1,171 @@
+"""
+Async (Quart) versions of routes/progress_routes.py for the async serving mode (asgi.py).
+
+Progress, user_stats and weakness-index writes are awaited through Motor using
+the same update documents as the sync services (score_update, attempt_pipeline),
+so both modes keep the materialized data identical.
+"""
+import asyncio
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from quart import Blueprint, current_app, jsonify, request
+
+from database.async_connection import get_async_db
+from database.connection import get_db
+from services import progress_batch, user_stats, weakness_index
+from services.study_plan_cache import refresh_if_changed
+from utils.async_auth import jwt_required_async, get_jwt_identity
+from utils.pagination import InvalidCursor, keyset_query, parse_page_args, split_page, with_next_cursor
+
+async_progress_bp = Blueprint('progress_async', __name__)
+
+
+def safe_object_id(uid):
+    try:
+        return ObjectId(uid)
+    except Exception:
+        return uid
+
+
+# 1. Update Progress (Save Quiz Score)
+@async_progress_bp.route('/update', methods=['POST'])
+@jwt_required_async
+async def update_progress():
+    try:
+        data = await request.get_json()
+        adb = get_async_db()
+
+        record, error = progress_batch.parse_record(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        identifier, topic_name, score = record['module_id'], record['topic'], record['score']
+        user_obj_id = safe_object_id(get_jwt_identity())
+
+        now = datetime.now(timezone.utc)
+
+        previous = await adb.progress.find_one_and_update(
+            {"user_id": user_obj_id, "module_id": identifier},
+            {"$set": {
+                "topic": topic_name,
+                "status": record['status'],
+                "score": score,
+                "last_updated": now
+            }},
+            upsert=True,
+            projection={"score": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        old_score, replaced = (previous or {}).get('score', 0), previous is not None
+
+        # Stats aur weakness index ek saath (dono alag documents hain)
+        stats_before, weakness_before, has_plan = await asyncio.gather(
+            adb.user_stats.find_one_and_update(
+                {"_id": user_obj_id}, user_stats.score_update(score, old_score, replaced, now),
+                upsert=True, projection={"min_score": 1, "max_score": 1}
+            ),
+            adb.weakness_index.find_one_and_update(
+                {"_id": user_obj_id}, weakness_index.attempt_pipeline(topic_name, score, now),
+                upsert=True, projection={"_id": 1}
+            ),
+            adb.study_plans.find_one({"_id": user_obj_id}, {"_id": 1})
+        )
+
+        # Kam hi hota hai: backfill / min-max recompute / plan refresh sync services se
+        action = user_stats.score_followup(stats_before, score, old_score, replaced)
+        if action:
+            await asyncio.to_thread(user_stats.apply_followup, get_db(), user_obj_id, action)
+        if weakness_before is None:
+            await asyncio.to_thread(weakness_index.rebuild_user, get_db(), user_obj_id)
+        if has_plan:
+            await asyncio.to_thread(refresh_if_changed, get_db(), user_obj_id)
+
+        return jsonify({"message": "Progress saved successfully"}), 200
+
+    except Exception as e:
+        print(f"❌ Save Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# 1b. Bulk Update (offline / classroom sync)
+@async_progress_bp.route('/bulk', methods=['POST'])
+@jwt_required_async
+async def bulk_update_progress():
+    try:
+        data = await request.get_json(silent=True) or {}
+        records = data.get('records') if isinstance(data, dict) else data
+        if not isinstance(records, list) or not records:
+            return jsonify({"error": "records must be a non-empty list"}), 400
+        max_records = current_app.config['PROGRESS_BULK_MAX_RECORDS']
+        if len(records) > max_records:
+            return jsonify({"error": f"At most {max_records} records per request"}), 413
+
+        adb = get_async_db()
+        user_obj_id = safe_object_id(get_jwt_identity())
+        now = datetime.now(timezone.utc)
+
+        results, writes, superseded = progress_batch.plan_batch(records)
+        if writes:
+            batch_id = progress_batch.new_batch_id()
+            try:
+                upserted, failed = progress_batch.write_outcome(await adb.progress.bulk_write(
+                    progress_batch.progress_ops(user_obj_id, writes, now, batch_id), ordered=False))
+            except BulkWriteError as e:
+                upserted, failed = progress_batch.write_outcome(error=e)
+            captured = progress_batch.captured_query(user_obj_id, batch_id)
+            previous = progress_batch.previous_scores(
+                await adb.progress.find(captured, progress_batch.CAPTURED_PROJECTION).to_list(None))
+            await adb.progress.update_many(captured, progress_batch.CLEAR_CAPTURE)
+
+            changes, attempts, needs_rebuild = progress_batch.finish_batch(
+                results, writes, superseded, previous, upserted, failed)
+            if changes:
+                # Poore batch ke liye sirf chand updates: ek thread kaafi hai
+                await asyncio.to_thread(progress_batch.apply_materialized, get_db(), user_obj_id,
+                                        changes, attempts, needs_rebuild, now)
+
+        return jsonify({"results": results, "summary": progress_batch.summarize(results)}), 200
+
+    except Exception as e:
+        print(f"❌ Bulk Save Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# 2. Get User's Progress History & Stats
+@async_progress_bp.route('/', methods=['GET'])
+@jwt_required_async
+async def get_my_progress():
+    try:
+        adb = get_async_db()
+        user_obj_id = safe_object_id(get_jwt_identity())
+        limit, after = parse_page_args(request.args, current_app.config)
+
+        query = keyset_query({"user_id": user_obj_id}, "last_updated", -1, after)
+        cursor = adb.progress.find(query).sort([("last_updated", -1), ("_id", -1)]).limit(limit + 1)
+        docs, stats_doc = await asyncio.gather(cursor.to_list(limit + 1), adb.user_stats.find_one({"_id": user_obj_id}))
+        history, next_cursor = split_page(docs, limit, "last_updated")
+
+        for h in history:
+            if 'topic' not in h:
+                h['topic'] = str(h.get('module_id', 'Unknown Quiz'))
+
+        if stats_doc is None:
+            stats_doc = await asyncio.to_thread(user_stats.rebuild_user, get_db(), user_obj_id)
+        stats = user_stats.shape_stats(stats_doc)
+
+        return with_next_cursor(jsonify({
+            "history": history,
+            "stats": {
+                "total_quizzes": stats['total_quizzes'],
+                "average_score": stats['average_score']
+            }
+        }), next_cursor), 200
+
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ History Error: {e}")
+        return jsonify({"error": str(e)}), 500
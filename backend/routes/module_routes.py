@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 from database.connection import get_db
-from utils.serializers import serialize_list
+from utils.pagination import paginate, paginated_response, get_page_args, InvalidCursor
+from utils.http_cache import conditional
+from services.catalog_cache import catalog_cache
 from datetime import datetime, timezone
 
 module_bp = Blueprint('module', __name__)
@@ -14,12 +16,18 @@ def is_staff(claims):
 # 1. Get All Modules (Available to Everyone)
 @module_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional("modules")
 def get_modules():
     try:
-        db = get_db()
-        # Sort by newest first
-        modules = db.modules.find().sort("created_at", -1)
-        return jsonify(serialize_list(modules)), 200
+        # Sort by newest first (keyset paged: ?limit=&cursor=), in-process cache se (settled data secondary se)
+        limit, after = get_page_args()
+        modules, next_cursor = catalog_cache.get_or_load(
+            "modules", ("page", limit, request.args.get('cursor')),
+            lambda: paginate(catalog_cache.read_db("modules").modules, {}, "created_at", limit=limit, after=after)
+        )
+        return paginated_response(modules, next_cursor), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -52,6 +60,7 @@ def create_module():
         }
         
         db.modules.insert_one(new_module)
+        catalog_cache.invalidate("modules", db)  # Cache + ETags stale ho jayenge (sab workers)
         return jsonify({"message": "Module created successfully"}), 201
         
     except Exception as e:
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from database.connection import get_db
 from bson import ObjectId  # <--- YEH ZAROORI HAI
+from services.user_stats import get_user_stats
 
 performance_bp = Blueprint('performance', __name__)
 
@@ -22,26 +23,13 @@ def performance_summary():
         except:
             user_obj_id = user_id
 
-        # Correct Query using ObjectId
-        attempts = list(db.progress.find({"user_id": user_obj_id}))
-        
-        if not attempts:
-            return jsonify({
-                "average_score": 0,
-                "total_quizzes": 0,
-                "modules_completed": 0
-            }), 200
-
-        # Stats Calculation
-        total_score = sum([a.get('score', 0) for a in attempts])
-        completed_count = len(attempts)
-        
-        average = round(total_score / completed_count, 1) if completed_count > 0 else 0
+        # Materialized stats: ek hi document read (O(1))
+        stats = get_user_stats(db, user_obj_id)
         
         return jsonify({
-            "average_score": average,
-            "total_quizzes": completed_count,
-            "modules_completed": completed_count
+            "average_score": stats["average_score"],
+            "total_quizzes": stats["total_quizzes"],
+            "modules_completed": stats["total_quizzes"]
         }), 200
 
     except Exception as e:
@@ -1,8 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from database.connection import get_db
 from datetime import datetime, timezone
 from bson import ObjectId
+from pymongo import ReturnDocument
+from services.user_stats import record_score, get_user_stats
+from services.weakness_index import record_attempt
+from services.study_plan_cache import refresh_if_changed
+from services.progress_batch import parse_record, apply_batch, summarize
+from utils.pagination import paginate, with_next_cursor, InvalidCursor
 
 progress_bp = Blueprint('progress', __name__)
 
@@ -22,33 +28,69 @@ def update_progress():
         data = request.json
         db = get_db()
 
-        # Validation
-        identifier = data.get('module_id') or data.get('topic')
-        if not identifier:
-            return jsonify({"error": "Module ID or Topic is required"}), 400
+        # Validation (bulk endpoint bhi yahi rules use karta hai)
+        record, error = parse_record(data)
+        if error:
+            return jsonify({"error": error}), 400
 
-        topic_name = data.get('topic') or "Unknown Topic"
+        identifier, topic_name, score = record['module_id'], record['topic'], record['score']
         user_obj_id = safe_object_id(user_id)
 
-        # Upsert Progress
-        db.progress.update_one(
+        now = datetime.now(timezone.utc)
+
+        # Upsert Progress (purana score wapas milta hai taake stats sahi update hon)
+        previous = db.progress.find_one_and_update(
             {"user_id": user_obj_id, "module_id": identifier},
             {
                 "$set": {
                     "topic": topic_name,
-                    "status": data.get('status', 'Completed'),
-                    "score": data.get('score', 0),
-                    "last_updated": datetime.now(timezone.utc)
+                    "status": record['status'],
+                    "score": score,
+                    "last_updated": now
                 }
             },
-            upsert=True
+            upsert=True,
+            projection={"score": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+
+        # Materialized stats (user_stats) incrementally update karo
+        record_score(
+            db, user_obj_id, score,
+            old_score=(previous or {}).get('score', 0),
+            replaced=previous is not None,
+            when=now
         )
+        # Weakness index (recommendations / adaptive quiz isi se topic chunte hain)
+        record_attempt(db, user_obj_id, topic_name, score, when=now)
+        # Weak topics badle to study plan background mein dobara banega (best-effort, khud error log karta hai)
+        refresh_if_changed(db, user_obj_id)
         return jsonify({"message": "Progress saved successfully"}), 200
 
     except Exception as e:
         print(f"❌ Save Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# 1b. Bulk Update (offline / classroom sync: many scores in one request)
+@progress_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_update_progress():
+    try:
+        data = request.get_json(silent=True) or {}
+        records = data.get('records') if isinstance(data, dict) else data
+        if not isinstance(records, list) or not records:
+            return jsonify({"error": "records must be a non-empty list"}), 400
+        max_records = current_app.config['PROGRESS_BULK_MAX_RECORDS']
+        if len(records) > max_records:
+            return jsonify({"error": f"At most {max_records} records per request"}), 413
+
+        results = apply_batch(get_db(), safe_object_id(get_jwt_identity()), records, datetime.now(timezone.utc))
+        return jsonify({"results": results, "summary": summarize(results)}), 200
+
+    except Exception as e:
+        print(f"❌ Bulk Save Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 # 2. Get User's Progress History & Stats
 @progress_bp.route('/', methods=['GET'])
 @jwt_required()
@@ -60,44 +102,31 @@ def get_my_progress():
 
         print(f"📡 Fetching History for User: {user_obj_id}")
 
-        # Fetch from DB (Newest first)
-        cursor = db.progress.find({"user_id": user_obj_id}).sort("last_updated", -1)
-        history = list(cursor)
+        # Fetch one page from DB (Newest first, keyset paged: ?limit=&cursor=)
+        history, next_cursor = paginate(db.progress, {"user_id": user_obj_id}, "last_updated")
 
-        # --- Clean & Serialize Data ---
-        clean_history = []
-        total_score = 0
-        
+        # Ensure Topic Name exists (ObjectIds JSON provider khud encode karta hai)
         for h in history:
-            # Convert ObjectIds to String for JSON
-            h['_id'] = str(h.get('_id'))
-            h['user_id'] = str(h.get('user_id'))
-            
-            if isinstance(h.get('module_id'), ObjectId):
-                h['module_id'] = str(h['module_id'])
-            
-            # Ensure Topic Name exists
             if 'topic' not in h:
                 h['topic'] = str(h.get('module_id', 'Unknown Quiz'))
 
-            # Score Sum for Average Calculation
-            total_score += h.get('score', 0)
-            clean_history.append(h)
-
-        # Calculate Statistics
-        total_quizzes = len(clean_history)
-        avg_score = round(total_score / total_quizzes, 1) if total_quizzes > 0 else 0
+        # Statistics: materialized user_stats document se (O(1))
+        stats = get_user_stats(db, user_obj_id)
+        total_quizzes = stats['total_quizzes']
+        avg_score = stats['average_score']
         
-        print(f"✅ Returns: {total_quizzes} records, Avg: {avg_score}%")
+        print(f"✅ Returns: {len(history)} records, Avg: {avg_score}%")
 
-        return jsonify({
-            "history": clean_history,
+        return with_next_cursor(jsonify({
+            "history": history,
             "stats": {
                 "total_quizzes": total_quizzes,
                 "average_score": avg_score
             }
-        }), 200
+        }), next_cursor), 200
 
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ History Error: {e}")
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
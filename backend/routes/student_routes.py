@@ -1,8 +1,11 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from database.connection import get_db
-from utils.serializers import serialize_doc, serialize_list
-from utils.hash_helper import hash_password
+from utils.pagination import paginate, paginated_response, get_page_args, InvalidCursor
+from utils.json_provider import stream_json_array
+from utils.http_cache import conditional, bump_version
+from services.catalog_cache import catalog_cache
+from utils.hash_helper import hash_password, HashQueueFull
 from bson import ObjectId
 from datetime import datetime, timezone
 
@@ -21,57 +24,73 @@ def get_profile():
             return jsonify({"error": "User not found"}), 404
 
         user.pop("password", None)
-        return jsonify(serialize_doc(user)), 200
+        return jsonify(user), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # 2. Get Assigned Quizzes
 @student_bp.route('/assigned-quizzes', methods=['GET'])
 @jwt_required()
+@conditional("quizzes")
 def get_assigned_quizzes():
     try:
-        db = get_db()
-        quizzes = db.quizzes.find({"created_by": "Teacher"}).sort("created_at", -1)
-        return jsonify(serialize_list(quizzes)), 200
+        limit, after = get_page_args()
+        quizzes, next_cursor = catalog_cache.get_or_load(
+            "quizzes", ("assigned", limit, request.args.get('cursor')),
+            lambda: paginate(catalog_cache.read_db("quizzes").quizzes, {"created_by": "Teacher"}, "created_at", limit=limit, after=after)
+        )
+        return paginated_response(quizzes, next_cursor), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # 3. Get Available Courses (FIXED: ObjectId Issue Solved)
 @student_bp.route('/courses', methods=['GET'])
 @jwt_required()
+@conditional("modules", "enrollments:{user}")
 def get_courses():
     try:
         user_id = get_jwt_identity()
         db = get_db()
         
-        # 1. Fetch all courses
-        all_courses = list(db.modules.find({}))
-        
-        final_courses = []
-        for course in all_courses:
-            # --- FIX: Convert ALL ObjectIds to String ---
-            course['_id'] = str(course['_id'])
-            
-            # Agar created_by field hai, usay bhi string banao
-            if course.get('created_by'):
-                course['created_by'] = str(course['created_by'])
-
-            # 2. Check Enrollment Status
-            is_enrolled = db.enrollments.find_one({
-                "user_id": user_id, 
-                "course_id": course['_id']
-            })
-            
-            course['is_enrolled'] = True if is_enrolled else False
-            final_courses.append(course)
-
-        return jsonify(final_courses), 200
+        # 1. Enrollment Status: user ke saare enrollments ek hi query mein
+        enrolled_ids = {
+            e["course_id"] for e in db.enrollments.find({"user_id": user_id}, {"course_id": 1, "_id": 0})
+        }
+
+        # 2. Courses (without the heavy 'content' body), in-process catalog cache se
+        courses = catalog_cache.get_or_load(
+            "modules", ("catalog",), lambda: list(catalog_cache.read_db("modules").modules.find({}, {"content": 0}))
+        )
+
+        # Cached docs shared hain: copy banao, mutate mat karo
+        def with_enrollment(course):
+            return {**course, "is_enrolled": str(course['_id']) in enrolled_ids}
+
+        return stream_json_array(courses, with_enrollment), 200
 
     except Exception as e:
         print(f"❌ COURSES ERROR: {str(e)}")
         return jsonify({"error": "Server Error loading courses"}), 500
 
-# 4. Enroll in Course
+# 4. Get Single Course (Full content, loaded when student clicks 'Start')
+@student_bp.route('/courses/<course_id>', methods=['GET'])
+@jwt_required()
+def get_course(course_id):
+    try:
+        if not ObjectId.is_valid(course_id):
+            return jsonify({"error": "Invalid Course ID"}), 400
+
+        course = get_db().modules.find_one({"_id": ObjectId(course_id)})
+        if not course:
+            return jsonify({"error": "Course not found"}), 404
+
+        return jsonify(course), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 5. Enroll in Course
 @student_bp.route('/enroll', methods=['POST'])
 @jwt_required()
 def enroll_course():
@@ -90,11 +109,12 @@ def enroll_course():
             {"$set": {"enrolled_at": datetime.now(timezone.utc)}},
             upsert=True
         )
+        bump_version(db, f"enrollments:{user_id}")
         return jsonify({"message": "Enrolled Successfully!"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# 5. Update Profile
+# 6. Update Profile
 @student_bp.route('/update-profile', methods=['PUT'])
 @jwt_required()
 def update_profile():
@@ -111,5 +131,7 @@ def update_profile():
             db.users.update_one({"_id": ObjectId(user_id)}, {"$set": updates})
         
         return jsonify({"message": "Profile Updated!"}), 200
+    except HashQueueFull:
+        raise  # app-level handler answers 503 + Retry-After
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -1,9 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
-from database.connection import get_db
-from services.ai_service import generate_quiz_json
-from utils.serializers import serialize_list
-from datetime import datetime, timezone
+from database.connection import get_db, get_analytics_db
+from services.job_queue import job_queue, serialize_job
+from services.quiz_publisher import enqueue_quiz_batch, MAX_TOPICS_PER_BATCH
+from services.analytics_service import get_class_analytics
+from utils.pagination import paginate, paginated_response, get_page_args, with_next_cursor, InvalidCursor
 
 teacher_bp = Blueprint('teacher', __name__)
 
@@ -18,59 +19,31 @@ def get_analytics():
         claims = get_jwt()
         if not is_teacher(claims): return jsonify({"error": "Unauthorized"}), 403
         
-        db = get_db()
-        
-        # 1. Basic Stats
-        total_students = db.users.count_documents({"role": "Student"})
-        total_quizzes = db.quizzes.count_documents({"created_by": "Teacher"})
-        
-        # 2. Detailed Student Performance
-        students_cursor = db.users.find({"role": "Student"})
-        student_performance = []
-        
-        class_total_score = 0
-        total_attempts_class = 0
-
-        for student in students_cursor:
-            uid = student["_id"]
-            # Fetch this student's progress
-            progress = list(db.progress.find({"user_id": uid}))
-            
-            quizzes_taken = len(progress)
-            total_score = sum([p.get('score', 0) for p in progress])
-            
-            # Student Average
-            avg_score = round(total_score / quizzes_taken, 1) if quizzes_taken > 0 else 0
-            
-            # Class Totals Calculation
-            class_total_score += total_score
-            total_attempts_class += quizzes_taken
-
-            student_performance.append({
-                "_id": str(uid),
-                "name": student['name'],
-                "email": student['email'],
-                "quizzes_taken": quizzes_taken,
-                "average_score": avg_score,
-                "status": "Active" if quizzes_taken > 0 else "Inactive"
-            })
-
-        # Class Average Calculation
-        class_avg = round(class_total_score / total_attempts_class, 1) if total_attempts_class > 0 else 0
+        # Paging: ?limit=50&cursor=<X-Next-Cursor of the previous page>
+        limit, after = get_page_args()
 
-        return jsonify({
-            "stats": {
-                "total_students": total_students,
-                "total_quizzes": total_quizzes,
-                "class_average": class_avg
-            },
-            "students": student_performance
-        }), 200
+        # Read-heavy dashboard: secondary se (bounded staleness), primary ko writes ke liye free rakho
+        db = get_analytics_db()
+
+        # 1. Page of students (one aggregation, progress summed per student on the server)
+        analytics = get_class_analytics(db, limit, after)
+
+        # 2. Class totals sirf pehle page par (baad ke pages par "stats": null)
+        stats = analytics["stats"]
+        if stats is not None:
+            stats["total_quizzes"] = db.quizzes.count_documents({"created_by": "Teacher"})
 
+        return with_next_cursor(jsonify({
+            "stats": stats,
+            "students": analytics["students"]
+        }), analytics["next_cursor"]), 200
+
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# 2. Create Quiz (Same as before)
+# 2. Create Quiz (Async: jobs queue mein jate hain, frontend status poll karta hai)
 @teacher_bp.route('/create-quiz', methods=['POST'])
 @jwt_required()
 def create_class_quiz():
@@ -78,32 +51,57 @@ def create_class_quiz():
         claims = get_jwt()
         if not is_teacher(claims): return jsonify({"error": "Access Denied"}), 403
 
-        data = request.json
-        topic = data.get('topic')
-        if not topic: return jsonify({"error": "Topic is required"}), 400
-
-        # AI Generation
-        quiz_questions = generate_quiz_json(topic, 'Medium')
-        if not quiz_questions: return jsonify({"error": "AI failed"}), 500
-
-        new_quiz = {
-            "topic": topic,
-            "difficulty": 'Medium',
-            "questions": quiz_questions,
-            "created_by": "Teacher",
-            "teacher_id": get_jwt_identity(),
-            "created_at": datetime.now(timezone.utc)
-        }
-        get_db().quizzes.insert_one(new_quiz)
-
-        return jsonify({"message": "Quiz Published Successfully!", "quiz": quiz_questions}), 201
+        data = request.json or {}
+        # Ek topic ('topic') ya kai topics ek saath ('topics': [...])
+        topics = data.get('topics') or [data.get('topic')]
+        topics = [t.strip() for t in topics if isinstance(t, str) and t.strip()]
+        if not topics: return jsonify({"error": "Topic is required"}), 400
+        if len(topics) > MAX_TOPICS_PER_BATCH:
+            return jsonify({"error": f"Maximum {MAX_TOPICS_PER_BATCH} topics per request"}), 400
+
+        batch_id, job_ids = enqueue_quiz_batch(topics, get_jwt_identity())
+
+        return jsonify({
+            "message": "Quiz generation started",
+            "batch_id": batch_id,
+            "job_id": job_ids[0],
+            "job_ids": job_ids
+        }), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# 2b. Quiz Job Status (single job)
+@teacher_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job_status(job_id):
+    if not is_teacher(get_jwt()): return jsonify({"error": "Unauthorized"}), 403
+
+    job = job_queue.get(job_id)
+    if not job or job.get("payload", {}).get("teacher_id") != get_jwt_identity():
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(serialize_job(job)), 200
+
+# 2c. Quiz Job Status (whole batch)
+@teacher_bp.route('/jobs', methods=['GET'])
+@jwt_required()
+def get_batch_status():
+    if not is_teacher(get_jwt()): return jsonify({"error": "Unauthorized"}), 403
+
+    batch_id = request.args.get('batch_id')
+    if not batch_id: return jsonify({"error": "batch_id is required"}), 400
+
+    jobs = get_db().jobs.find({"batch_id": batch_id, "payload.teacher_id": get_jwt_identity()}).sort("created_at", 1)
+    return jsonify([serialize_job(j) for j in jobs]), 200
+
 # 3. Get Students List (Simple)
 @teacher_bp.route('/students', methods=['GET'])
 @jwt_required()
 def get_students():
     if not is_teacher(get_jwt()): return jsonify({"error": "Unauthorized"}), 403
-    students = get_db().users.find({"role": "Student"}, {"password": 0})
-    return jsonify(serialize_list(students)), 200
\ No newline at end of file
+    try:
+        students, next_cursor = paginate(get_db().users, {"role": "Student", "deleted": {"$ne": True}}, "created_at", {"password": 0})
+        return paginated_response(students, next_cursor), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Concurrency limiter + circuit breaker around upstream AI (Gemini) calls.
+
+- Limiter: at most `max_concurrency` AI calls per worker. Extra callers wait up
+  to `queue_timeout` seconds for a slot, then fail fast instead of pinning a
+  Flask thread that non-AI endpoints need.
+- Circuit breaker: when the error rate over the last `window` calls crosses
+  `error_rate`, the breaker opens and calls fail immediately for `cooldown`
+  seconds. After that one trial call is let through (half-open); success closes
+  the breaker again.
+
+The async serving mode uses aslot()/acall(): same breaker, stats and the same
+`max_concurrency` slots as the thread callers (background jobs), so the two
+together never run more than max_concurrency AI calls per worker. Async
+waiters poll for a free slot instead of blocking a thread.
+
+Both failures raise AIUnavailableError, which ai_service turns into its usual
+fallback replies. Queue depth, in-flight calls and breaker state are exported
+as /metrics gauges.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from config import Config
+from utils.metrics import registry
+from utils.profiling import record
+
+
+class AIUnavailableError(Exception):
+    """Raised when the limiter is full or the circuit breaker is open."""
+
+
+class AIGuard:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, max_concurrency=8, queue_timeout=5, error_rate=0.5,
+                 min_calls=10, window=20, cooldown=30):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True = success
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._waiting = 0
+        self._in_flight = 0
+        self._stats = {"calls": 0, "failures": 0, "rejected_queue_full": 0, "rejected_breaker_open": 0}
+
+    # --- Circuit breaker ---
+
+    def _allow(self):
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_running = False
+            if self._state == self.HALF_OPEN:
+                if self._trial_running:
+                    return False
+                self._trial_running = True
+            return True
+
+    def _record(self, success):
+        with self._lock:
+            self._stats["calls"] += 1
+            if not success:
+                self._stats["failures"] += 1
+
+            if self._state == self.HALF_OPEN:
+                self._trial_running = False
+                if success:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._state = self.OPEN
+                    self._opened_at = time.monotonic()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                print(f"⚠️ AI circuit breaker OPEN ({failures}/{len(self._outcomes)} failed)")
+
+    # --- Limiter ---
+
+    def _check_breaker(self):
+        if not self._allow():
+            with self._lock:
+                self._stats["rejected_breaker_open"] += 1
+            raise AIUnavailableError("AI circuit breaker is open")
+
+    def _begin_wait(self):
+        with self._lock:
+            self._waiting += 1
+
+    def _end_wait(self, acquired, started):
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._in_flight += 1
+            else:
+                self._stats["rejected_queue_full"] += 1
+                if self._state == self.HALF_OPEN:
+                    self._trial_running = False
+        if not acquired:
+            record("ai", time.perf_counter() - started)
+            raise AIUnavailableError("AI concurrency limit reached")
+
+    def _finish(self, success, started):
+        with self._lock:
+            self._in_flight -= 1
+        self._record(success)
+        record("ai", time.perf_counter() - started)
+
+    @contextmanager
+    def slot(self):
+        """Holds one AI slot for the duration of the block (also used for streaming)."""
+        self._check_breaker()
+        started = time.perf_counter()
+        self._begin_wait()
+        self._end_wait(self._slots.acquire(timeout=self.queue_timeout), started)
+
+        success = False
+        try:
+            yield
+            success = True
+        except GeneratorExit:
+            # Client closed a stream early; not an upstream failure
+            success = True
+            raise
+        finally:
+            self._slots.release()
+            self._finish(success, started)
+
+    async def _acquire_async(self):
+        """Takes one of the shared thread slots without blocking the event loop (False on timeout)."""
+        deadline = time.monotonic() + self.queue_timeout
+        delay = 0.005
+        while not self._slots.acquire(blocking=False):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Cancel ho jaye to kuch hold nahi kiya hota, is liye leak nahi
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.05)
+        return True
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Async twin of slot() for the async serving mode: same breaker, stats and slots, waits without a thread."""
+        self._check_breaker()
+        started = time.perf_counter()
+        self._begin_wait()
+        try:
+            acquired = await self._acquire_async()
+        except asyncio.CancelledError:
+            with self._lock:
+                self._waiting -= 1
+                if self._state == self.HALF_OPEN:
+                    self._trial_running = False
+            raise
+        self._end_wait(acquired, started)
+
+        success = False
+        try:
+            yield
+            success = True
+        except (GeneratorExit, asyncio.CancelledError):
+            # Client disconnected mid-stream; not an upstream failure
+            success = True
+            raise
+        finally:
+            self._slots.release()
+            self._finish(success, started)
+
+    async def acall(self, fn, *args, **kwargs):
+        async with self.aslot():
+            return await fn(*args, **kwargs)
+
+    def call(self, fn, *args, **kwargs):
+        with self.slot():
+            return fn(*args, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            state = self._state
+            if state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                state = self.HALF_OPEN
+            window = len(self._outcomes)
+            return {
+                **self._stats,
+                "breaker_state": state,
+                "window_error_rate": round(self._outcomes.count(False) / window, 3) if window else 0,
+                "queue_depth": self._waiting,
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency
+            }
+
+
+ai_guard = AIGuard(
+    max_concurrency=Config.AI_MAX_CONCURRENCY,
+    queue_timeout=Config.AI_QUEUE_TIMEOUT_SECONDS,
+    error_rate=Config.AI_BREAKER_ERROR_RATE,
+    min_calls=Config.AI_BREAKER_MIN_CALLS,
+    window=Config.AI_BREAKER_WINDOW,
+    cooldown=Config.AI_BREAKER_COOLDOWN_SECONDS
+)
+
+
+BREAKER_STATES = (AIGuard.CLOSED, AIGuard.OPEN, AIGuard.HALF_OPEN)
+
+
+def _guard_gauge(field):
+    return lambda: ai_guard.stats()[field]
+
+
+registry.gauge("ai_guard_queue_depth", "AI calls waiting for a concurrency slot.", _guard_gauge("queue_depth"))
+registry.gauge("ai_guard_in_flight", "AI calls currently running.", _guard_gauge("in_flight"))
+registry.gauge("ai_guard_breaker_state", "Circuit breaker state (1 = current).",
+               lambda: {(state,): int(ai_guard.stats()["breaker_state"] == state) for state in BREAKER_STATES},
+               labels=("state",))
@@ -0,0 +1,162 @@
+"""
+Pluggable text-generation backends for services/ai_service.py.
+
+The Gemini SDK (google.generativeai + grpc/protobuf) is slow to import and
+large in memory, so it is only loaded on the first AI call, not when
+create_app() imports the routes. Workers that never serve an AI request never
+pay for it.
+
+Backends (Config.AI_PROVIDER):
+    gemini  Google Gemini (default)
+    fake    canned local replies after FAKE_AI_LATENCY_SECONDS; for tests,
+            load tests and benchmarks, no network or API key needed
+
+Every backend implements generate(prompt, timeout) -> str and
+stream(prompt, timeout) -> iterator of str chunks, plus awaitable versions
+(agenerate / astream) for the async serving mode (asgi.py).
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from config import Config
+
+
+class AIProvider(ABC):
+    name = "base"
+
+    @abstractmethod
+    def generate(self, prompt, timeout=None):
+        """Returns the whole reply text."""
+
+    def stream(self, prompt, timeout=None):
+        # Default: one chunk with the whole reply
+        yield self.generate(prompt, timeout)
+
+    async def agenerate(self, prompt, timeout=None):
+        # Default: blocking call on a worker thread, so the event loop keeps running
+        return await asyncio.to_thread(self.generate, prompt, timeout)
+
+    async def astream(self, prompt, timeout=None):
+        yield await self.agenerate(prompt, timeout)
+
+
+class GeminiProvider(AIProvider):
+    name = "gemini"
+
+    def __init__(self, model_name="gemini-2.0-flash"):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Imports and configures the SDK once; safe to call from many threads."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+
+                    api_key = os.getenv("GEMINI_API_KEY")
+                    if not api_key:
+                        print("❌ ERROR: GEMINI_API_KEY is missing.")
+                    else:
+                        genai.configure(api_key=api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    @staticmethod
+    def _options(timeout):
+        return {"request_options": {"timeout": timeout}} if timeout else {}
+
+    def generate(self, prompt, timeout=None):
+        response = self.load().generate_content(prompt, **self._options(timeout))
+        return response.text or ""
+
+    def stream(self, prompt, timeout=None):
+        for chunk in self.load().generate_content(prompt, stream=True, **self._options(timeout)):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+    async def agenerate(self, prompt, timeout=None):
+        model = await asyncio.to_thread(self.load)  # first call imports the SDK; keep it off the loop
+        response = await model.generate_content_async(prompt, **self._options(timeout))
+        return response.text or ""
+
+    async def astream(self, prompt, timeout=None):
+        model = await asyncio.to_thread(self.load)
+        async for chunk in await model.generate_content_async(prompt, stream=True, **self._options(timeout)):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class FakeProvider(AIProvider):
+    """Deterministic stand-in: sleeps `latency` seconds, returns canned output."""
+    name = "fake"
+
+    def __init__(self, latency=0.0, stream_chunks=8):
+        self.latency = latency
+        self.stream_chunks = stream_chunks
+
+    def _reply(self, prompt):
+        if "JSON quiz" in prompt:
+            return json.dumps([{"question": f"Sample question {i + 1}?", "options": ["A", "B", "C", "D"],
+                                "answer": "A"} for i in range(3)])
+        if "study plan" in prompt:
+            return "- Re-read the module notes.\n- Practice 10 questions daily.\n- Retake the quiz in 3 days."
+        return "Great question! Break the problem into smaller steps and try one example at a time."
+
+    def generate(self, prompt, timeout=None):
+        time.sleep(self.latency)
+        return self._reply(prompt)
+
+    def stream(self, prompt, timeout=None):
+        text = self._reply(prompt)
+        step = max(1, len(text) // self.stream_chunks)
+        for i in range(0, len(text), step):
+            time.sleep(self.latency / self.stream_chunks)
+            yield text[i:i + step]
+
+    async def agenerate(self, prompt, timeout=None):
+        await asyncio.sleep(self.latency)
+        return self._reply(prompt)
+
+    async def astream(self, prompt, timeout=None):
+        text = self._reply(prompt)
+        step = max(1, len(text) // self.stream_chunks)
+        for i in range(0, len(text), step):
+            await asyncio.sleep(self.latency / self.stream_chunks)
+            yield text[i:i + step]
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def _build_provider(name):
+    if name == "fake":
+        return FakeProvider(latency=Config.FAKE_AI_LATENCY_SECONDS)
+    if name == "gemini":
+        return GeminiProvider(model_name=Config.AI_MODEL_NAME)
+    raise ValueError(f"Unknown AI_PROVIDER '{name}' (expected 'gemini' or 'fake')")
+
+
+def get_provider():
+    """The process-wide provider, built on first use from Config.AI_PROVIDER."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = _build_provider(Config.AI_PROVIDER)
+    return _provider
+
+
+def set_provider(provider):
+    """Swaps the backend (tests, load tests). Pass None to rebuild from config on next use."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
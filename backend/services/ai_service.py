@@ -1,49 +1,103 @@
-import google.generativeai as genai
-import os
+import asyncio
 import json
 import re
+import hashlib
+from services.quiz_cache import quiz_cache, make_cache_key
+from services.single_flight import single_flight, async_single_flight
+from services.ai_guard import ai_guard
+from services.ai_provider import get_provider
+from config import Config
 
-# 1. API Key Load
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    print("❌ ERROR: GEMINI_API_KEY is missing.")
-else:
-    genai.configure(api_key=api_key)
+# Gemini SDK pehli AI call par load hota hai (services/ai_provider.py), import par nahi
 
-model = genai.GenerativeModel('gemini-2.0-flash')
+def _generate(prompt):
+    """All AI calls go through the limiter/breaker with a per-call deadline. Returns the reply text."""
+    return ai_guard.call(get_provider().generate, prompt, timeout=Config.AI_CALL_TIMEOUT_SECONDS)
 
-def get_chat_response(message, context="General Studies"):
-    try:
-        prompt = f"""
+STUDY_PLAN_FALLBACK = "Review your course materials and try again."
+
+# Quiz prompt badlo to version bhi badlo, taake purane cached quizzes serve na hon
+QUIZ_PROMPT_VERSION = "quiz-v1"
+
+def _chat_prompt(message):
+    return f"""
         ROLE: AI Academic Tutor.
         USER QUESTION: "{message}"
         INSTRUCTIONS: Answer strictly related to education. Be concise and encouraging.
         """
-        response = model.generate_content(prompt)
-        return response.text.strip() if response.text else "I am thinking..."
+
+def get_chat_response(message, context="General Studies"):
+    try:
+        text = _generate(_chat_prompt(message))
+        return text.strip() if text else "I am thinking..."
     except Exception as e:
         return "I am currently offline."
 
+class ChatStreamInterrupted(Exception):
+    """The model stream failed after some tokens were already sent to the client."""
+
+def stream_chat_response(message):
+    """
+    Streaming version of get_chat_response: yields text chunks as the model produces them.
+    Pehle token se pehle fail ho to fallback message yield hota hai; beech mein toote
+    to ChatStreamInterrupted (adhoora reply offline message ke saath jodna ghalat hai).
+    """
+    sent = False
+    try:
+        with ai_guard.slot():
+            for text in get_provider().stream(_chat_prompt(message), timeout=Config.AI_CALL_TIMEOUT_SECONDS):
+                sent = True
+                yield text
+    except Exception as e:
+        if sent:
+            raise ChatStreamInterrupted(str(e)) from e
+        yield "I am currently offline."
+
 def generate_quiz_json(topic, difficulty):
-    print(f"📡 Generating Quiz for: {topic}")
-    prompt = f"""
+    """Returns a cached quiz for (topic, difficulty) if available, else asks Gemini."""
+    key = make_cache_key(topic, difficulty, QUIZ_PROMPT_VERSION)
+    cached = quiz_cache.get(key)
+    if cached:
+        return cached
+
+    def generate_and_store():
+        quiz = _generate_quiz_uncached(topic, difficulty)
+        if quiz:
+            quiz_cache.put(key, quiz, topic=topic, difficulty=difficulty, prompt_version=QUIZ_PROMPT_VERSION)
+        return quiz
+
+    # Poori class ek saath same topic maange to Gemini sirf ek dafa call ho
+    return single_flight.do(f"quiz:{key}", generate_and_store)
+
+def _quiz_prompt(topic, difficulty):
+    return f"""
     Create a JSON quiz on '{topic}', Difficulty: {difficulty}. Return exactly 3 questions.
     JSON Format: [ {{"question": "...", "options": ["A", "B", "C", "D"], "answer": "A"}} ]
     Return ONLY raw JSON. Do not use Markdown.
     """
+
+def _parse_quiz(response):
+    # Clean response
+    text = re.sub(r'```json|```', '', response).strip()
+    start, end = text.find('['), text.rfind(']')
+    if start != -1 and end != -1:
+        return json.loads(text[start : end + 1])
+    return []
+
+def _generate_quiz_uncached(topic, difficulty):
+    print(f"📡 Generating Quiz for: {topic}")
     try:
-        response = model.generate_content(prompt)
-        # Clean response
-        text = re.sub(r'```json|```', '', response.text).strip()
-        start, end = text.find('['), text.rfind(']')
-        if start != -1 and end != -1:
-            return json.loads(text[start : end + 1])
-        return []
+        return _parse_quiz(_generate(_quiz_prompt(topic, difficulty)))
     except Exception:
         return []
 
 # --- NEW FUNCTION FOR RECOMMENDATIONS ---
 def generate_study_plan(weak_topics):
+    key = hashlib.sha256(str(weak_topics).strip().lower().encode('utf-8')).hexdigest()
+    return single_flight.do(f"plan:{key}", lambda: _generate_study_plan_uncached(weak_topics),
+                            shareable=lambda plan: bool(plan) and plan != STUDY_PLAN_FALLBACK)
+
+def _generate_study_plan_uncached(weak_topics):
     print(f"📡 Generating Plan for: {weak_topics}")
     prompt = f"""
     The student scored low in these topics: {weak_topics}.
@@ -51,7 +105,52 @@ def generate_study_plan(weak_topics):
     Keep it short, bulleted, and actionable.
     """
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        response = _generate(prompt)
+        return response.strip()
     except Exception:
-        return "Review your course materials and try again."
\ No newline at end of file
+        return STUDY_PLAN_FALLBACK
+
+# --- Async versions (async serving mode, asgi.py) ---
+# Model calls are awaited (no thread held while Gemini thinks); the quiz cache
+# lookups are short MongoDB reads and run on a worker thread.
+
+async def _agenerate(prompt):
+    return await ai_guard.acall(get_provider().agenerate, prompt, timeout=Config.AI_CALL_TIMEOUT_SECONDS)
+
+async def aget_chat_response(message):
+    try:
+        text = await _agenerate(_chat_prompt(message))
+        return text.strip() if text else "I am thinking..."
+    except Exception:
+        return "I am currently offline."
+
+async def astream_chat_response(message):
+    sent = False
+    try:
+        async with ai_guard.aslot():
+            async for text in get_provider().astream(_chat_prompt(message), timeout=Config.AI_CALL_TIMEOUT_SECONDS):
+                sent = True
+                yield text
+    except Exception as e:
+        if sent:
+            raise ChatStreamInterrupted(str(e)) from e
+        yield "I am currently offline."
+
+async def agenerate_quiz_json(topic, difficulty):
+    key = make_cache_key(topic, difficulty, QUIZ_PROMPT_VERSION)
+    cached = await asyncio.to_thread(quiz_cache.get, key)
+    if cached:
+        return cached
+
+    async def generate_and_store():
+        print(f"📡 Generating Quiz for: {topic}")
+        try:
+            quiz = _parse_quiz(await _agenerate(_quiz_prompt(topic, difficulty)))
+        except Exception:
+            return []
+        if quiz:
+            await asyncio.to_thread(quiz_cache.put, key, quiz, topic=topic, difficulty=difficulty,
+                                    prompt_version=QUIZ_PROMPT_VERSION)
+        return quiz
+
+    return await async_single_flight.do(f"quiz:{key}", generate_and_store)
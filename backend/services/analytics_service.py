@@ -0,0 +1,114 @@
+from utils.pagination import encode_cursor
+
+
+def _progress_summary_lookup():
+    """
+    $lookup stage that joins a student's progress and reduces it to
+    {count, total} on the server, so only two numbers per student travel back.
+    """
+    return {
+        "$lookup": {
+            "from": "progress",
+            "let": {"uid": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$user_id", "$$uid"]}}},
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "total": {"$sum": {"$ifNull": ["$score", 0]}}
+                }}
+            ],
+            "as": "perf"
+        }
+    }
+
+
+STUDENT_FILTER = {"role": "Student", "deleted": {"$ne": True}}
+
+
+def build_analytics_pipeline(limit, after_id=None):
+    """
+    Builds the page aggregation behind /api/teacher/analytics: one page of
+    students (sorted by _id) with quiz count + score total.
+
+    The cursor sits in the top-level $match, so the page is an index range on
+    _id and the $lookup only runs for `limit + 1` students (the extra one tells
+    the caller whether a next page exists).
+    """
+    match = dict(STUDENT_FILTER)
+    if after_id:
+        match["_id"] = {"$gt": after_id}
+
+    return [
+        {"$match": match},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit + 1},
+        _progress_summary_lookup(),
+        {"$project": {
+            "name": 1,
+            "email": 1,
+            "quizzes_taken": {"$ifNull": [{"$first": "$perf.count"}, 0]},
+            "total_score": {"$ifNull": [{"$first": "$perf.total"}, 0]}
+        }}
+    ]
+
+
+def class_totals(db):
+    """
+    Class-wide student count, score total and attempt count, summed from the
+    materialized 'user_stats' of live students only (deleted accounts are
+    filtered here, even while their cleanup job is still pending).
+    Students not backfilled yet count with 0 quizzes until their stats exist.
+    """
+    return next(db.users.aggregate([
+        {"$match": STUDENT_FILTER},
+        {"$lookup": {"from": "user_stats", "localField": "_id", "foreignField": "_id", "as": "stats"}},
+        {"$group": {
+            "_id": None,
+            "total_students": {"$sum": 1},
+            "total_score": {"$sum": {"$ifNull": [{"$first": "$stats.score_sum"}, 0]}},
+            "total_attempts": {"$sum": {"$ifNull": [{"$first": "$stats.count"}, 0]}}
+        }}
+    ]), {})
+
+
+def get_class_analytics(db, limit, after=None):
+    """
+    Runs the page aggregation and shapes it for the Teacher Dashboard.
+    `after` is the decoded cursor (utils.pagination.decode_cursor) of the previous page.
+    Class totals only come with the first page ("stats" is None after that):
+    they don't change between pages and cost a pass over every student.
+    """
+    after_id = after[1] if after else None
+    students = list(db.users.aggregate(build_analytics_pipeline(limit, after_id)))
+    has_more = len(students) > limit
+    students = students[:limit]
+
+    student_performance = []
+    for s in students:
+        quizzes_taken = s.get("quizzes_taken", 0)
+        avg_score = round(s.get("total_score", 0) / quizzes_taken, 1) if quizzes_taken > 0 else 0
+        student_performance.append({
+            "_id": str(s["_id"]),
+            "name": s.get("name"),
+            "email": s.get("email"),
+            "quizzes_taken": quizzes_taken,
+            "average_score": avg_score,
+            "status": "Active" if quizzes_taken > 0 else "Inactive"
+        })
+
+    stats = None
+    if after_id is None:
+        class_stats = class_totals(db)
+        total_attempts = class_stats.get("total_attempts", 0)
+        stats = {
+            "total_students": class_stats.get("total_students", 0),
+            "class_average": round(class_stats.get("total_score", 0) / total_attempts, 1) if total_attempts > 0 else 0
+        }
+
+    return {
+        "stats": stats,
+        "students": student_performance,
+        # Sirf _id par sort hai, is liye cursor mein sort value khali hai
+        "next_cursor": encode_cursor(None, students[-1]["_id"]) if has_more and students else None
+    }
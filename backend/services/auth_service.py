@@ -1,7 +1,6 @@
 from database.connection import get_db
-from utils.hash_helper import hash_password, check_password
+from utils.hash_helper import hash_password, check_password, needs_rehash, HashQueueFull
 from utils.jwt_helper import generate_token
-from utils.serializers import serialize_doc
 from datetime import datetime, timezone
 
 def register_user(data):
@@ -49,10 +48,20 @@ def login_user(data):
     db = get_db()
     
     # 2. Find User
-    user = db.users.find_one({"email": data['email']})
+    user = db.users.find_one({"email": data['email'], "deleted": {"$ne": True}})
     
     # 3. Verify Password
     if user and check_password(data['password'], user['password']):
+        # Cost factor badla hai to password naye cost se dobara hash karo (transparent)
+        if needs_rehash(user['password']):
+            try:
+                db.users.update_one(
+                    {"_id": user['_id']},
+                    {"$set": {"password": hash_password(data['password'])}}
+                )
+            except HashQueueFull:
+                pass  # Pool busy: agli login par rehash ho jayega
+
         # Generate Secure Token
         token = generate_token(user['_id'], user['role'])
         
@@ -61,7 +70,7 @@ def login_user(data):
         
         return {
             "token": token,
-            "user": serialize_doc(user),
+            "user": user,
             "message": "Login successful"
         }, 200
     
@@ -0,0 +1,105 @@
+"""
+In-process read-through cache for catalog reads (modules, teacher quizzes).
+
+Entries are tagged with the version counter of their data set from
+'collection_versions' (the same counters that drive the HTTP ETags in
+utils/http_cache.py). Each worker polls those counters at most once every
+`poll_interval` seconds, so a write in any worker invalidates every worker's
+cache within that interval; the writing worker drops its own entries at once.
+
+Bounded by `maxsize` entries and `ttl` seconds (cachetools.TTLCache).
+
+Loaders read through read_db(name): a secondary (get_analytics_db) once the
+data set's last write is older than `settle_seconds` (the max staleness of that
+read preference plus one heartbeat interval, since the driver's staleness
+estimate can be that far behind), the primary right after a write, so a fresh
+version is never cached with pre-write data from a lagging secondary.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+from cachetools import TTLCache
+from pymongo.common import HEARTBEAT_FREQUENCY
+
+from config import Config
+from database.connection import get_db, get_analytics_db
+from utils.http_cache import bump_version
+
+
+class CatalogCache:
+    def __init__(self, names=("modules", "quizzes"), maxsize=512, ttl=300, poll_interval=1.0, settle_seconds=90):
+        self.names = tuple(names)
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = {}
+        self._updated_at = {}
+        self._polled_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _current_versions(self):
+        """Version counters, refreshed from MongoDB at most every poll_interval seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._polled_at < self.poll_interval:
+                return self._versions
+        docs = list(get_db().collection_versions.find({"_id": {"$in": list(self.names)}}, {"version": 1, "updated_at": 1}))
+        versions = {d["_id"]: d.get("version", 0) for d in docs}
+        with self._lock:
+            self._versions = versions
+            self._updated_at = {d["_id"]: d.get("updated_at") for d in docs}
+            self._polled_at = now
+        return versions
+
+    def read_db(self, name):
+        """Database for loading `name`: secondary once its last write has settled, else primary."""
+        self._current_versions()
+        with self._lock:
+            updated_at = self._updated_at.get(name)
+        if updated_at is not None:
+            # PyMongo naive UTC datetimes deta hai
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if (datetime.now(timezone.utc) - updated_at).total_seconds() < self.settle_seconds:
+                return get_db()
+        return get_analytics_db()
+
+    def get_or_load(self, name, params, loader):
+        """Returns the cached value for (name, params) if still current, else loader()."""
+        version = self._current_versions().get(name, 0)
+        key = (name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (version, value)
+        return value
+
+    def invalidate(self, name, db=None):
+        """Called after a write: drops local entries and bumps the shared version."""
+        bump_version(db if db is not None else get_db(), name)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == name]:
+                self._entries.pop(key, None)
+            self._polled_at = 0.0  # next read re-polls versions
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "versions": dict(self._versions)}
+
+
+catalog_cache = CatalogCache(
+    maxsize=Config.CATALOG_CACHE_SIZE,
+    ttl=Config.CATALOG_CACHE_TTL_SECONDS,
+    poll_interval=Config.CATALOG_VERSION_POLL_SECONDS,
+    # Driver staleness estimate heartbeatFrequencyMS (default 10s) tak purana ho sakta hai
+    settle_seconds=Config.MONGO_MAX_STALENESS_SECONDS + HEARTBEAT_FREQUENCY
+)
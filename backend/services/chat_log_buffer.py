@@ -0,0 +1,232 @@
+"""
+Write-behind buffer for 'chat_logs'.
+
+/api/ai/chat used to do one synchronous insert_one per message. Entries are now
+appended to an in-memory buffer and a background thread writes them with one
+insert_many when either `batch_size` entries are waiting or `flush_interval`
+seconds have passed. The buffer is flushed on shutdown (atexit).
+
+If MongoDB is briefly unavailable, the batch is appended to a local JSON-lines
+spill file and replayed on the next successful flush, so logs aren't lost.
+Each process spills to its own file (`<spill_path>.<pid>`), so workers sharing
+a spill_path never replay or delete each other's entries; files left behind by
+dead processes are adopted on start(). Without a spill file (or if writing it
+fails) the batch goes back into the buffer up to max_buffer, and whatever
+doesn't fit is counted in stats["dropped"].
+"""
+import atexit
+import glob
+import os
+import threading
+import time
+
+from bson import json_util
+from pymongo.errors import BulkWriteError
+
+from config import Config
+from database.connection import get_db
+from utils.metrics import registry
+
+
+def _insert_idempotent(collection, docs):
+    """
+    insert_many that tolerates duplicates: retried/replayed entries keep the _id
+    assigned on the first attempt, so rows that already made it are skipped.
+    """
+    try:
+        collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
+
+
+class ChatLogBuffer:
+    def __init__(self, collection="chat_logs", batch_size=100, flush_interval=2.0,
+                 max_buffer=10000, spill_path=None):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.spill_path = spill_path
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stop = False
+        self._app = None
+        self._stats = {"queued": 0, "written": 0, "flushes": 0, "spilled": 0, "replayed": 0, "dropped": 0}
+
+    def start(self, app):
+        if self._thread is not None:
+            return
+        self._app = app
+        self._adopt_orphan_spills()
+        self._thread = threading.Thread(target=self._run, name="chat-log-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        # Jo bacha hai woh bhi likh do
+        if self._app is not None:
+            with self._app.app_context():
+                self.flush()
+
+    def add(self, entry):
+        """Queues one chat log entry. Falls back to a direct insert if the flusher isn't running."""
+        if self._thread is None:
+            get_db()[self.collection].insert_one(entry)
+            return
+        with self._cond:
+            if len(self._buffer) >= self.max_buffer:
+                self._stats["dropped"] += 1
+                return
+            self._buffer.append(entry)
+            self._stats["queued"] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def depth(self):
+        with self._cond:
+            return len(self._buffer)
+
+    def stats(self):
+        with self._cond:
+            return {**self._stats, "queue_depth": len(self._buffer),
+                    "spill_pending": self._has_spill()}
+
+    def _run(self):
+        with self._app.app_context():
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + self.flush_interval
+                    while not self._stop and len(self._buffer) < self.batch_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    if self._stop:
+                        return
+                self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+            if not batch and not self._has_spill():
+                return
+
+            try:
+                collection = get_db()[self.collection]
+                self._replay_spill(collection)
+                if batch:
+                    _insert_idempotent(collection, batch)
+                with self._cond:
+                    self._stats["written"] += len(batch)
+                    self._stats["flushes"] += 1
+            except Exception as e:
+                print(f"❌ Chat Log Flush Error: {e}")
+                self._spill_or_requeue(batch)
+
+    # --- Spill file (MongoDB briefly down) ---
+
+    def _own_spill(self):
+        # pid har dafa parho: gunicorn fork ke baad har worker ki apni file
+        return f"{self.spill_path}.{os.getpid()}"
+
+    def _has_spill(self):
+        own = self._own_spill() if self.spill_path else None
+        return bool(own) and (os.path.exists(own) or os.path.exists(own + ".replay"))
+
+    def _spill_or_requeue(self, batch):
+        if self.spill_path:
+            try:
+                with open(self._own_spill(), "a", encoding="utf-8") as f:
+                    for entry in batch:
+                        f.write(json_util.dumps(entry) + "\n")
+                with self._cond:
+                    self._stats["spilled"] += len(batch)
+                return
+            except OSError as e:
+                print(f"❌ Chat Log Spill Error: {e}")
+        # Spill file nahi (ya likh nahi saki): wapas buffer mein (max_buffer tak), baqi drop
+        with self._cond:
+            room = max(0, self.max_buffer - len(self._buffer))
+            self._buffer[:0] = batch[:room]
+            self._stats["dropped"] += len(batch) - len(batch[:room])
+
+    def _adopt_orphan_spills(self):
+        """Moves spill files of dead processes (and the old shared file) into this process's own spill file."""
+        if not self.spill_path:
+            return
+        own = self._own_spill()
+        candidates = [self.spill_path, self.spill_path + ".replay"] + glob.glob(glob.escape(self.spill_path) + ".*")
+        for path in dict.fromkeys(candidates):
+            if path in (own, own + ".replay") or not os.path.isfile(path) or not _orphaned(self.spill_path, path):
+                continue
+            try:
+                with open(path, encoding="utf-8") as src, open(own, "a", encoding="utf-8") as dst:
+                    dst.writelines(line for line in src if line.strip())
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # kisi aur naye worker ne pehle utha li
+            except OSError as e:
+                print(f"⚠️ Chat Log Spill Adopt Error ({path}): {e}")
+
+    def _replay_spill(self, collection):
+        if not self._has_spill():
+            return
+        own = self._own_spill()
+        replay_path = own + ".replay"
+        # Pichla replay adhoora reh gaya ho to pehle woh; warna spill file ko replay ke liye utha lo
+        if not os.path.exists(replay_path):
+            os.replace(own, replay_path)
+        with open(replay_path, encoding="utf-8") as f:
+            entries = [json_util.loads(line) for line in f if line.strip()]
+        if entries:
+            _insert_idempotent(collection, entries)
+        os.remove(replay_path)
+        with self._cond:
+            self._stats["replayed"] += len(entries)
+
+
+def _orphaned(spill_path, path):
+    """True for the legacy shared spill file and for <spill_path>.<pid>[.replay] of a process that is gone."""
+    suffix = path[len(spill_path):]
+    if suffix in ("", ".replay"):
+        return True
+    pid = suffix[1:].split(".", 1)[0]
+    if not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # PermissionError: process zinda hai (kisi aur user ka)
+    return False
+
+
+chat_log_buffer = ChatLogBuffer(
+    batch_size=Config.CHAT_LOG_BATCH_SIZE,
+    flush_interval=Config.CHAT_LOG_FLUSH_SECONDS,
+    max_buffer=Config.CHAT_LOG_MAX_BUFFER,
+    spill_path=Config.CHAT_LOG_SPILL_PATH
+)
+
+registry.gauge("chat_log_buffer_queue_depth", "Chat logs waiting to be written.", chat_log_buffer.depth)
+registry.gauge("chat_log_buffer_spill_pending", "1 while this process has spilled chat logs to replay.",
+               lambda: int(chat_log_buffer.stats()["spill_pending"]))
+registry.gauge("chat_log_buffer_entries", "Chat log entries by outcome since the process started.",
+               lambda: {(outcome,): chat_log_buffer.stats()[outcome]
+                        for outcome in ("queued", "written", "spilled", "replayed", "dropped")},
+               labels=("outcome",))
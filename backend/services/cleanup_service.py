@@ -0,0 +1,96 @@
+"""
+Background cleanup of user-owned data (runs on services/job_queue.py).
+
+- 'cascade_delete_user': after an admin marks a user deleted, removes their
+  progress, chat logs, enrollments, stats, weakness index and study plan in bounded batches, then the user
+  document itself. Matches both ObjectId and string forms of the user id.
+- 'sweep_orphans': finds data whose user no longer exists (or is marked
+  deleted), e.g. left behind by older deletions, and purges it.
+
+Both jobs report progress on the job document and are safe to re-run: every
+batch is an idempotent delete, so a job reclaimed after a crash just continues.
+"""
+from bson import ObjectId
+
+from database.connection import get_db
+from services.job_queue import job_queue
+
+BATCH_SIZE = 1000
+
+# (collection, field holding the user id)
+USER_OWNED = [
+    ("progress", "user_id"),
+    ("chat_logs", "user_id"),
+    ("enrollments", "user_id"),
+    ("user_stats", "_id"),
+    ("weakness_index", "_id"),
+    ("study_plans", "_id"),
+]
+
+
+def user_id_forms(user_id):
+    """Both representations a user id may be stored as."""
+    forms = [str(user_id)]
+    if ObjectId.is_valid(str(user_id)):
+        forms.append(ObjectId(str(user_id)))
+    return forms
+
+
+def delete_in_batches(collection, query, on_batch=None, batch_size=BATCH_SIZE):
+    """Deletes matching documents batch_size at a time. Returns the number deleted."""
+    total = 0
+    while True:
+        ids = [d["_id"] for d in collection.find(query, {"_id": 1}).limit(batch_size)]
+        if not ids:
+            return total
+        total += collection.delete_many({"_id": {"$in": ids}}).deleted_count
+        if on_batch:
+            on_batch(total)
+
+
+@job_queue.register("cascade_delete_user")
+def cascade_delete_user(job):
+    db = get_db()
+    forms = user_id_forms(job["payload"]["user_id"])
+    progress = dict(job.get("progress") or {})  # resume: pehle se deleted counts
+
+    for name, field in USER_OWNED:
+        already = progress.get(name, 0)
+
+        def report(count, name=name, already=already):
+            progress[name] = already + count
+            job_queue.set_progress(job["_id"], progress)
+
+        report(delete_in_batches(db[name], {field: {"$in": forms}}, report))
+
+    # Sab data saaf: ab user document hatao (sirf agar abhi bhi deleted marked hai)
+    progress["user"] = db.users.delete_one({"_id": {"$in": forms}, "deleted": True}).deleted_count
+    job_queue.set_progress(job["_id"], progress)
+    return progress
+
+
+def _live_user_ids(db, ids):
+    oids = [ObjectId(str(i)) for i in ids if ObjectId.is_valid(str(i))]
+    return {d["_id"] for d in db.users.find({"_id": {"$in": oids}, "deleted": {"$ne": True}}, {"_id": 1})}
+
+
+@job_queue.register("sweep_orphans")
+def sweep_orphans(job):
+    db = get_db()
+    progress = dict(job.get("progress") or {})
+
+    for name, field in USER_OWNED:
+        owners = [d["_id"] for d in db[name].aggregate([{"$group": {"_id": f"${field}"}}], allowDiskUse=True)]
+        deleted = progress.get(name, 0)
+
+        for start in range(0, len(owners), BATCH_SIZE):
+            chunk = owners[start:start + BATCH_SIZE]
+            alive = _live_user_ids(db, chunk)
+            orphans = [o for o in chunk
+                       if not (ObjectId.is_valid(str(o)) and ObjectId(str(o)) in alive)]
+            if orphans:
+                deleted += delete_in_batches(db[name], {field: {"$in": orphans}})
+            progress[name] = deleted
+            job_queue.set_progress(job["_id"], progress)
+
+    return progress
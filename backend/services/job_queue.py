@@ -0,0 +1,233 @@
+"""
+MongoDB-backed background job queue.
+
+Jobs live in the 'jobs' collection so every worker process can claim them and
+their status survives restarts. Each process runs a small pool of threads
+(Config.JOB_WORKERS) that claim one job at a time with find_one_and_update.
+
+Job lifecycle: queued -> running -> done | failed
+A handler raising RetryableJobError is re-queued with exponential backoff until
+max_attempts. A job whose worker died is picked up again once its lock expires,
+until it has used up max_attempts; after that it is marked failed.
+
+Workers can also run as their own process, so the web server can run with
+JOB_WORKERS=0 and job threads don't compete with request threads
+(run from the backend folder):
+    python -m services.job_queue --workers 4
+"""
+import argparse
+import atexit
+import os
+import signal
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from database.connection import get_db
+
+
+class RetryableJobError(Exception):
+    """Raise from a handler to retry the job later (e.g. AI returned malformed JSON)."""
+
+
+class JobQueue:
+    def __init__(self, collection="jobs", lock_seconds=300, poll_interval=1.0):
+        self.collection = collection
+        self.lock_seconds = lock_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers = {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._app = None
+
+    def register(self, job_type):
+        """Decorator: @job_queue.register("generate_quiz") def handler(job): ..."""
+        def decorator(fn):
+            self._handlers[job_type] = fn
+            return fn
+        return decorator
+
+    # --- Producer side ---
+
+    def enqueue(self, job_type, payload, batch_id=None, max_attempts=3):
+        now = datetime.now(timezone.utc)
+        job = {
+            "type": job_type,
+            "payload": payload,
+            "batch_id": batch_id,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "result": None,
+            "error": None,
+            "progress": None,
+            "run_after": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        job_id = get_db()[self.collection].insert_one(job).inserted_id
+        self._wakeup.set()
+        return str(job_id)
+
+    def get(self, job_id):
+        if not ObjectId.is_valid(job_id):
+            return None
+        return get_db()[self.collection].find_one({"_id": ObjectId(job_id)})
+
+    def set_progress(self, job_id, progress):
+        """Handlers call this to report progress (and extend their lock)."""
+        now = datetime.now(timezone.utc)
+        get_db()[self.collection].update_one(
+            {"_id": job_id},
+            {"$set": {"progress": progress, "updated_at": now,
+                      "locked_until": now + timedelta(seconds=self.lock_seconds)}}
+        )
+
+    # --- Worker side ---
+
+    def start(self, app, workers):
+        """Starts `workers` daemon threads for this process (no-op if already running)."""
+        if self._threads or workers <= 0:
+            return
+        self._app = app
+        for i in range(workers):
+            t = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        atexit.register(self.stop)
+        print(f"✅ Job Queue: {workers} worker thread(s) started")
+
+    def serve(self, app, workers):
+        """Runs the workers in the foreground until SIGINT/SIGTERM (standalone worker process)."""
+        signal.signal(signal.SIGTERM, lambda *_: self._stop.set())
+        self.start(app, workers)
+        if not self._threads:
+            print("⚠️ Job Queue: no workers to run")
+            return
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        self.stop()
+        print("✅ Job Queue: workers stopped")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def _claim(self, jobs):
+        now = datetime.now(timezone.utc)
+        return jobs.find_one_and_update(
+            {"type": {"$in": list(self._handlers)},
+             "$or": [
+                 {"status": "queued", "run_after": {"$lte": now}},
+                 # worker died mid-job: dobara chalao, lekin max_attempts tak
+                 {"status": "running", "locked_until": {"$lt": now},
+                  "$expr": {"$lt": ["$attempts", {"$ifNull": ["$max_attempts", 1]}]}}
+             ]},
+            {"$set": {"status": "running", "worker": f"{self.worker_id}:{uuid.uuid4().hex[:6]}",
+                      "locked_until": now + timedelta(seconds=self.lock_seconds), "updated_at": now},
+             "$inc": {"attempts": 1}},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _fail_exhausted(self, jobs):
+        """Jobs whose worker kept dying (lock expired, no attempts left) are marked failed."""
+        now = datetime.now(timezone.utc)
+        jobs.update_many(
+            {"type": {"$in": list(self._handlers)}, "status": "running", "locked_until": {"$lt": now},
+             "$expr": {"$gte": ["$attempts", {"$ifNull": ["$max_attempts", 1]}]}},
+            {"$set": {"status": "failed", "error": "Worker stopped before the job finished", "updated_at": now}}
+        )
+
+    def _run(self):
+        with self._app.app_context():
+            while not self._stop.is_set():
+                try:
+                    jobs = get_db()[self.collection]
+                    job = self._claim(jobs)
+                    if job is None:
+                        self._fail_exhausted(jobs)
+                except Exception as e:
+                    print(f"❌ Job Claim Error: {e}")
+                    job = None
+
+                if job is None:
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+                try:
+                    self._execute(job)
+                except Exception as e:
+                    # Status update fail hua (failover etc.): thread zinda rahe, lock expire hone par job dobara uthegi
+                    print(f"❌ Job Status Update Error ({job.get('type')} {job['_id']}): {e}")
+
+    def _execute(self, job):
+        jobs = get_db()[self.collection]
+        now = datetime.now(timezone.utc)
+        try:
+            result = self._handlers[job["type"]](job)
+            jobs.update_one({"_id": job["_id"]},
+                            {"$set": {"status": "done", "result": result, "error": None, "updated_at": now}})
+        except Exception as e:
+            retry = isinstance(e, RetryableJobError) and job["attempts"] < job.get("max_attempts", 1)
+            if not isinstance(e, RetryableJobError):
+                traceback.print_exc()
+            update = {"error": str(e), "updated_at": now}
+            if retry:
+                update.update(status="queued", run_after=now + timedelta(seconds=2 ** job["attempts"]))
+            else:
+                update.update(status="failed")
+            jobs.update_one({"_id": job["_id"]}, {"$set": update})
+
+
+def serialize_job(job):
+    """JSON-friendly view of a job for the status endpoints."""
+    return {
+        "job_id": str(job["_id"]),
+        "type": job.get("type"),
+        "batch_id": job.get("batch_id"),
+        "status": job.get("status"),
+        "attempts": job.get("attempts", 0),
+        "progress": job.get("progress"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at")
+    }
+
+
+job_queue = JobQueue()
+
+
+def main():
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Run background job workers without the web server.")
+    parser.add_argument("--workers", type=int, default=max(Config.JOB_WORKERS, 1),
+                        help="worker threads in this process")
+    args = parser.parse_args()
+
+    # `python -m` is module ko __main__ bana deta hai: handlers wale asal services.job_queue ko import karo
+    from app import create_app
+    from services.job_queue import job_queue as queue
+
+    app = create_app(start_background=False)
+    print(f"🚀 Job Worker (pid {os.getpid()}) starting {args.workers} thread(s)")
+    queue.serve(app, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Bulk progress ingestion (POST /api/progress/bulk).
+
+Classroom tablets that sync after an offline exam send all their scores in one
+request instead of one /update call each:
+
+    {"records": [{"module_id", "topic", "score", "status"}, ...]}
+
+- Every record is validated on its own; invalid ones are reported and skipped.
+- A module appearing twice keeps the last record (the earlier one is reported
+  as "superseded"), so the unordered write below can't race with itself.
+  Superseded records were still real attempts and go into the weakness index.
+- All progress upserts go out as one unordered bulk_write of pipeline updates.
+  Each one copies the score it replaces into `bulk_prev` (tagged with this
+  batch's id) in the same atomic write, so a concurrent /update can't make the
+  old scores we subtract from user_stats stale. The tags are read back and
+  removed right after; a row whose tag is gone (another batch overwrote it)
+  triggers a user_stats rebuild instead.
+- user_stats and the weakness index are then updated once for the whole batch
+  (record_scores / record_attempts) and the study plan refresh is checked once.
+
+Each input record gets a result in the same position:
+    {"index", "status": "inserted" | "updated" | "invalid" | "superseded" | "error", "error"?}
+"""
+import math
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services.study_plan_cache import refresh_if_changed
+from services.user_stats import rebuild_user, record_scores
+from services.weakness_index import record_attempts
+
+
+def parse_record(data):
+    """Validates one progress record. Returns (record, None) or (None, error message)."""
+    if not isinstance(data, dict):
+        return None, "Record must be an object"
+
+    identifier = data.get('module_id') or data.get('topic')
+    if not identifier:
+        return None, "Module ID or Topic is required"
+
+    score = data.get('score', 0)
+    if not isinstance(score, (int, float)) or isinstance(score, bool):
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            return None, "Score must be a number between 0 and 100"
+    # NaN/inf stats ke score_sum ko hamesha ke liye kharab kar dete
+    if not math.isfinite(score) or not 0 <= score <= 100:
+        return None, "Score must be a number between 0 and 100"
+
+    return {
+        "module_id": identifier,
+        "topic": data.get('topic') or "Unknown Topic",
+        "status": data.get('status', 'Completed'),
+        "score": score,
+    }, None
+
+
+def plan_batch(raw_records):
+    """
+    Validates and de-duplicates a batch.
+    Returns (results, writes, superseded): results has one slot per input record
+    (None for records still to be written), writes is [(input index, record), ...]
+    with the last record per module, superseded the earlier ones, same shape.
+    """
+    results = [None] * len(raw_records)
+    latest, superseded = {}, []
+    for index, data in enumerate(raw_records):
+        record, error = parse_record(data)
+        if error:
+            results[index] = {"index": index, "status": "invalid", "error": error}
+            continue
+        earlier = latest.get(record["module_id"])
+        if earlier is not None:
+            results[earlier[0]] = {"index": earlier[0], "status": "superseded"}
+            superseded.append(earlier)
+        latest[record["module_id"]] = (index, record)
+
+    writes = sorted(latest.values(), key=lambda w: w[0])
+    return results, writes, superseded
+
+
+def new_batch_id():
+    return str(ObjectId())
+
+
+def progress_ops(user_id, writes, now, batch_id):
+    """Upserts that also keep the replaced score in bulk_prev ({batch, score}), atomically per row."""
+    return [
+        UpdateOne(
+            {"user_id": user_id, "module_id": record["module_id"]},
+            [{"$set": {
+                # Pehle purana score save karo, phir naya likho (same stage: "$score" abhi purana hai)
+                "bulk_prev": {"batch": batch_id, "score": {"$ifNull": ["$score", None]}},
+                "topic": {"$literal": record["topic"]},
+                "status": {"$literal": record["status"]},
+                "score": {"$literal": record["score"]},
+                "last_updated": now
+            }}],
+            upsert=True
+        )
+        for _, record in writes
+    ]
+
+
+def captured_query(user_id, batch_id):
+    """Rows still carrying this batch's bulk_prev tag."""
+    return {"user_id": user_id, "bulk_prev.batch": batch_id}
+
+
+CAPTURED_PROJECTION = {"module_id": 1, "bulk_prev.score": 1}
+CLEAR_CAPTURE = {"$unset": {"bulk_prev": ""}}
+
+
+def previous_scores(rows):
+    """module_id -> replaced score, from the rows matched by captured_query."""
+    return {d["module_id"]: (d.get("bulk_prev") or {}).get("score") or 0 for d in rows}
+
+
+def write_outcome(result=None, error=None):
+    """(upserted op indexes, {op index: error message}) from a BulkWriteResult or BulkWriteError."""
+    if error is not None:
+        details = error.details or {}
+        upserted = {u["index"] for u in details.get("upserted", [])}
+        failed = {e["index"]: e.get("errmsg", "Write failed") for e in details.get("writeErrors", [])}
+        return upserted, failed
+    return set(result.upserted_ids or {}), {}
+
+
+def finish_batch(results, writes, superseded, previous, upserted, failed):
+    """
+    Fills in the write results. Returns (score changes, attempts, needs_rebuild)
+    for the writes that landed; attempts include superseded records, in input order.
+    `previous` maps module_id -> the score each replacing write overwrote.
+    """
+    changes, landed, needs_rebuild = [], {}, False
+    for op_index, (index, record) in enumerate(writes):
+        if op_index in failed:
+            results[index] = {"index": index, "status": "error", "error": failed[op_index]}
+            continue
+
+        replaced = op_index not in upserted
+        results[index] = {"index": index, "status": "updated" if replaced else "inserted"}
+        if replaced and record["module_id"] not in previous:
+            # Kisi aur batch ne row dobara likh di, humara bulk_prev gaya: old score unknown
+            needs_rebuild = True
+        changes.append((record["score"], previous.get(record["module_id"]), replaced))
+        landed[record["module_id"]] = (index, record)
+
+    # Superseded records bhi asli attempts the (module ka aakhri write land hua ho to)
+    attempts = sorted(list(landed.values()) + [s for s in superseded if s[1]["module_id"] in landed],
+                      key=lambda a: a[0])
+    return changes, [(record["topic"], record["score"]) for _, record in attempts], needs_rebuild
+
+
+def summarize(results):
+    summary = {}
+    for r in results:
+        summary[r["status"]] = summary.get(r["status"], 0) + 1
+    return summary
+
+
+def apply_batch(db, user_id, raw_records, now):
+    """Validates and writes a batch for one user. Returns the per-record results."""
+    results, writes, superseded = plan_batch(raw_records)
+    if not writes:
+        return results
+
+    batch_id = new_batch_id()
+    try:
+        upserted, failed = write_outcome(db.progress.bulk_write(progress_ops(user_id, writes, now, batch_id),
+                                                                ordered=False))
+    except BulkWriteError as e:
+        upserted, failed = write_outcome(error=e)
+    previous = previous_scores(db.progress.find(captured_query(user_id, batch_id), CAPTURED_PROJECTION))
+    db.progress.update_many(captured_query(user_id, batch_id), CLEAR_CAPTURE)
+
+    changes, attempts, needs_rebuild = finish_batch(results, writes, superseded, previous, upserted, failed)
+    if changes:
+        apply_materialized(db, user_id, changes, attempts, needs_rebuild, now)
+    return results
+
+
+def apply_materialized(db, user_id, changes, attempts, needs_rebuild, now):
+    """user_stats, weakness index and study plan for a written batch (the async route runs it in a thread)."""
+    if needs_rebuild:
+        rebuild_user(db, user_id)
+    else:
+        record_scores(db, user_id, changes, when=now)
+    record_attempts(db, user_id, attempts, when=now)
+    # Weak topics badle to study plan background mein dobara banega
+    refresh_if_changed(db, user_id)
@@ -0,0 +1,175 @@
+"""
+Two-tier response cache for AI generated quizzes.
+
+Key  = sha256(normalized topic | difficulty | prompt version)
+Tier 1: in-process LRU + TTL (cachetools.TTLCache), per worker.
+Tier 2: MongoDB 'ai_cache' collection, shared by all workers and survives restarts.
+
+Each key keeps up to `variants` different quizzes so students asking for the
+same topic don't all get identical questions. Until a key has that many
+variants a lookup counts as a miss and the caller generates (and stores) a new one.
+
+The cache fails open: if MongoDB errors, get() is a miss and put() only fills
+the memory tier, so /ai/generate-quiz still works (straight Gemini call).
+Memory hits refresh the Mongo tier's `last_used` at most every
+`touch_interval` seconds, so its LRU eviction doesn't drop the hottest keys.
+"""
+import hashlib
+import random
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+from cachetools import TTLCache
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from config import Config
+from database.connection import get_db
+
+# get_db() raises ConnectionError when MongoDB was never connected
+DB_ERRORS = (PyMongoError, ConnectionError)
+
+
+def normalize_topic(topic):
+    """'  Python   BASICS ' -> 'python basics'"""
+    return re.sub(r"\s+", " ", str(topic or "")).strip().lower()
+
+
+def make_cache_key(topic, difficulty, prompt_version):
+    raw = f"{normalize_topic(topic)}|{normalize_topic(difficulty)}|{prompt_version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class QuizCache:
+    def __init__(self, collection="ai_cache", variants=3, ttl_seconds=86400,
+                 memory_size=256, max_entries=10000, touch_interval=60):
+        self.collection = collection
+        self.variants = variants
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self._memory = TTLCache(maxsize=memory_size, ttl=ttl_seconds)
+        self._touched = TTLCache(maxsize=memory_size, ttl=touch_interval)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "db_errors": 0}
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else 0
+        return stats
+
+    def get(self, key):
+        """Returns a cached quiz for `key`, or None (miss) if the key still needs more variants."""
+        with self._lock:
+            variants = self._memory.get(key)
+        if variants and len(variants) >= self.variants:
+            self._count("memory_hits")
+            self._touch(key)
+            return random.choice(variants)
+
+        now = datetime.now(timezone.utc)
+        try:
+            doc = get_db()[self.collection].find_one_and_update(
+                {"_id": key, "expires_at": {"$gt": now}},
+                {"$set": {"last_used": now}},
+                projection={"variants": 1}
+            )
+        except DB_ERRORS as e:
+            # Cache na mile to bhi quiz ban jaye: miss samjho
+            print(f"⚠️ Quiz Cache Read Error: {e}")
+            self._count("db_errors")
+            self._count("misses")
+            return None
+        with self._lock:
+            self._touched[key] = True
+        variants = [v["questions"] for v in (doc or {}).get("variants", [])]
+        if variants:
+            with self._lock:
+                self._memory[key] = variants
+        if len(variants) >= self.variants:
+            self._count("db_hits")
+            return random.choice(variants)
+
+        self._count("misses")
+        return None
+
+    def put(self, key, questions, **meta):
+        """Adds a freshly generated quiz as a new variant (oldest variant drops out)."""
+        if not questions:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            db = get_db()
+            doc = db[self.collection].find_one_and_update(
+                {"_id": key},
+                {
+                    "$push": {"variants": {"$each": [{"questions": questions, "created_at": now}],
+                                           "$slice": -self.variants}},
+                    "$set": {**meta, "last_used": now, "expires_at": now + self.ttl},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True,
+                projection={"variants": 1},
+                return_document=ReturnDocument.AFTER
+            )
+        except DB_ERRORS as e:
+            # MongoDB down: sirf is worker ki memory mein rakho
+            print(f"⚠️ Quiz Cache Write Error: {e}")
+            self._count("db_errors")
+            with self._lock:
+                self._memory[key] = ((self._memory.get(key) or []) + [questions])[-self.variants:]
+            return
+        with self._lock:
+            self._memory[key] = [v["questions"] for v in doc.get("variants", [])]
+            self._touched[key] = True
+        self._count("stores")
+        try:
+            self._evict_lru(db)
+        except DB_ERRORS as e:
+            print(f"⚠️ Quiz Cache Eviction Error: {e}")
+            self._count("db_errors")
+
+    def _touch(self, key):
+        """Bumps last_used in MongoDB for a memory hit, at most once per touch_interval per key."""
+        with self._lock:
+            if key in self._touched:
+                return
+            self._touched[key] = True
+        try:
+            get_db()[self.collection].update_one({"_id": key}, {"$set": {"last_used": datetime.now(timezone.utc)}})
+        except DB_ERRORS as e:
+            print(f"⚠️ Quiz Cache Touch Error: {e}")
+            self._count("db_errors")
+
+    def _evict_lru(self, db):
+        """Keeps the Mongo tier under max_entries by dropping least recently used keys."""
+        excess = db[self.collection].estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+        stale = [d["_id"] for d in db[self.collection].find({}, {"_id": 1}).sort("last_used", 1).limit(excess)]
+        if stale:
+            db[self.collection].delete_many({"_id": {"$in": stale}})
+            with self._lock:
+                for key in stale:
+                    self._memory.pop(key, None)
+            self._count("evictions", len(stale))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        get_db()[self.collection].delete_many({})
+
+
+quiz_cache = QuizCache(
+    variants=Config.QUIZ_CACHE_VARIANTS,
+    ttl_seconds=Config.QUIZ_CACHE_TTL_SECONDS,
+    memory_size=Config.QUIZ_CACHE_MEMORY_SIZE,
+    max_entries=Config.QUIZ_CACHE_MAX_ENTRIES
+)
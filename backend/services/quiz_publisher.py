@@ -0,0 +1,52 @@
+"""
+Background publishing of teacher quizzes.
+
+POST /api/teacher/create-quiz enqueues one 'generate_quiz' job per topic; the
+job workers (services/job_queue.py) generate the questions in parallel and
+insert the finished quiz into db.quizzes.
+"""
+import uuid
+from datetime import datetime, timezone
+
+from database.connection import get_db
+from services.ai_service import generate_quiz_json
+from services.job_queue import job_queue, RetryableJobError
+from services.catalog_cache import catalog_cache
+
+MAX_TOPICS_PER_BATCH = 20
+
+
+def enqueue_quiz_batch(topics, teacher_id, difficulty='Medium'):
+    """Queues one generation job per topic. Returns (batch_id, job_ids)."""
+    batch_id = uuid.uuid4().hex
+    job_ids = [
+        job_queue.enqueue(
+            "generate_quiz",
+            {"topic": topic, "difficulty": difficulty, "teacher_id": teacher_id},
+            batch_id=batch_id
+        )
+        for topic in topics
+    ]
+    return batch_id, job_ids
+
+
+@job_queue.register("generate_quiz")
+def publish_quiz_job(job):
+    payload = job["payload"]
+    questions = generate_quiz_json(payload["topic"], payload["difficulty"])
+    if not questions:
+        # Gemini ne ghalat/khali JSON diya: job dobara try hogi (backoff ke saath)
+        raise RetryableJobError("AI returned empty or malformed quiz JSON")
+
+    new_quiz = {
+        "topic": payload["topic"],
+        "difficulty": payload["difficulty"],
+        "questions": questions,
+        "created_by": "Teacher",
+        "teacher_id": payload["teacher_id"],
+        "created_at": datetime.now(timezone.utc)
+    }
+    db = get_db()
+    quiz_id = db.quizzes.insert_one(new_quiz).inserted_id
+    catalog_cache.invalidate("quizzes", db)
+    return {"quiz_id": str(quiz_id), "topic": payload["topic"], "questions": questions}
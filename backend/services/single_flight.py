@@ -0,0 +1,190 @@
+"""
+Single-flight deduplication for expensive AI calls.
+
+When a whole class asks for the same quiz / plan at once, only one upstream
+Gemini call runs and every concurrent caller gets its result.
+
+- Inside a worker: callers with the same key wait on a threading.Event.
+- Across workers: the leader holds a lease document in MongoDB ('ai_leases').
+  Other workers poll that document until the leader writes the result, or take
+  over if the lease expires (leader crashed / timed out). Only results that
+  pass `shareable` (default: truthy) are published; after a failed or empty
+  result the lease is dropped so the next worker tries Gemini itself.
+  If MongoDB errors, the call falls back to the in-worker flight only.
+- Async serving mode (asgi.py): AsyncSingleFlight shares one asyncio task per
+  key inside the event loop. It does not take the cross-worker lease.
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from config import Config
+from database.connection import get_db
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, collection="ai_leases", lease_seconds=60, result_seconds=10, poll_interval=0.25):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.result_seconds = result_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "local_waits": 0, "remote_waits": 0, "lease_errors": 0}
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+    def do(self, key, fn, shareable=bool):
+        """
+        Runs fn() once per key across all concurrent callers and returns its result.
+        `shareable(result)` decides whether other workers may reuse it (e.g. not a fallback reply).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+            else:
+                self._stats["local_waits"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_across_workers(key, fn, shareable)
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        if call.error:
+            raise call.error
+        return call.result
+
+    # --- Cross-worker lease (MongoDB) ---
+
+    def _acquire(self, leases, key):
+        """Returns (True, None) if we now own the lease, else (False, lease_doc)."""
+        now = datetime.now(timezone.utc)
+        try:
+            leases.find_one_and_update(
+                {"_id": key, "expires_at": {"$lt": now}},
+                {"$set": {"owner": self.owner, "status": "running", "result": None,
+                          "expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True
+            )
+            return True, None
+        except DuplicateKeyError:
+            # Someone else holds a live lease (or has a fresh result)
+            return False, leases.find_one({"_id": key})
+
+    def _lease_error(self, action, error):
+        print(f"⚠️ Single-Flight Lease Error ({action}): {error}")
+        with self._lock:
+            self._stats["lease_errors"] += 1
+
+    def _do_across_workers(self, key, fn, shareable):
+        try:
+            leases = get_db()[self.collection]
+            deadline = time.monotonic() + self.lease_seconds
+
+            while True:
+                owned, lease = self._acquire(leases, key)
+                if owned:
+                    break
+                if lease and lease.get("status") == "done":
+                    return lease.get("result")
+                if time.monotonic() > deadline:
+                    # Leader is stuck; don't let the request hang forever
+                    break
+                with self._lock:
+                    self._stats["remote_waits"] += 1
+                time.sleep(self.poll_interval)
+        except (PyMongoError, ConnectionError) as e:
+            # Lease nahi mila to sirf is worker ka single-flight: request fail na ho
+            self._lease_error("acquire", e)
+            return fn()
+
+        try:
+            result = fn()
+        except Exception:
+            self._release(leases, key)
+            raise
+
+        if not shareable(result):
+            # Fallback / khali jawab doosre workers ko mat do; agla worker khud try kare
+            self._release(leases, key)
+            return result
+
+        # Publish for waiters in other workers; kept briefly for late arrivals
+        try:
+            leases.update_one(
+                {"_id": key, "owner": self.owner},
+                {"$set": {"status": "done", "result": result,
+                          "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.result_seconds)}}
+            )
+        except PyMongoError as e:
+            # Result already paid for: caller ko phir bhi milega, waiters lease expire hone par khud try karenge
+            self._lease_error("publish", e)
+        return result
+
+    def _release(self, leases, key):
+        try:
+            leases.delete_one({"_id": key, "owner": self.owner})
+        except PyMongoError as e:
+            self._lease_error("release", e)
+
+
+single_flight = SingleFlight(
+    lease_seconds=Config.SINGLE_FLIGHT_LEASE_SECONDS,
+    result_seconds=Config.SINGLE_FLIGHT_RESULT_SECONDS
+)
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._tasks = {}
+        self._stats = {"leaders": 0, "local_waits": 0}
+
+    def stats(self):
+        return {**self._stats, "in_flight": len(self._tasks)}
+
+    async def do(self, key, factory):
+        """Awaits factory() once per key across all concurrent callers in this event loop."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t: self._tasks.pop(key, None))
+            self._stats["leaders"] += 1
+        else:
+            self._stats["local_waits"] += 1
+        # shield: ek caller disconnect ho to baqi waiters ka kaam cancel na ho
+        return await asyncio.shield(task)
+
+
+async_single_flight = AsyncSingleFlight()
@@ -0,0 +1,138 @@
+"""
+Cached AI study plans ('study_plans' collection), refreshed off the request path.
+
+One document per user:
+    {_id: <user_id>, topics, topics_hash, plan, generated_at, pending_hash, pending_since}
+
+topics_hash is a sha256 of the sorted weak-topic set the plan was written for.
+GET /ai/recommendation serves the stored plan while the user's weak topics
+(services/weakness_index.py) still hash the same. When they change, the old
+plan is served once more, marked stale, and a 'refresh_study_plan' job
+regenerates it in the background (services/job_queue.py). Only a user's very
+first plan has nothing to show yet; the route answers 202 and the dashboard polls.
+
+update_progress calls refresh_if_changed(), so users who already have a plan
+usually find it refreshed before their next dashboard load.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from database.connection import get_db
+from services.ai_service import STUDY_PLAN_FALLBACK, generate_study_plan
+from services.job_queue import job_queue, RetryableJobError
+from services.weakness_index import get_weak_topics
+
+# A refresh that hasn't finished by then (worker died, job failed) may be requested again
+PENDING_LEASE = timedelta(minutes=5)
+
+
+def topics_hash(topics):
+    return hashlib.sha256("\n".join(sorted(topics)).encode("utf-8")).hexdigest()
+
+
+def request_refresh(db, user_id, topics, digest=None):
+    """Queues one regeneration per (user, topic set). Returns False if one is already pending."""
+    digest = digest or topics_hash(topics)
+    now = datetime.now(timezone.utc)
+    result = db.study_plans.update_one(
+        {"_id": user_id, "$or": [{"pending_hash": {"$ne": digest}}, {"pending_since": {"$lt": now - PENDING_LEASE}}]},
+        {"$set": {"pending_hash": digest, "pending_since": now}}
+    )
+    if result.matched_count == 0:
+        try:
+            db.study_plans.insert_one({"_id": user_id, "pending_hash": digest, "pending_since": now})
+        except DuplicateKeyError:
+            return False  # document exists and this topic set is already pending
+
+    try:
+        job_queue.enqueue("refresh_study_plan", {"user_id": user_id, "topics": sorted(topics), "topics_hash": digest})
+    except Exception:
+        # Job queue nahi hua to marker hatao, warna PENDING_LEASE tak koi retry nahi hoga
+        db.study_plans.update_one({"_id": user_id, "pending_hash": digest, "pending_since": now},
+                                  {"$unset": {"pending_hash": "", "pending_since": ""}})
+        raise
+    return True
+
+
+def try_request_refresh(db, user_id, topics, digest=None):
+    """request_refresh for read paths: errors are logged, not raised, so the stored plan is still served."""
+    try:
+        return request_refresh(db, user_id, topics, digest)
+    except Exception as e:
+        # Agli request par dobara koshish hogi
+        print(f"⚠️ Study Plan Refresh Skipped: {e}")
+        return False
+
+
+def get_plan(db, user_id, topics):
+    """
+    Returns (plan, fresh). `plan` is None when the user has never had one generated;
+    a refresh is queued (best-effort) whenever the stored plan doesn't match `topics`.
+    """
+    doc = db.study_plans.find_one({"_id": user_id}, {"plan": 1, "topics_hash": 1})
+    plan, fresh, digest = match_plan(doc, topics)
+    if not fresh:
+        try_request_refresh(db, user_id, topics, digest)
+    return plan, fresh
+
+
+def match_plan(doc, topics):
+    """(plan, fresh, topics digest) for a study_plans document (or None) and the current weak topics."""
+    digest = topics_hash(topics)
+    doc = doc or {}
+    fresh = bool(doc.get("plan")) and doc.get("topics_hash") == digest
+    return doc.get("plan"), fresh, digest
+
+
+def refresh_if_changed(db, user_id):
+    """
+    After a progress write: queue a refresh if the user's weak-topic set moved.
+    Best-effort: errors are logged, never raised, because the score is already saved.
+    """
+    try:
+        doc = db.study_plans.find_one({"_id": user_id}, {"topics_hash": 1, "pending_hash": 1})
+        if doc is None:
+            return  # user ne kabhi plan nahi maanga; bina wajah Gemini call na karo
+
+        topics = [t["topic"] for t in get_weak_topics(db, user_id)]
+        digest = topics_hash(topics)
+        if topics and digest not in (doc.get("topics_hash"), doc.get("pending_hash")):
+            request_refresh(db, user_id, topics, digest)
+    except Exception as e:
+        # Plan agli /ai/recommendation par refresh ho jayega
+        print(f"⚠️ Study Plan Refresh Skipped: {e}")
+
+
+@job_queue.register("refresh_study_plan")
+def refresh_study_plan_job(job):
+    payload = job["payload"]
+    user_id, topics, digest = payload["user_id"], payload["topics"], payload["topics_hash"]
+    db = get_db()
+
+    # Weak topics tab se badal gaye: yeh plan purana ho chuka, naya refresh khud queue hoga
+    current = [t["topic"] for t in get_weak_topics(db, user_id)]
+    if topics_hash(current) != digest:
+        db.study_plans.update_one({"_id": user_id, "pending_hash": digest},
+                                  {"$unset": {"pending_hash": "", "pending_since": ""}})
+        return {"topics_hash": digest, "skipped": True}
+
+    # Same topic set pe kisi aur user ka plan pehle se bana hai to wahi use karo
+    shared = db.study_plans.find_one({"topics_hash": digest, "plan": {"$exists": True}}, {"plan": 1})
+    if shared:
+        plan = shared["plan"]
+    else:
+        plan = generate_study_plan(", ".join(topics))
+        if not plan or plan == STUDY_PLAN_FALLBACK:
+            raise RetryableJobError("AI did not return a study plan")
+
+    fields = {"plan": plan, "topics": topics, "topics_hash": digest, "generated_at": datetime.now(timezone.utc)}
+    cleared = db.study_plans.update_one(
+        {"_id": user_id, "pending_hash": digest},
+        {"$set": fields, "$unset": {"pending_hash": "", "pending_since": ""}}
+    )
+    if cleared.matched_count == 0:
+        # Beech mein naya refresh queue ho gaya: plan save karo, uska pending marker rehne do
+        db.study_plans.update_one({"_id": user_id}, {"$set": fields}, upsert=True)
+    return {"topics_hash": digest, "reused": bool(shared)}
@@ -0,0 +1,237 @@
+"""
+Materialized per-user performance stats ('user_stats' collection).
+
+One document per user, kept up to date by update_progress:
+    {_id: <user_id>, count, score_sum, min_score, max_score, last_updated}
+
+Writes use $inc/$min/$max so concurrent progress saves for the same user
+commute. When an upsert replaces an existing score, the old score is
+subtracted first; if the replaced score was the current min/max, those two
+fields are recomputed from 'progress' (one small indexed aggregation).
+
+Every write also bumps `version`. Rebuilds and min/max recomputes only land if
+`version` is unchanged since they started reading 'progress'; otherwise they
+re-read, so a concurrent $inc is never overwritten. A user without progress
+gets an empty document (count 0), so reads don't re-aggregate every time.
+The full backfill applies the same guard, a batch of users at a time.
+
+Backfill / repair (run from the backend folder):
+    python -m services.user_stats --rebuild
+"""
+import argparse
+import math
+from numbers import Number
+
+from pymongo import ReplaceOne, UpdateOne
+
+
+def _stats_pipeline(match):
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": "$user_id",
+            "count": {"$sum": 1},
+            "score_sum": {"$sum": "$score"},
+            "min_score": {"$min": "$score"},
+            "max_score": {"$max": "$score"},
+            "last_updated": {"$max": "$last_updated"}
+        }}
+    ]
+
+
+# How often a conditional rebuild re-reads 'progress' after losing to a concurrent write
+REBUILD_RETRIES = 5
+
+
+def _recompute_min_max(db, user_id):
+    for _ in range(REBUILD_RETRIES):
+        before = db.user_stats.find_one({"_id": user_id}, {"version": 1})
+        if before is None:
+            return
+        result = next(db.progress.aggregate(_stats_pipeline({"user_id": user_id})), None)
+        if result is None:
+            return
+        # Beech mein koi aur write aa gaya ho to dobara parho
+        written = db.user_stats.update_one(
+            {"_id": user_id, "version": before.get("version")},
+            {"$set": {"min_score": result["min_score"], "max_score": result["max_score"]}}
+        )
+        if written.matched_count:
+            return
+
+
+def _as_score(value):
+    """
+    A replaced score as the aggregation saw it: $sum skips non-numbers, so legacy
+    string scores (and None/NaN) count as 0 here too.
+    """
+    if isinstance(value, Number) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    return 0
+
+
+def score_update(new_score, old_score=None, replaced=False, when=None):
+    """The user_stats update document for one progress write (shared by the sync and async paths)."""
+    return scores_update([(new_score, old_score, replaced)], when)
+
+
+def scores_update(changes, when=None):
+    """Same for a batch of progress writes: `changes` is [(new_score, old_score, replaced), ...]."""
+    inc = {"score_sum": sum(new - _as_score(old) if replaced else new for new, old, replaced in changes), "version": 1}
+    inserted = sum(1 for _, _, replaced in changes if not replaced)
+    if inserted:
+        inc["count"] = inserted
+
+    new_scores = [new for new, _, _ in changes]
+    update = {"$inc": inc, "$min": {"min_score": min(new_scores)}, "$max": {"max_score": max(new_scores)}}
+    if when is not None:
+        update["$max"]["last_updated"] = when
+    return update
+
+
+def score_followup(before, new_score, old_score=None, replaced=False):
+    """
+    What has to happen after score_update was applied, given the document as it was before:
+    "rebuild", "min_max" or None (the common case).
+    """
+    return scores_followup(before, [(new_score, old_score, replaced)])
+
+
+def scores_followup(before, changes):
+    # Pehli dafa stats doc bana: user backfill nahi hua tha, purani history bhi shamil karo
+    if before is None:
+        return "rebuild"
+    # Purana score hi min/max tha aur ab badal gaya: min/max dobara nikalo
+    bounds = (before.get("min_score"), before.get("max_score"))
+    if any(replaced and old != new and old in bounds for new, old, replaced in changes):
+        return "min_max"
+    return None
+
+
+def apply_followup(db, user_id, action):
+    if action == "rebuild":
+        rebuild_user(db, user_id)
+    elif action == "min_max":
+        _recompute_min_max(db, user_id)
+
+
+def record_score(db, user_id, new_score, old_score=None, replaced=False, when=None):
+    """
+    Applies one progress write to the user's stats.
+    `replaced=True` means an existing progress row had `old_score` before this write.
+    """
+    record_scores(db, user_id, [(new_score, old_score, replaced)], when)
+
+
+def record_scores(db, user_id, changes, when=None):
+    """Applies a batch of progress writes ([(new_score, old_score, replaced), ...]) with one update."""
+    before = db.user_stats.find_one_and_update(
+        {"_id": user_id}, scores_update(changes, when), upsert=True,
+        projection={"min_score": 1, "max_score": 1}
+    )
+    apply_followup(db, user_id, scores_followup(before, changes))
+
+
+def _versioned_doc(user_id, result, version):
+    # Progress nahi: khali doc (count 0), None nahi, taake har read dobara aggregate na kare
+    doc = result or {"_id": user_id, "count": 0, "score_sum": 0}
+    doc["version"] = (version or 0) + 1
+    return doc
+
+
+def _versioned_write(user_id, exists, version, doc):
+    """The conditional write for a rebuilt doc: insert if still missing, else replace if `version` is unchanged."""
+    if not exists:
+        return UpdateOne({"_id": user_id}, {"$setOnInsert": doc}, upsert=True)
+    return ReplaceOne({"_id": user_id, "version": version}, doc)
+
+
+def rebuild_user(db, user_id):
+    """
+    Recomputes one user's stats from 'progress' and returns the new document.
+    The write only lands if no progress save touched the stats meanwhile (else it re-reads).
+    """
+    for _ in range(REBUILD_RETRIES):
+        before = db.user_stats.find_one({"_id": user_id}, {"version": 1})
+        version = before.get("version") if before else None
+        result = next(db.progress.aggregate(_stats_pipeline({"user_id": user_id})), None)
+        doc = _versioned_doc(user_id, result, version)
+
+        written = db.user_stats.bulk_write([_versioned_write(user_id, before is not None, version, doc)])
+        # $setOnInsert ka match matlab kisi aur ne doc pehle bana diya: dobara parho
+        if written.upserted_count if before is None else written.matched_count:
+            return doc
+    return doc
+
+
+def get_user_stats(db, user_id):
+    """
+    O(1) read of a user's stats, shaped for the API.
+    Users not backfilled yet are rebuilt on first read.
+    """
+    doc = db.user_stats.find_one({"_id": user_id})
+    if doc is None:
+        doc = rebuild_user(db, user_id)
+    return shape_stats(doc)
+
+
+def shape_stats(doc):
+    count = doc.get("count", 0)
+    return {
+        "total_quizzes": count,
+        "average_score": round(doc.get("score_sum", 0) / count, 1) if count > 0 else 0,
+        "min_score": doc.get("min_score"),
+        "max_score": doc.get("max_score"),
+        "last_updated": doc.get("last_updated")
+    }
+
+
+def rebuild_all(db, batch_size=500):
+    """
+    Backfills 'user_stats' for every user, `batch_size` users per aggregation.
+    Same version guard as rebuild_user, so progress saves running meanwhile aren't
+    overwritten; users that lost that race are rebuilt one by one afterwards.
+    Users without progress keep an empty doc. Returns the number of users.
+    """
+    user_ids = list(set(db.progress.distinct("user_id")) | set(db.user_stats.distinct("_id")))
+    for start in range(0, len(user_ids), batch_size):
+        chunk = user_ids[start:start + batch_size]
+        versions = {d["_id"]: d.get("version") for d in db.user_stats.find({"_id": {"$in": chunk}}, {"version": 1})}
+        fresh = {d["_id"]: d for d in db.progress.aggregate(_stats_pipeline({"user_id": {"$in": chunk}}))}
+
+        expected, writes = {}, []
+        for user_id in chunk:
+            doc = _versioned_doc(user_id, fresh.get(user_id), versions.get(user_id))
+            expected[user_id] = doc["version"]
+            writes.append(_versioned_write(user_id, user_id in versions, versions.get(user_id), doc))
+        db.user_stats.bulk_write(writes, ordered=False)
+
+        # Jin users par beech mein progress save hua, unka version hamare wale se alag hai
+        for d in db.user_stats.find({"_id": {"$in": chunk}}, {"version": 1}):
+            if d.get("version") != expected[d["_id"]]:
+                rebuild_user(db, d["_id"])
+    return len(user_ids)
+
+
+def main():
+    from pymongo import MongoClient
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Maintain the materialized user_stats collection.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute stats for every user from progress")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    client = MongoClient(Config.MONGO_URI)
+    try:
+        total = rebuild_all(client.get_default_database(default="ai_learning_db"))
+        print(f"✅ Rebuilt stats for {total} users.")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,211 @@
+"""
+Per-user weakness index ('weakness_index' collection).
+
+One document per user, kept up to date by update_progress:
+    {_id: <user_id>, updated_at,
+     topics: {<topic key>: {topic, mastery, attempts, failures, last_score, last_seen}}}
+
+- mastery is an exponentially weighted average of the user's scores on the
+  topic: each new attempt moves it `alpha` of the way towards the new score,
+  so a recent retake counts more than an old one.
+- At read time each topic below `threshold` is ranked by
+      (100 - mastery) * 0.5 ** (days since last attempt / half_life) * (1 + ln(1 + failures))
+  i.e. how weak it is, how recently that showed, and how often it failed.
+
+Writes are a single atomic pipeline update, so concurrent saves can't lose an
+attempt. Each write bumps `version`, and rebuild_user only replaces a document
+whose version is unchanged since it started reading 'progress'. Reads are one
+small document; /ai/recommendation and /ai/generate-adaptive-quiz no longer
+scan 'progress'.
+
+Backfill / repair (run from the backend folder):
+    python -m services.weakness_index --rebuild
+"""
+import argparse
+import hashlib
+import math
+from datetime import datetime, timezone
+
+from config import Config
+from services.quiz_cache import normalize_topic
+
+
+def topic_key(topic):
+    # Topic names may contain '.' or '$', which can't be field names
+    return hashlib.sha1(normalize_topic(topic).encode("utf-8")).hexdigest()[:16]
+
+
+def _apply_attempt(entry, topic, score, when, alpha, threshold):
+    """Pure-Python version of the update pipeline (used by rebuild_user)."""
+    attempts = entry.get("attempts", 0)
+    mastery = entry["mastery"] + alpha * (score - entry["mastery"]) if attempts else score
+    return {
+        "topic": topic,
+        "mastery": mastery,
+        "attempts": attempts + 1,
+        "failures": entry.get("failures", 0) + (1 if score < threshold else 0),
+        "last_score": score,
+        "last_seen": when,
+    }
+
+
+def attempt_pipeline(topic, score, when):
+    """Update pipeline folding one attempt into the index (shared by the sync and async paths)."""
+    alpha, threshold = Config.WEAKNESS_ALPHA, Config.WEAKNESS_THRESHOLD
+    path = f"topics.{topic_key(topic)}"
+    attempts = {"$ifNull": [f"${path}.attempts", 0]}
+    return [{"$set": {
+        path: {
+            "topic": {"$literal": topic},
+            "mastery": {"$cond": [
+                {"$gt": [attempts, 0]},
+                {"$add": [f"${path}.mastery", {"$multiply": [alpha, {"$subtract": [score, f"${path}.mastery"]}]}]},
+                score
+            ]},
+            "attempts": {"$add": [attempts, 1]},
+            "failures": {"$add": [{"$ifNull": [f"${path}.failures", 0]}, 1 if score < threshold else 0]},
+            "last_score": score,
+            "last_seen": when
+        },
+        "updated_at": when,
+        "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}
+    }}]
+
+
+# Pipeline stages per update (MongoDB caps a pipeline at 1000 stages)
+ATTEMPTS_PER_UPDATE = 100
+
+
+def attempts_pipelines(attempts, when):
+    """
+    Update pipelines folding [(topic, score), ...] into the index in order, each
+    attempt's stage seeing the previous one's result. Chunked so no single
+    update runs more than ATTEMPTS_PER_UPDATE stages.
+    """
+    for start in range(0, len(attempts), ATTEMPTS_PER_UPDATE):
+        yield [stage for topic, score in attempts[start:start + ATTEMPTS_PER_UPDATE]
+               for stage in attempt_pipeline(topic, score, when)]
+
+
+def record_attempt(db, user_id, topic, score, when=None):
+    """Folds one progress write into the user's weakness index."""
+    record_attempts(db, user_id, [(topic, score)], when)
+
+
+def record_attempts(db, user_id, attempts, when=None):
+    """Folds several progress writes (oldest first) into the index, one atomic update per chunk."""
+    when = when or datetime.now(timezone.utc)
+    for pipeline in attempts_pipelines(attempts, when):
+        before = db.weakness_index.find_one_and_update(
+            {"_id": user_id}, pipeline, upsert=True, projection={"_id": 1}
+        )
+
+        # Pehli dafa index bana: purani history bhi shamil karo (is write samait)
+        if before is None:
+            rebuild_user(db, user_id)
+            return
+
+
+# How often a conditional rebuild re-reads 'progress' after losing to a concurrent write
+REBUILD_RETRIES = 5
+
+
+def _topics_from_progress(db, user_id):
+    alpha, threshold = Config.WEAKNESS_ALPHA, Config.WEAKNESS_THRESHOLD
+    topics = {}
+    rows = db.progress.find({"user_id": user_id}, {"topic": 1, "score": 1, "last_updated": 1}).sort("last_updated", 1)
+    for row in rows:
+        topic = row.get("topic") or "General"
+        key = topic_key(topic)
+        topics[key] = _apply_attempt(topics.get(key, {}), topic, row.get("score") or 0,
+                                     row.get("last_updated"), alpha, threshold)
+    return topics
+
+
+def rebuild_user(db, user_id):
+    """
+    Recomputes one user's index from 'progress' (oldest first) and returns the new document.
+    The write only lands if no attempt was recorded meanwhile (else it re-reads).
+    """
+    for _ in range(REBUILD_RETRIES):
+        before = db.weakness_index.find_one({"_id": user_id}, {"version": 1})
+        version = before.get("version") if before else None
+        # Progress nahi: khali topics wala doc, taake har read dobara 'progress' na parhe
+        doc = {"_id": user_id, "topics": _topics_from_progress(db, user_id),
+               "updated_at": datetime.now(timezone.utc), "version": (version or 0) + 1}
+
+        if before is None:
+            written = db.weakness_index.update_one({"_id": user_id}, {"$setOnInsert": doc}, upsert=True)
+            if written.upserted_id is not None:
+                return doc
+        elif db.weakness_index.replace_one({"_id": user_id, "version": version}, doc).matched_count:
+            return doc
+    return doc
+
+
+def _weakness(entry, now):
+    last_seen = entry.get("last_seen")
+    if last_seen is None:
+        age_days = 0
+    else:
+        if last_seen.tzinfo is None:  # PyMongo returns naive UTC datetimes
+            last_seen = last_seen.replace(tzinfo=timezone.utc)
+        age_days = max(0.0, (now - last_seen).total_seconds() / 86400)
+    recency = 0.5 ** (age_days / Config.WEAKNESS_HALF_LIFE_DAYS)
+    return (100 - entry["mastery"]) * recency * (1 + math.log1p(entry.get("failures", 0)))
+
+
+def get_weak_topics(db, user_id, limit=None):
+    """
+    Weak topics, weakest first: [{"topic", "mastery", "weakness", "attempts", "failures"}].
+    Users not backfilled yet are rebuilt on first read.
+    """
+    doc = db.weakness_index.find_one({"_id": user_id}, {"topics": 1})
+    if doc is None:
+        doc = rebuild_user(db, user_id)
+    return rank_topics(doc, limit)
+
+
+def rank_topics(doc, limit=None):
+    """Ranks the topics of a weakness_index document, weakest first."""
+    now = datetime.now(timezone.utc)
+    ranked = [
+        {"topic": e["topic"], "mastery": round(e["mastery"], 1), "weakness": round(_weakness(e, now), 2),
+         "attempts": e.get("attempts", 0), "failures": e.get("failures", 0)}
+        for e in (doc.get("topics") or {}).values()
+        if e.get("mastery", 100) < Config.WEAKNESS_THRESHOLD
+    ]
+    ranked.sort(key=lambda t: (-t["weakness"], t["topic"]))
+    return ranked[:limit or Config.WEAKNESS_MAX_TOPICS]
+
+
+def rebuild_all(db):
+    """Recomputes the index for every user that has progress. Returns the number of users."""
+    live_ids = db.progress.distinct("user_id")
+    total = sum(1 for user_id in live_ids if rebuild_user(db, user_id)["topics"])
+    # Users whose progress was deleted shouldn't keep a stale index
+    db.weakness_index.delete_many({"_id": {"$nin": live_ids}})
+    return total
+
+
+def main():
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Maintain the per-user weakness index.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the index for every user from progress")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    client = MongoClient(Config.MONGO_URI)
+    try:
+        total = rebuild_all(client.get_default_database(default="ai_learning_db"))
+        print(f"✅ Rebuilt weakness index for {total} users.")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
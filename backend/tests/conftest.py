@@ -0,0 +1,48 @@
+"""
+Shared fixtures. Run from the backend folder:  python -m pytest -q
+
+config.py refuses to import without MONGO_URI / JWT_SECRET_KEY, so test
+defaults are set before anything imports it. Tests that need a real mongod use
+the `mongo_db` fixture and are skipped when none is reachable
+(MONGO_TEST_URI, default mongodb://localhost:27017). Tests that only need
+basic CRUD/queries use the in-memory `mock_db` (mongomock) and always run.
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017/ai_learning_test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-pytest-only-0123456789")
+os.environ.setdefault("AI_PROVIDER", "fake")
+os.environ.setdefault("AUTO_CREATE_INDEXES", "False")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("CHAT_LOG_BUFFERED", "False")
+os.environ.setdefault("PROFILING_ENABLED", "False")
+
+
+@pytest.fixture
+def mongo_db():
+    """A scratch database on a local mongod (dropped afterwards); skips if none is running."""
+    pymongo = pytest.importorskip("pymongo")
+    uri = os.environ.get("MONGO_TEST_URI", "mongodb://localhost:27017")
+    client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError:
+        client.close()
+        pytest.skip(f"no mongod at {uri}")
+
+    name = "ai_learning_test_scratch"
+    client.drop_database(name)
+    try:
+        yield client[name]
+    finally:
+        client.drop_database(name)
+        client.close()
+
+
+@pytest.fixture
+def mock_db():
+    """An in-memory mongomock database (no $lookup with let, no $indexStats, no explain)."""
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient().db
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("flask")
+
+from services.ai_guard import AIGuard, AIUnavailableError
+
+
+def test_async_and_thread_callers_share_one_budget():
+    guard = AIGuard(max_concurrency=2, queue_timeout=0.1)
+    holding, release = threading.Barrier(3), threading.Event()
+
+    def background_job():
+        with guard.slot():
+            holding.wait()
+            release.wait()
+
+    jobs = [threading.Thread(target=background_job) for _ in range(2)]
+    for t in jobs:
+        t.start()
+    holding.wait()
+
+    async def request():
+        async with guard.aslot():
+            pass
+
+    try:
+        # Dono slots background jobs ke paas hain: async request ko jagah nahi milni chahiye
+        with pytest.raises(AIUnavailableError):
+            asyncio.run(request())
+        assert guard.stats()["rejected_queue_full"] == 1
+    finally:
+        release.set()
+        for t in jobs:
+            t.join()
+
+    asyncio.run(request())
+    assert guard.stats()["in_flight"] == 0
+    assert guard.stats()["queue_depth"] == 0
@@ -0,0 +1,111 @@
+"""
+/api/ai/chat/stream (Server-Sent Events) driven by the fake AI provider.
+No MongoDB needed: chat log writes are captured instead of buffered.
+"""
+import json
+
+import pytest
+
+pytest.importorskip("flask_jwt_extended")
+pytest.importorskip("flask_pymongo")
+
+from app import create_app
+from routes import ai_routes
+from services.ai_provider import FakeProvider, set_provider
+from utils.jwt_helper import generate_token
+
+USER_ID = "64b000000000000000000001"
+
+
+class BrokenStreamProvider(FakeProvider):
+    """Sends a couple of tokens, then the upstream connection dies."""
+
+    def stream(self, prompt, timeout=None):
+        yield "Partial "
+        yield "answer"
+        raise ConnectionError("upstream reset")
+
+
+class DeadProvider(FakeProvider):
+    def stream(self, prompt, timeout=None):
+        raise ConnectionError("upstream down")
+        yield
+
+
+class _Logs:
+    def __init__(self):
+        self.entries = []
+
+    def add(self, entry):
+        self.entries.append(entry)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = create_app()
+    app.config["TESTING"] = True
+    logs = _Logs()
+    monkeypatch.setattr(ai_routes, "chat_log_buffer", logs)
+    with app.app_context():
+        token = generate_token(USER_ID, "Student")
+    test_client = app.test_client()
+    test_client.logs = logs
+    test_client.headers = {"Authorization": f"Bearer {token}"}
+    yield test_client
+    set_provider(None)
+
+
+def events(response):
+    """[(event name, payload)] from an SSE body."""
+    parsed = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        name, data = "message", None
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                name = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        parsed.append((name, data))
+    return parsed
+
+
+def test_stream_sends_tokens_then_done_and_logs_reply(client):
+    provider = FakeProvider(latency=0, stream_chunks=4)
+    set_provider(provider)
+
+    resp = client.post("/api/ai/chat/stream", json={"message": "What is a loop?"}, headers=client.headers)
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    parsed = events(resp)
+    tokens = [p["token"] for name, p in parsed if name == "message"]
+    assert len(tokens) > 1
+    assert parsed[-1][0] == "done"
+
+    expected = provider._reply("What is a loop?")
+    assert "".join(tokens) == expected
+    assert parsed[-1][1]["reply"] == expected.strip()
+    assert [e["reply"] for e in client.logs.entries] == [expected.strip()]
+
+
+def test_mid_stream_failure_sends_error_event_and_logs_nothing(client):
+    set_provider(BrokenStreamProvider(latency=0))
+
+    parsed = events(client.post("/api/ai/chat/stream", json={"message": "hi"}, headers=client.headers))
+
+    assert [name for name, _ in parsed] == ["message", "message", "error"]
+    assert "offline" not in json.dumps(parsed).lower()
+    assert client.logs.entries == []
+
+
+def test_failure_before_first_token_falls_back_to_offline_reply(client):
+    set_provider(DeadProvider(latency=0))
+
+    parsed = events(client.post("/api/ai/chat/stream", json={"message": "hi"}, headers=client.headers))
+
+    assert parsed[-1] == ("done", {"reply": "I am currently offline."})
+
+
+def test_stream_requires_message(client):
+    resp = client.post("/api/ai/chat/stream", json={}, headers=client.headers)
+    assert resp.status_code == 400
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+from database.indexes import INDEXES, QUERY_SHAPES, _key_tuple, ensure_indexes, explain_query_shapes, report_indexes
+
+
+def test_registry_applies_cleanly(mongo_db):
+    ensure_indexes(mongo_db)
+    assert all(not r["missing"] for r in report_indexes(mongo_db).values())
+
+
+def test_every_query_shape_uses_an_index(mongo_db):
+    ensure_indexes(mongo_db)
+    plans = dict(explain_query_shapes(mongo_db))
+
+    assert set(plans) == {route for route, *_ in QUERY_SHAPES}
+    scans = {route: stages for route, stages in plans.items() if "COLLSCAN" in stages}
+    assert not scans, f"collection scans: {scans}"
+
+
+def test_registry_creates_every_index_with_its_options(mock_db):
+    ensure_indexes(mock_db)
+
+    for collection, specs in INDEXES.items():
+        existing = {_key_tuple(info["key"]): info for info in mock_db[collection].index_information().values()}
+        for spec in specs:
+            info = existing[_key_tuple(spec["keys"])]
+            assert all(info.get(k) == v for k, v in spec.items() if k != "keys"), (collection, spec)
+
+
+def test_every_query_shape_has_a_leading_index_field():
+    # explain() ke bina: kam az kam ek index ka pehla field filter ya sort mein ho
+    for route, collection, query, sort in QUERY_SHAPES:
+        leading = {spec["keys"][0][0] for spec in INDEXES.get(collection, [])}
+        fields = {f for f, v in query.items() if not isinstance(v, dict)}
+        if sort:
+            fields.add(sort[0][0])
+        assert leading & fields or "_id" in fields, route
+
+
+def test_user_query_shapes_skip_deleted_accounts():
+    for route, collection, query, _ in QUERY_SHAPES:
+        if collection == "users":
+            assert query.get("deleted") == {"$ne": True}, route
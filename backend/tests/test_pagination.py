@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("pymongo")
+
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+
+
+def walk(collection, direction, limit=2):
+    """Every _id, page by page, following next_cursor to the end."""
+    seen, after = [], None
+    while True:
+        docs, cursor = paginate(collection, {}, "created_at", direction=direction, limit=limit, after=after)
+        seen.extend(d["_id"] for d in docs)
+        if cursor is None:
+            return seen
+        after = decode_cursor(cursor)
+
+
+def check_paging_reaches_documents_without_the_sort_field(db, direction):
+    start = datetime(2024, 1, 1)
+    docs = [{"_id": ObjectId(), "created_at": start + timedelta(days=i)} for i in range(3)]
+    # Purane records jin mein created_at hai hi nahi
+    docs += [{"_id": ObjectId()} for _ in range(3)]
+    docs += [{"_id": ObjectId(), "created_at": None}]
+    db.items.insert_many(docs)
+
+    seen = walk(db.items, direction)
+
+    expected = [d["_id"] for d in db.items.find().sort([("created_at", direction), ("_id", direction)])]
+    assert seen == expected
+    assert len(seen) == len(docs)
+
+
+@pytest.mark.parametrize("direction", [-1, 1])
+def test_paging_reaches_documents_without_the_sort_field(mongo_db, direction):
+    check_paging_reaches_documents_without_the_sort_field(mongo_db, direction)
+
+
+@pytest.mark.parametrize("direction", [-1, 1])
+def test_paging_in_memory(mock_db, direction):
+    check_paging_reaches_documents_without_the_sort_field(mock_db, direction)
+
+
+@pytest.mark.parametrize("value", [None, 42, "Loops", datetime(2024, 1, 1, 12, 30)])
+def test_cursor_round_trip(value):
+    doc_id = ObjectId()
+    assert decode_cursor(encode_cursor(value, doc_id)) == (value, doc_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "64b7f0c2a1b2c3d4e5f60718", ""])
+def test_bad_cursors_raise_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("pymongo")
+
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from services.progress_batch import apply_batch, finish_batch, parse_record, plan_batch
+from services.user_stats import _stats_pipeline, scores_update
+
+RECORDS = [
+    {"module_id": "m1", "topic": "Loops", "score": 40},
+    {"module_id": "m2", "topic": "Arrays", "score": 90},
+    {"module_id": "m1", "topic": "Loops", "score": 70},
+    {"topic": "", "score": 10},
+]
+
+
+def test_superseded_records_still_count_as_attempts():
+    results, writes, superseded = plan_batch(RECORDS)
+
+    assert [i for i, _ in writes] == [1, 2]
+    assert [i for i, _ in superseded] == [0]
+    assert results[0]["status"] == "superseded" and results[3]["status"] == "invalid"
+
+    changes, attempts, needs_rebuild = finish_batch(results, writes, superseded, {}, upserted={0, 1}, failed={})
+    assert attempts == [("Loops", 40), ("Arrays", 90), ("Loops", 70)]
+    assert len(changes) == 2 and not needs_rebuild
+
+
+def test_failed_write_drops_its_superseded_attempts():
+    results, writes, superseded = plan_batch(RECORDS)
+
+    _, attempts, _ = finish_batch(results, writes, superseded, {}, upserted={0}, failed={1: "boom"})
+
+    assert attempts == [("Arrays", 90)]
+    assert results[2]["status"] == "error"
+
+
+@pytest.mark.parametrize("score", [float("nan"), "inf", -1, 101, "abc"])
+def test_scores_outside_0_to_100_are_rejected(score):
+    record, error = parse_record({"module_id": "m1", "score": score})
+    assert record is None and error == "Score must be a number between 0 and 100"
+
+
+def test_legacy_string_scores_are_subtracted_as_zero():
+    # Rebuild ka $sum bhi string score ko skip karta hai
+    update = scores_update([(60, "45", True), (30, None, True), (10, None, False)])
+    assert update["$inc"] == {"score_sum": 100, "version": 1, "count": 1}
+
+
+def test_replaced_scores_come_from_the_write_itself(mongo_db):
+    uid = ObjectId()
+    now = datetime.now(timezone.utc)
+    mongo_db.progress.insert_one({"user_id": uid, "module_id": "m1", "topic": "Loops", "score": 20, "last_updated": now})
+    mongo_db.user_stats.insert_one({"_id": uid, "count": 1, "score_sum": 20, "min_score": 20, "max_score": 20})
+    mongo_db.weakness_index.insert_one({"_id": uid, "topics": {}})
+
+    results = apply_batch(mongo_db, uid, RECORDS, now)
+
+    assert [r["status"] for r in results] == ["superseded", "inserted", "updated", "invalid"]
+    stored = mongo_db.user_stats.find_one({"_id": uid})
+    fresh = next(mongo_db.progress.aggregate(_stats_pipeline({"user_id": uid})))
+    assert (stored["count"], stored["score_sum"]) == (fresh["count"], fresh["score_sum"]) == (2, 160)
+    # Capture tags batch ke baad hata diye jate hain
+    assert mongo_db.progress.count_documents({"bulk_prev": {"$exists": True}}) == 0
+    attempts = sum(t["attempts"] for t in mongo_db.weakness_index.find_one({"_id": uid})["topics"].values())
+    assert attempts == 3
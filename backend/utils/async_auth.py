@@ -0,0 +1,52 @@
+"""
+JWT checks for the async (Quart) routes.
+
+flask_jwt_extended only works inside Flask, so the async app verifies the same
+access tokens directly with PyJWT: same secret, same HS256 signature, identity
+in "sub" and the role as an extra claim (see utils/jwt_helper.py). Error
+responses match flask_jwt_extended's, so the frontend can't tell them apart.
+"""
+from functools import wraps
+
+import jwt
+from quart import current_app, g, jsonify, request
+
+
+def _decode(token):
+    return jwt.decode(
+        token,
+        current_app.config["JWT_SECRET_KEY"],
+        algorithms=[current_app.config.get("JWT_ALGORITHM", "HS256")],
+        options={"require": ["exp", "sub"]}
+    )
+
+
+def jwt_required_async(view):
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        header = request.headers.get("Authorization", "")
+        if not header:
+            return jsonify({"msg": "Missing Authorization Header"}), 401
+        parts = header.split()
+        if len(parts) != 2 or parts[0] != "Bearer":
+            return jsonify({"msg": "Bad Authorization header. Expected 'Authorization: Bearer <JWT>'"}), 422
+        try:
+            claims = _decode(parts[1])
+        except jwt.ExpiredSignatureError:
+            return jsonify({"msg": "Token has expired"}), 401
+        except jwt.InvalidTokenError as e:
+            return jsonify({"msg": str(e)}), 422
+        if claims.get("type", "access") != "access":
+            return jsonify({"msg": "Only non-refresh tokens are allowed"}), 422
+
+        g.jwt_claims = claims
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+def get_jwt_identity():
+    return g.jwt_claims["sub"]
+
+
+def get_jwt():
+    return g.jwt_claims
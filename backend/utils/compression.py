@@ -0,0 +1,109 @@
+"""
+Response compression (brotli when the client accepts it, else gzip).
+
+Installed from create_app as an after_request hook. Only JSON/text bodies above
+Config.COMPRESS_MIN_SIZE are compressed; streamed JSON (stream_json_array) is
+compressed chunk by chunk. Server-Sent Events are never touched, since
+buffering would defeat streaming. asgi.py installs init_async_compression on
+its Quart app, which compresses non-streamed bodies the same way.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/css", "application/javascript")
+
+
+def _choose_encoding(accepted=None):
+    accepted = accepted if accepted is not None else request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _stream_compress(chunks, encoding, level):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=min(level, 11))
+        for chunk in chunks:
+            out = compressor.process(chunk)
+            if out:
+                yield out
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        for chunk in chunks:
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+        yield compressor.flush()
+
+
+def _compress(data, encoding, level):
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level)
+
+
+def _compressible(response):
+    return (response.status_code == 200
+            and "Content-Encoding" not in response.headers
+            and response.mimetype in COMPRESSIBLE_TYPES)
+
+
+def init_compression(app):
+    min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+    level = app.config.get("COMPRESS_LEVEL", 6)
+
+    @app.after_request
+    def compress_response(response):
+        if not _compressible(response):
+            return response
+
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+        response.vary.add("Accept-Encoding")
+
+        if response.is_streamed:
+            response.response = _stream_compress(response.iter_encoded(), encoding, level)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(_compress(data, encoding, level))
+
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+def init_async_compression(app):
+    """Quart version for asgi.py. Streamed bodies (SSE) are left alone."""
+    from quart import request as qrequest
+
+    min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+    level = app.config.get("COMPRESS_LEVEL", 6)
+
+    @app.after_request
+    async def compress_response(response):
+        if not _compressible(response) or not isinstance(response.response, response.data_body_class):
+            return response
+        encoding = _choose_encoding(qrequest.accept_encodings)
+        if encoding is None:
+            return response
+        response.vary.add("Accept-Encoding")
+
+        data = await response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(_compress(data, encoding, level))
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -1,7 +1,90 @@
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import bcrypt
 
-def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+from config import Config
+from utils.metrics import registry
+from utils.profiling import timed
 
-def check_password(plain_password, hashed_password):
+
+class HashQueueFull(Exception):
+    """Too many password hashes queued; caller should answer 503 + Retry-After."""
+
+    def __init__(self, retry_after):
+        super().__init__("Server busy, please retry")
+        self.retry_after = retry_after
+
+
+# --- Worker functions (top-level so a process pool can pickle them) ---
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _checkpw(plain_password, hashed_password):
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+# --- Bounded hashing pool ---
+# bcrypt costs ~250ms CPU per call; running it on the request thread lets an
+# exam-start login burst starve every other endpoint. All hashing goes through
+# one pool with a fixed number of workers and a bounded queue instead.
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(Config.HASH_POOL_WORKERS + Config.HASH_QUEUE_SIZE)
+_in_use = 0  # hashing + queued, for /metrics
+_in_use_lock = threading.Lock()
+
+
+def _track(delta):
+    global _in_use
+    with _in_use_lock:
+        _in_use += delta
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if Config.HASH_POOL_KIND == "process":
+                _pool = ProcessPoolExecutor(max_workers=Config.HASH_POOL_WORKERS)
+            else:
+                # bcrypt releases the GIL while hashing, so threads also scale across cores
+                _pool = ThreadPoolExecutor(max_workers=Config.HASH_POOL_WORKERS, thread_name_prefix="bcrypt")
+        return _pool
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        _rejected.inc()
+        raise HashQueueFull(retry_after=Config.HASH_RETRY_AFTER_SECONDS)
+    _track(1)
+    try:
+        with timed("hash"):
+            return _get_pool().submit(fn, *args).result()
+    finally:
+        _track(-1)
+        _slots.release()
+
+
+_rejected = registry.counter("hash_pool_rejected_total", "Password hashes refused with 503 because the queue was full.")
+registry.gauge("hash_pool_in_use", "Password hashes running or queued.", lambda: _in_use)
+registry.gauge("hash_pool_capacity", "Hash pool workers + queue slots.",
+               lambda: Config.HASH_POOL_WORKERS + Config.HASH_QUEUE_SIZE)
+
+
+def hash_password(password, rounds=None):
+    return _run(_hashpw, password, rounds or Config.BCRYPT_ROUNDS)
+
+
+def check_password(plain_password, hashed_password):
+    return _run(_checkpw, plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password):
+    """True if the stored hash was made with a different cost factor than Config.BCRYPT_ROUNDS."""
+    match = re.match(r"^\$2[abxy]?\$(\d{2})\$", hashed_password or "")
+    return not match or int(match.group(1)) != Config.BCRYPT_ROUNDS
@@ -0,0 +1,83 @@
+"""
+HTTP conditional GET (ETag / Last-Modified) for catalog endpoints.
+
+Every cacheable data set has a version counter in the 'collection_versions'
+collection. Writers call bump_version(); readers decorated with @conditional
+derive a weak ETag from those counters, so a client that already has the
+current data gets a 304 without the route querying or serializing anything.
+
+Only If-None-Match decides a 304. Last-Modified is sent for information but
+has one-second resolution, so two writes in the same second would look
+unchanged to If-Modified-Since.
+
+Keys may contain "{user}" for per-user data, e.g. "enrollments:{user}".
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+from database.connection import get_db
+
+
+def bump_version(db, key):
+    """Marks `key` as changed; all ETags derived from it become stale."""
+    db.collection_versions.update_one(
+        {"_id": key},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+
+
+def get_versions(db, keys):
+    """Returns {key: (version, updated_at)}; unknown keys are version 0."""
+    found = {d["_id"]: d for d in db.collection_versions.find({"_id": {"$in": list(keys)}})}
+    return {k: (found.get(k, {}).get("version", 0), found.get(k, {}).get("updated_at")) for k in keys}
+
+
+def _resolve(keys):
+    user = get_jwt_identity() if any("{user}" in k for k in keys) else None
+    return [k.replace("{user}", str(user)) for k in keys]
+
+
+def _whole_second_ceil(stamp):
+    # HTTP dates have no milliseconds: round up so the header is never earlier than the write
+    stamp = stamp.replace(tzinfo=timezone.utc)
+    if stamp.microsecond:
+        stamp = stamp.replace(microsecond=0) + timedelta(seconds=1)
+    return stamp
+
+
+def conditional(*keys):
+    """
+    Decorator for GET routes (place it under @jwt_required()).
+    Adds ETag/Last-Modified and answers 304 when the client's copy is current.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            resolved = _resolve(keys)
+            versions = get_versions(get_db(), resolved)
+
+            fingerprint = "|".join(f"{k}={versions[k][0]}" for k in resolved) + "|" + request.full_path
+            etag = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+            stamps = [v[1] for v in versions.values() if v[1] is not None]
+            last_modified = _whole_second_ceil(max(stamps)) if stamps else None
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Browser cache rakhe magar har dafa validate kare
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,78 @@
+import json
+from datetime import date, datetime, timezone
+
+from bson import ObjectId
+from flask import Response, current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+from utils.profiling import timed
+
+try:
+    import orjson
+except ImportError:  # requirements.txt mein hai; phir bhi na mile to stdlib json use hota hai
+    orjson = None
+
+
+def _default(o):
+    """Types that neither json nor orjson know about natively."""
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, datetime):
+        # PyMongo returns naive UTC datetimes
+        return (o if o.tzinfo else o.replace(tzinfo=timezone.utc)).isoformat()
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    # Decimal, UUID, dataclasses etc.: Flask ka default handler
+    return DefaultJSONProvider.default(o)
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes ObjectId and datetime natively, so routes can
+    jsonify raw MongoDB documents without walking them first. Uses orjson when
+    installed (several times faster than stdlib json on large lists).
+    """
+
+    def dumps_bytes(self, obj):
+        with timed("serialize"):
+            if orjson is not None:
+                option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+                if self.sort_keys:
+                    option |= orjson.OPT_SORT_KEYS
+                return orjson.dumps(obj, default=_default, option=option)
+            return json.dumps(obj, default=_default, ensure_ascii=self.ensure_ascii,
+                              sort_keys=self.sort_keys, separators=(",", ":")).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        if kwargs or orjson is None:
+            kwargs.setdefault("default", _default)
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def stream_json_array(items, transform=None):
+    """
+    Streams a JSON array straight from a Mongo cursor (or any iterable), one
+    document at a time, instead of building the whole list in memory first.
+    The generator keeps the request context, so `transform` and the cursor can
+    still use get_db()/current_app after the view has returned.
+    """
+    provider = current_app.json
+
+    def generate():
+        yield b"["
+        first = True
+        for item in items:
+            if transform is not None:
+                item = transform(item)
+            yield (b"" if first else b",") + provider.dumps_bytes(item)
+            first = False
+        yield b"]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
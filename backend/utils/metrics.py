@@ -0,0 +1,131 @@
+"""
+Minimal in-process metrics registry rendered in Prometheus text format.
+
+Counters and histograms are keyed by label values; gauges are callbacks read
+at scrape time (e.g. pool sizes). Metrics are per worker process, so scrape
+each gunicorn worker separately or run a single worker behind /metrics.
+"""
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labels, k)} {_number(v)}" for k, v in items]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, *label_values, value):
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, entry in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labels, key, [('le', '+Inf')])} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(entry[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {entry[-1]}")
+        return lines
+
+
+class Gauge:
+    type = "gauge"
+
+    def __init__(self, name, help, fn, labels=()):
+        """`fn()` returns a number, or a dict {label values tuple: number} when `labels` is set."""
+        self.name, self.help, self.labels, self.fn = name, help, tuple(labels), fn
+
+    def samples(self):
+        try:
+            value = self.fn()
+        except Exception:
+            return []  # scrape kabhi fail nahi hona chahiye
+        if not self.labels:
+            return [f"{self.name} {_number(value)}"]
+        return [f"{self.name}{_labels(self.labels, k)} {_number(v)}" for k, v in value.items()]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labels=()):
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name, help, fn, labels=()):
+        with self._lock:
+            # Gauges are re-registered on every create_app(); latest callback wins
+            self._metrics[name] = Gauge(name, help, fn, labels)
+            return self._metrics[name]
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
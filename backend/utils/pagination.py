@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from flask import current_app, jsonify, request
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value, doc_id):
+    """Opaque cursor for keyset paging: base64url(json([value, type, _id]))."""
+    if isinstance(sort_value, datetime):
+        payload = [sort_value.isoformat(), "d", str(doc_id)]
+    else:
+        payload = [sort_value, "v", str(doc_id)]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, kind, doc_id = json.loads(raw)
+        if kind == "d":
+            value = datetime.fromisoformat(value)
+        return value, ObjectId(doc_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def parse_page_limit(args, config):
+    """?limit= from request args, clamped to Config.MAX_PAGE_SIZE (Flask or Quart request)."""
+    limit = args.get('limit', config['DEFAULT_PAGE_SIZE'], type=int)
+    return max(1, min(limit, config['MAX_PAGE_SIZE']))
+
+
+def parse_page_args(args, config):
+    cursor = args.get('cursor')
+    return parse_page_limit(args, config), (decode_cursor(cursor) if cursor else None)
+
+
+def get_page_args():
+    """Reads ?limit= and the opaque ?cursor= from the request."""
+    return parse_page_args(request.args, current_app.config)
+
+
+def _after(sort_field, direction, value, doc_id):
+    """Filter for documents that come after (value, doc_id) in (sort_field, _id) order."""
+    op = "$lt" if direction < 0 else "$gt"
+    same_value = {sort_field: value, "_id": {op: doc_id}}
+    if value is None:
+        # Missing values sort last in descending order and first in ascending order
+        return same_value if direction < 0 else {"$or": [{sort_field: {"$ne": None}}, same_value]}
+    if direction < 0:
+        # $lt never matches a missing/null field, but those docs still come after every value
+        return {"$or": [{sort_field: {op: value}}, {sort_field: None}, same_value]}
+    return {"$or": [{sort_field: {op: value}}, same_value]}
+
+
+def keyset_query(query, sort_field, direction=-1, after=None):
+    """`query` narrowed to the documents after the decoded cursor `after`."""
+    if not after:
+        return query
+    return {"$and": [query, _after(sort_field, direction, *after)]} if query else _after(sort_field, direction, *after)
+
+
+def split_page(docs, limit, sort_field):
+    """Takes limit + 1 fetched docs; returns (page, next_cursor)."""
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor(last.get(sort_field), last["_id"])
+
+
+def paginate(collection, query, sort_field, projection=None, direction=-1, limit=None, after=None):
+    """
+    Keyset pagination on (sort_field, _id).
+    Returns (docs, next_cursor); next_cursor is None on the last page.
+    """
+    if limit is None:
+        limit, after = get_page_args()
+
+    docs = list(
+        collection.find(keyset_query(query, sort_field, direction, after), projection)
+        .sort([(sort_field, direction), ("_id", direction)])
+        .limit(limit + 1)
+    )
+    return split_page(docs, limit, sort_field)
+
+
+def with_next_cursor(response, next_cursor):
+    """Puts the next page's cursor in the X-Next-Cursor header (Flask or Quart response)."""
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+
+def paginated_response(items, next_cursor):
+    """JSON array response; the next page's cursor travels in the X-Next-Cursor header."""
+    return with_next_cursor(jsonify(items), next_cursor)
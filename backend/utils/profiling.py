@@ -0,0 +1,216 @@
+"""
+Per-request timing breakdown, Server-Timing headers, /metrics and sampled cProfile.
+
+Installed from create_app via init_profiling(app), before MongoDB is
+initialised so the command listener is attached to the client.
+
+Each request gets a RequestTimings accumulator (in a ContextVar). Hot paths
+add to it with record()/timed():
+    db         every MongoDB command (pymongo CommandListener, server-reported duration)
+    ai         Gemini calls, including time waiting for an AI slot (services/ai_guard.py)
+    hash       bcrypt, including time queued for the hash pool (utils/hash_helper.py)
+    serialize  JSON encoding (utils/json_provider.py)
+
+The breakdown is sent as a Server-Timing header and aggregated into the
+Prometheus metrics served at /metrics. Streamed responses (SSE, streamed JSON)
+are wrapped in stream_with_context, so teardown runs only when the stream ends:
+/metrics gets the full duration, while their Server-Timing header can only
+cover the work done before the first byte went out.
+
+With PROFILE_SAMPLE_RATE > 0, that fraction of requests is run under cProfile
+(one at a time per process) and dumped to PROFILE_DIR as .prof files:
+    python -m pstats profiles/<file>.prof
+
+The async serving mode (asgi.py) installs init_async_profiling(app) on its Quart
+app: same Server-Timing header and metrics, recorded in after_request. Not
+covered there: MongoDB time (Motor runs commands on executor threads, outside
+the request's context), the body of streamed responses, and cProfile sampling.
+"""
+import cProfile
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import Response, g, request
+from pymongo import monitoring
+
+from utils.metrics import registry
+
+COMPONENTS = ("db", "ai", "hash", "serialize")
+
+_current = ContextVar("request_timings", default=None)
+_profile_lock = threading.Lock()
+
+REQUESTS = registry.counter(
+    "lms_http_requests_total", "HTTP requests handled.", ("method", "endpoint", "status"))
+DURATION = registry.histogram(
+    "lms_http_request_duration_seconds", "Wall-clock request duration.", ("method", "endpoint"))
+COMPONENT_SECONDS = registry.counter(
+    "lms_http_request_component_seconds_total", "Time spent per component while serving requests.",
+    ("endpoint", "component"))
+DB_COMMANDS = registry.counter(
+    "lms_db_commands_total", "MongoDB commands issued while serving requests.", ("endpoint", "command"))
+
+
+class RequestTimings:
+    __slots__ = ("seconds", "counts", "db_commands")
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(COMPONENTS, 0.0)
+        self.counts = dict.fromkeys(COMPONENTS, 0)
+        self.db_commands = {}
+
+    def add(self, component, seconds):
+        self.seconds[component] += seconds
+        self.counts[component] += 1
+
+
+def record(component, seconds):
+    """Adds `seconds` to the current request's `component`; no-op outside a request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(component, seconds)
+
+
+@contextmanager
+def timed(component):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(component, time.perf_counter() - start)
+
+
+class _DBCommandListener(monitoring.CommandListener):
+    # PyMongo (sync) calls listeners on the thread that ran the command
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        timings = _current.get()
+        if timings is not None:
+            timings.add("db", event.duration_micros / 1e6)
+            timings.db_commands[event.command_name] = timings.db_commands.get(event.command_name, 0) + 1
+
+
+_listener_registered = False
+
+
+def _endpoint_label():
+    # Route pattern (not the raw path) so ids don't blow up label cardinality
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+def _server_timing(timings, total):
+    parts = [f'{name};dur={timings.seconds[name] * 1000:.1f};desc="{timings.counts[name]} calls"'
+             for name in COMPONENTS if timings.counts[name]]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _record_metrics(timings, method, endpoint, status, total):
+    REQUESTS.inc(method, endpoint, status)
+    DURATION.observe(method, endpoint, value=total)
+    for name in COMPONENTS:
+        if timings.counts[name]:
+            COMPONENT_SECONDS.inc(endpoint, name, amount=timings.seconds[name])
+    for command, count in timings.db_commands.items():
+        DB_COMMANDS.inc(endpoint, command, amount=count)
+
+
+def init_profiling(app):
+    global _listener_registered
+    if not app.config.get("PROFILING_ENABLED", True):
+        return
+
+    if not _listener_registered:
+        monitoring.register(_DBCommandListener())
+        _listener_registered = True
+
+    server_timing = app.config.get("SERVER_TIMING_ENABLED", True)
+    sample_rate = app.config.get("PROFILE_SAMPLE_RATE", 0.0)
+    profile_dir = app.config.get("PROFILE_DIR", "profiles")
+
+    @app.before_request
+    def start_timing():
+        g._timings_start = time.perf_counter()
+        _current.set(RequestTimings())
+        if sample_rate > 0 and random.random() < sample_rate and _profile_lock.acquire(blocking=False):
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+
+    @app.after_request
+    def add_server_timing(response):
+        # teardown ko response nahi milta, isliye status yahan note kar lo
+        g._timings_status = response.status_code
+        timings = _current.get()
+        if server_timing and timings is not None and "_timings_start" in g:
+            response.headers["Server-Timing"] = _server_timing(timings, time.perf_counter() - g._timings_start)
+        return response
+
+    @app.teardown_request
+    def finish_timing(exc):
+        timings = _current.get()
+        start = g.pop("_timings_start", None)
+        if timings is None or start is None:
+            return
+        # Threads are reused across requests (gunicorn gthread), so clear explicitly
+        _current.set(None)
+        total = time.perf_counter() - start
+
+        endpoint = _endpoint_label()
+        status = "500" if exc is not None else str(getattr(g, "_timings_status", ""))
+        _record_metrics(timings, request.method, endpoint, status, total)
+
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            try:
+                profiler.disable()
+                os.makedirs(profile_dir, exist_ok=True)
+                name = endpoint.strip("/").replace("/", "_").replace("<", "").replace(">", "") or "root"
+                profiler.dump_stats(os.path.join(profile_dir, f"{int(time.time() * 1000)}_{name}_{total * 1000:.0f}ms.prof"))
+            except Exception as e:
+                print(f"⚠️ Profile Dump Error: {e}")
+            finally:
+                _profile_lock.release()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_async_profiling(app):
+    """Quart version for asgi.py: Server-Timing + /metrics timings (served by the Flask app)."""
+    from quart import g as qg, request as qrequest
+
+    if not app.config.get("PROFILING_ENABLED", True):
+        return
+    server_timing = app.config.get("SERVER_TIMING_ENABLED", True)
+
+    @app.before_request
+    async def start_timing():
+        qg._timings_start = time.perf_counter()
+        _current.set(RequestTimings())
+
+    @app.after_request
+    async def finish_timing(response):
+        timings = _current.get()
+        start = qg.pop("_timings_start", None)
+        if timings is None or start is None:
+            return response
+        _current.set(None)
+        total = time.perf_counter() - start
+        if server_timing:
+            response.headers["Server-Timing"] = _server_timing(timings, total)
+        endpoint = qrequest.url_rule.rule if qrequest.url_rule is not None else "unmatched"
+        _record_metrics(timings, qrequest.method, endpoint, str(response.status_code), total)
+        return response
@@ -0,0 +1,261 @@
+"""
+Synthetic data generator for capacity planning.
+
+seed_database.py creates a handful of demo records; this script builds
+production-sized datasets (e.g. 100k students / 10M progress rows) from a fixed
+seed, so the same command always produces the same data:
+
+    python database/generate_synthetic_data.py --uri mongodb://localhost:27017 \
+        --db ai_learning_synthetic --students 100000 --progress-per-student 100 \
+        --workers 8 --index-mode post --drop
+
+- Every _id is derived from (kind, index), so shards can reference users and
+  modules without reading them back, and re-runs are identical.
+- Students are split into shards; each worker process generates its shard's
+  users, enrollments, progress and chat logs and writes them with batched,
+  unordered insert_many.
+- --index-mode pre   builds the API's indexes first (measures write cost with indexes)
+  --index-mode post  builds them after loading (fastest bulk load)
+  --index-mode none  leaves indexing to create_app() / `python -m database.indexes --apply`
+- Afterwards user_stats is rebuilt and the catalog version counters are bumped,
+  same as seed_database.py step 8. The weakness index builds itself per user on
+  first read (or: python -m services.weakness_index --rebuild).
+
+All users share the password given by --password (hashed once).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from multiprocessing import Pool
+
+import bcrypt
+from bson import ObjectId
+from pymongo import MongoClient
+
+# Index registry aur user_stats rebuild backend se reuse karte hain (dono sirf pymongo use karte hain)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from database.indexes import ensure_indexes  # noqa: E402
+from services.user_stats import rebuild_all  # noqa: E402
+
+COLLECTIONS = ["users", "modules", "quizzes", "enrollments", "progress", "chat_logs",
+               "user_stats", "weakness_index", "study_plans"]
+
+# Deterministic ObjectIds: 4-byte timestamp + 1-byte kind + 7-byte index
+KINDS = {"student": 1, "teacher": 2, "admin": 3, "module": 4, "quiz": 5,
+         "progress": 6, "enrollment": 7, "chat": 8}
+ID_EPOCH = 1704067200  # 2024-01-01
+
+SUBJECTS = ["Programming", "Web Dev", "CS Core", "Marketing", "Security", "Data Science", "Math"]
+DIFFICULTIES = ["Beginner", "Medium", "Hard"]
+STATUSES = ["Completed", "Completed", "Completed", "In-progress"]
+CHAT_MESSAGES = ["Explain recursion", "What is a linked list?", "How does SEO work?",
+                 "Difference between TCP and UDP?", "Give me a Python loop example"]
+
+
+def make_id(kind, index):
+    return ObjectId(ID_EPOCH.to_bytes(4, "big") + bytes([KINDS[kind]]) + index.to_bytes(7, "big"))
+
+
+def rng_for(seed, kind, shard=0):
+    return random.Random(f"{seed}:{kind}:{shard}")
+
+
+def insert_batched(collection, docs, batch_size):
+    """Buffers an iterable of documents into unordered insert_many calls. Returns the count."""
+    batch, total = [], 0
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+
+# --- Catalog (main process) ---
+
+def generate_catalog(db, opts, password_hash):
+    rng = rng_for(opts.seed, "catalog")
+    anchor = opts.anchor
+
+    staff = [{"_id": make_id("teacher", i), "name": f"Teacher {i}", "email": f"teacher{i}@synthetic.lms",
+              "password": password_hash, "role": "Teacher", "created_at": anchor - timedelta(days=365, minutes=i),
+              "student_id": None}
+             for i in range(opts.teachers)]
+    staff.append({"_id": make_id("admin", 0), "name": "System Admin", "email": "admin@synthetic.lms",
+                  "password": password_hash, "role": "Admin", "created_at": anchor - timedelta(days=400),
+                  "student_id": None})
+    insert_batched(db.users, staff, opts.batch_size)
+
+    modules = ({"_id": make_id("module", i), "title": f"Course {i}",
+                "content": f"Module {i} content. " * rng.randint(20, 200),
+                "subject": rng.choice(SUBJECTS), "difficulty": rng.choice(DIFFICULTIES),
+                "created_by": make_id("teacher", rng.randrange(opts.teachers)),
+                "created_at": anchor - timedelta(days=rng.randint(30, 365))}
+               for i in range(opts.modules))
+    insert_batched(db.modules, modules, opts.batch_size)
+
+    quizzes = ({"_id": make_id("quiz", i), "topic": f"Topic {i}", "difficulty": rng.choice(["Easy", "Medium", "Hard"]),
+                "created_by": "Teacher", "created_at": anchor - timedelta(days=rng.randint(0, 180)),
+                "questions": [{"question": f"Question {q}?", "options": ["A", "B", "C", "D"], "answer": "A"}
+                              for q in range(3)]}
+               for i in range(opts.quizzes))
+    insert_batched(db.quizzes, quizzes, opts.batch_size)
+
+
+# --- Student shards (worker processes) ---
+
+def _shard_docs(opts, shard, start, end, password_hash):
+    rng = rng_for(opts.seed, "students", shard)
+    anchor = opts.anchor
+    per_student = opts.progress_per_student
+
+    users, enrollments, progress, chats = [], [], [], []
+    for i in range(start, end):
+        uid = make_id("student", i)
+        users.append({"_id": uid, "name": f"Student {i}", "email": f"student{i}@synthetic.lms",
+                      "password": password_hash, "role": "Student",
+                      "created_at": anchor - timedelta(days=rng.randint(1, 365), seconds=i),
+                      "student_id": f"BC{i:09d}"})
+
+        # Har module zyada se zyada ek dafa (update_progress bhi user+module pe upsert karta hai)
+        for n, m in enumerate(rng.sample(range(opts.modules), per_student)):
+            row = i * per_student + n
+            module_id = str(make_id("module", m))
+            when = anchor - timedelta(days=rng.randint(0, 180), seconds=rng.randint(0, 86399))
+            enrollments.append({"_id": make_id("enrollment", row), "user_id": str(uid),
+                                "course_id": module_id, "enrolled_at": when})
+            progress.append({"_id": make_id("progress", row), "user_id": uid, "module_id": module_id,
+                             "topic": f"Course {m}", "status": rng.choice(STATUSES),
+                             "score": float(min(100, max(0, round(rng.gauss(68, 18))))),
+                             "last_updated": when})
+
+        for n in range(opts.chat_per_student):
+            chats.append({"_id": make_id("chat", i * opts.chat_per_student + n), "user_id": uid,
+                          "message": rng.choice(CHAT_MESSAGES), "reply": "Synthetic reply.",
+                          "timestamp": anchor - timedelta(days=rng.randint(0, 90), seconds=rng.randint(0, 86399))})
+
+        if len(progress) >= opts.batch_size:
+            yield users, enrollments, progress, chats
+            users, enrollments, progress, chats = [], [], [], []
+    yield users, enrollments, progress, chats
+
+
+def generate_shard(task):
+    opts, shard, start, end, password_hash = task
+    client = MongoClient(opts.uri)
+    try:
+        db = client[opts.db]
+        counts = {"users": 0, "enrollments": 0, "progress": 0, "chat_logs": 0}
+        for users, enrollments, progress, chats in _shard_docs(opts, shard, start, end, password_hash):
+            for name, docs in (("users", users), ("enrollments", enrollments),
+                               ("progress", progress), ("chat_logs", chats)):
+                counts[name] += insert_batched(db[name], docs, opts.batch_size)
+        return counts
+    finally:
+        client.close()
+
+
+# --- Driver ---
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a large, reproducible synthetic dataset.")
+    parser.add_argument("--uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="ai_learning_synthetic")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--teachers", type=int, default=50)
+    parser.add_argument("--modules", type=int, default=200)
+    parser.add_argument("--quizzes", type=int, default=100)
+    parser.add_argument("--progress-per-student", type=int, default=20)
+    parser.add_argument("--chat-per-student", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--index-mode", choices=["pre", "post", "none"], default="post")
+    parser.add_argument("--password", default="1234")
+    parser.add_argument("--anchor-date", default="2025-01-01",
+                        help="dates are generated relative to this day (YYYY-MM-DD) so runs are reproducible")
+    parser.add_argument("--drop", action="store_true", help="drop the generated collections first")
+    opts = parser.parse_args(argv)
+
+    if not 0 <= opts.progress_per_student <= opts.modules:
+        parser.error("--progress-per-student must be between 0 and --modules")
+    if opts.teachers < 1:
+        parser.error("--teachers must be at least 1")
+    opts.anchor = datetime.strptime(opts.anchor_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return opts
+
+
+def shard_ranges(total, workers):
+    # Workers se zyada shards, taake koi process khali na baitha rahe
+    shards = max(1, workers * 4)
+    size = max(1, -(-total // shards))
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def main(argv=None):
+    opts = parse_args(argv)
+    client = MongoClient(opts.uri)
+    db = client[opts.db]
+    started = time.monotonic()
+
+    try:
+        if opts.drop:
+            print(f"🧹 Dropping generated collections in {opts.db}...")
+            for name in COLLECTIONS:
+                db.drop_collection(name)
+        elif db.users.estimated_document_count():
+            print(f"❌ {opts.db}.users is not empty; re-run with --drop to replace it.")
+            return 1
+
+        if opts.index_mode == "pre":
+            ensure_indexes(db)
+            print("✅ Indexes built (pre-load).")
+
+        # Ek hi hash sab users ke liye: bcrypt 10M dafa chalana minutes nahi, ghante leta
+        password_hash = bcrypt.hashpw(opts.password.encode(), bcrypt.gensalt()).decode()
+
+        generate_catalog(db, opts, password_hash)
+        print(f"✅ Catalog: {opts.teachers} teachers, {opts.modules} modules, {opts.quizzes} quizzes.")
+
+        tasks = [(opts, shard, start, end, password_hash)
+                 for shard, (start, end) in enumerate(shard_ranges(opts.students, opts.workers))]
+        totals = {"users": 0, "enrollments": 0, "progress": 0, "chat_logs": 0}
+        with Pool(processes=opts.workers) as pool:
+            for done, counts in enumerate(pool.imap_unordered(generate_shard, tasks), 1):
+                for name, n in counts.items():
+                    totals[name] += n
+                print(f"   shard {done}/{len(tasks)}: {totals['users']:,} students, "
+                      f"{totals['progress']:,} progress rows ({time.monotonic() - started:.0f}s)")
+
+        if opts.index_mode == "post":
+            index_start = time.monotonic()
+            ensure_indexes(db)
+            print(f"✅ Indexes built (post-load) in {time.monotonic() - index_start:.0f}s.")
+
+        stats = rebuild_all(db)
+        print(f"✅ Rebuilt user_stats for {stats:,} users.")
+
+        for key in ("modules", "quizzes"):
+            db.collection_versions.update_one(
+                {"_id": key},
+                {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+
+        print(f"\n🎉 SUCCESS: {totals['users']:,} students, {totals['enrollments']:,} enrollments, "
+              f"{totals['progress']:,} progress rows, {totals['chat_logs']:,} chat logs "
+              f"in {time.monotonic() - started:.0f}s")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -158,6 +158,14 @@ try:
         db.quizzes.insert_one(teacher_quiz)
         print("✅ Created Teacher Assigned Quiz.")
 
+    # --- 8. INVALIDATE API CACHES (ETags / catalog cache) ---
+    for key in ("modules", "quizzes"):
+        db.collection_versions.update_one(
+            {"_id": key},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
     print("\n🎉 SUCCESS: Database Refreshed & Ready!")
 
 except Exception as e:
@@ -6,6 +6,7 @@ const AdminDashboard = () => {
     const { logout } = useContext(AuthContext);
     const [stats, setStats] = useState(null);
     const [users, setUsers] = useState([]);
+    const [usersCursor, setUsersCursor] = useState(null);
 
     useEffect(() => {
         loadData();
@@ -17,9 +18,20 @@ const AdminDashboard = () => {
             setStats(s.data);
             const u = await API.get('/admin/users');
             setUsers(u.data);
+            setUsersCursor(u.headers['x-next-cursor'] || null);
         } catch (e) { alert("Unauthorized"); }
     };
 
+    // Users list cursor se paged hai: agla page X-Next-Cursor header se
+    const loadMoreUsers = async () => {
+        if (!usersCursor) return;
+        try {
+            const res = await API.get('/admin/users', { params: { cursor: usersCursor } });
+            setUsers([...users, ...res.data]);
+            setUsersCursor(res.headers['x-next-cursor'] || null);
+        } catch (e) { console.error("Load More Error", e); }
+    };
+
     const handleDelete = async (id) => {
         if (window.confirm("Delete this user permanently?")) {
             try {
@@ -91,6 +103,7 @@ const AdminDashboard = () => {
                         ))}
                     </tbody>
                 </table>
+                {usersCursor && <button onClick={loadMoreUsers} style={{ marginTop: '10px' }}>Load More</button>}
             </div>
         </div>
     );
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useContext } from 'react';
-import API from '../services/api';
+import API, { streamChat } from '../services/api';
 import AuthContext from '../context/AuthContext';
 
 const StudentDashboard = () => {
@@ -20,6 +20,8 @@ const StudentDashboard = () => {
 
     // Data Lists
     const [teacherQuizzes, setTeacherQuizzes] = useState([]);
+    const [quizzesCursor, setQuizzesCursor] = useState(null);
+    const [progressCursor, setProgressCursor] = useState(null);
     const [courses, setCourses] = useState([]);
 
     // Features States
@@ -39,20 +41,47 @@ const StudentDashboard = () => {
             setProfile(p.data); setNewName(p.data.name);
             const q = await API.get('/student/assigned-quizzes');
             setTeacherQuizzes(q.data);
+            setQuizzesCursor(q.headers['x-next-cursor'] || null);
             const c = await API.get('/student/courses');
             setCourses(c.data);
             const prog = await API.get('/progress/');
             setProgressData(prog.data);
+            setProgressCursor(prog.headers['x-next-cursor'] || null);
         } catch (e) { console.error("Load Error", e); }
     };
 
+    // Quizzes aur history cursor se paged hain: "Load More" agla page laata hai
+    const loadMoreQuizzes = async () => {
+        if (!quizzesCursor) return;
+        try {
+            const res = await API.get('/student/assigned-quizzes', { params: { cursor: quizzesCursor } });
+            setTeacherQuizzes([...teacherQuizzes, ...res.data]);
+            setQuizzesCursor(res.headers['x-next-cursor'] || null);
+        } catch (e) { console.error("Load More Error", e); }
+    };
+
+    const loadMoreProgress = async () => {
+        if (!progressCursor) return;
+        try {
+            const res = await API.get('/progress/', { params: { cursor: progressCursor } });
+            setProgressData({ ...res.data, history: [...progressData.history, ...res.data.history] });
+            setProgressCursor(res.headers['x-next-cursor'] || null);
+        } catch (e) { console.error("Load More Error", e); }
+    };
+
     // --- FUNCTIONS ---
 
     const getAIPlan = async () => {
         setAiRecommendation("Analyzing... 🤖");
         try {
-            const res = await API.get('/ai/recommendation');
-            setAiRecommendation(res.data.message);
+            let res = await API.get('/ai/recommendation');
+            // Pehla plan background mein banta hai (202): thori thori der baad dobara poocho
+            for (let i = 0; i < 15 && res.status === 202; i++) {
+                setAiRecommendation(res.data.message);
+                await new Promise(r => setTimeout(r, 2000));
+                res = await API.get('/ai/recommendation');
+            }
+            setAiRecommendation(res.status === 202 ? "Your plan is still being prepared. Try again shortly." : res.data.message);
         } catch (e) { setAiRecommendation("Could not generate plan."); }
     };
 
@@ -78,8 +107,9 @@ const StudentDashboard = () => {
         const newHist = [...chatHistory, { sender: 'You', text: chatMsg }];
         setChatHistory(newHist); setChatMsg('');
         try {
-            const res = await API.post('/ai/chat', { message: chatMsg });
-            setChatHistory([...newHist, { sender: 'AI', text: res.data.reply }]);
+            // Tokens aate hi AI ka message update hota rehta hai
+            const reply = await streamChat(chatMsg, (partial) => setChatHistory([...newHist, { sender: 'AI', text: partial }]));
+            setChatHistory([...newHist, { sender: 'AI', text: reply }]);
         } catch (e) { setChatHistory([...newHist, { sender: 'AI', text: "Error: AI Offline." }]); }
     };
 
@@ -118,6 +148,14 @@ const StudentDashboard = () => {
         } catch (e) { alert("Enrollment failed"); }
     };
 
+    // Catalog list has no 'content', so load the full course when opening it
+    const openCourse = async (id) => {
+        try {
+            const res = await API.get(`/student/courses/${id}`);
+            setActiveCourse(res.data);
+        } catch (e) { alert("Could not load course"); }
+    };
+
     // --- INTEGRATION LOGIC (REQ #8) ---
     const getPlatformLink = (platform) => {
         const query = encodeURIComponent(quizTopic || "Computer Science");
@@ -163,6 +201,7 @@ const StudentDashboard = () => {
                                 ))}
                             </tbody>
                         </table>
+                        {progressCursor && <button onClick={loadMoreProgress} style={{ marginTop: '10px' }}>Load More</button>}
                     </div>
                 </div>
             )}
@@ -233,7 +272,7 @@ const StudentDashboard = () => {
                         {courses.map(c => (
                             <div key={c._id} style={{ borderBottom: '1px solid #eee', padding: '10px 0' }}>
                                 <strong>{c.title}</strong>
-                                {c.is_enrolled ? <button onClick={() => setActiveCourse(c)} style={{ width: '100%', background: '#10b981', fontSize: '0.8rem' }}>Start</button> : <button onClick={() => handleEnroll(c._id)} style={{ width: '100%', fontSize: '0.8rem' }}>Enroll</button>}
+                                {c.is_enrolled ? <button onClick={() => openCourse(c._id)} style={{ width: '100%', background: '#10b981', fontSize: '0.8rem' }}>Start</button> : <button onClick={() => handleEnroll(c._id)} style={{ width: '100%', fontSize: '0.8rem' }}>Enroll</button>}
                             </div>
                         ))}
                     </div>
@@ -256,6 +295,7 @@ const StudentDashboard = () => {
                                 <span>{q.topic}</span><button onClick={() => startTeacherQuiz(q)} style={{ fontSize: '0.7rem', padding: '2px 5px' }}>Start</button>
                             </div>
                         ))}
+                        {quizzesCursor && <button onClick={loadMoreQuizzes} style={{ fontSize: '0.8rem', padding: '4px 8px' }}>Load More</button>}
                     </div>
                 </div>
             </div>
@@ -7,6 +7,7 @@ const TeacherDashboard = () => {
 
     // Data States
     const [analytics, setAnalytics] = useState({ stats: {}, students: [] });
+    const [studentsCursor, setStudentsCursor] = useState(null);
     const [loading, setLoading] = useState(false);
 
     // Course State
@@ -31,9 +32,21 @@ const TeacherDashboard = () => {
         try {
             const res = await API.get('/teacher/analytics');
             setAnalytics(res.data);
+            setStudentsCursor(res.headers['x-next-cursor'] || null);
         } catch (e) { console.error("Access Denied"); }
     };
 
+    // Next page of students (analytics is paged by cursor)
+    const loadMoreStudents = async () => {
+        if (!studentsCursor) return;
+        try {
+            const res = await API.get('/teacher/analytics', { params: { cursor: studentsCursor } });
+            // Class stats sirf pehle page ke saath aate hain, wohi rakho
+            setAnalytics({ ...analytics, students: [...analytics.students, ...res.data.students] });
+            setStudentsCursor(res.headers['x-next-cursor'] || null);
+        } catch (e) { console.error("Load More Error", e); }
+    };
+
     // --- HELPER: Handle Manual Question Input ---
     const handleOptionChange = (index, value) => {
         const newOptions = [...currentQ.options];
@@ -56,6 +69,17 @@ const TeacherDashboard = () => {
         setCurrentQ({ question: '', options: ['', '', '', ''], answer: '' });
     };
 
+    // Quiz generation background job hai: status poll karo jab tak done/failed na ho (max ~22s, StudentDashboard jaisa 15 tries)
+    const waitForJob = async (jobId) => {
+        let res;
+        for (let i = 0; i < 15; i++) {
+            res = await API.get(`/teacher/jobs/${jobId}`);
+            if (res.data.status === 'done' || res.data.status === 'failed') return res.data;
+            await new Promise(resolve => setTimeout(resolve, 1500));
+        }
+        return res.data;
+    };
+
     // --- MAIN ACTION: Publish Quiz ---
     const handlePublishQuiz = async () => {
         if (!quizTopic) return alert("Please enter a Quiz Topic/Title.");
@@ -80,8 +104,12 @@ const TeacherDashboard = () => {
                 };
             }
 
-            await API.post('/teacher/create-quiz', payload);
-            alert("✅ Quiz Published Successfully!");
+            const res = await API.post('/teacher/create-quiz', payload);
+            const job = await waitForJob(res.data.job_id);
+            if (job.status === 'failed') throw new Error(job.error || "Quiz generation failed");
+            alert(job.status === 'done'
+                ? "✅ Quiz Published Successfully!"
+                : "⏳ Quiz is still being generated. It will appear once it is ready.");
 
             // Reset UI
             setQuizTopic('');
@@ -251,6 +279,7 @@ const TeacherDashboard = () => {
                         </tbody>
                     </table>
                 </div>
+                {studentsCursor && <button onClick={loadMoreStudents} style={{ marginTop: '10px' }}>Load More</button>}
             </div>
         </div>
     );
@@ -17,4 +17,39 @@ API.interceptors.request.use((req) => {
     return req;
 });
 
+// Streaming Chat (SSE): har token aate hi onToken() call hota hai, poora reply return hota hai
+export const streamChat = async (message, onToken) => {
+    const res = await fetch(`${API.defaults.baseURL}/ai/chat/stream`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            Authorization: `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ message })
+    });
+    if (!res.ok || !res.body) throw new Error(`Chat stream failed (${res.status})`);
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let reply = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const evt of events) {
+            const dataLine = evt.split('\n').find(l => l.startsWith('data: '));
+            if (!dataLine) continue;
+            const payload = JSON.parse(dataLine.slice(6));
+            // Stream beech mein toota: adhoora reply mat dikhao
+            if (evt.startsWith('event: error')) throw new Error(payload.error || 'Chat stream interrupted');
+            if (payload.token) { reply += payload.token; onToken(reply); }
+            if (payload.reply) reply = payload.reply;
+        }
+    }
+    return reply;
+};
+
 export default API;
\ No newline at end of file